@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Cold start benchmark. Measures the time until a new worker serves its first inference, for
+model archives of several sizes, broken down into the phases of a worker start:
+
+    extraction          unzip the model archive, as the frontend does on register
+    interpreter start   start the Python worker until it listens on its socket
+    handler import      import the handler module, timed in a separate interpreter
+    initialize          the rest of the model load: the entry point's initialization
+    warmup              the warmup batches declared in the manifest, which the worker runs
+                        before it reports the model as loaded, as logged by the worker
+    first inference     the first predict after the load
+    steady inference    the median of the following predicts, for comparison
+
+The phases are timed against backend workers started with mock_frontend.MockWorker, so no
+frontend is needed. With --http, the time from the register call and from a scale-up call
+until the model serves is also measured end to end against MMS.
+
+By default synthetic models are generated whose handler reads a weights file of each size on
+initialization and checksums it on the first predict, which the warmup of their manifest runs
+ahead of the first inference (disable it with --warmup-count 0). For instructions, run with the --help flag.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+
+import loadgen
+from mock_frontend import MMS_BASE, MockWorker, make_request
+
+SIZES_MB = [1, 64, 512]
+PHASES = ['extraction', 'interpreter start', 'handler import', 'initialize', 'warmup', 'first inference']
+WARMUP_LOG = re.compile(r'warmup batch size: \d+, time: ([0-9.]+) ms')
+
+SERVICE_TEMPLATE = '''"""
+Synthetic model of the cold start benchmark, reads its weights on initialization and checksums
+them on the first predict, like the lazy initialization of a real model.
+"""
+import os
+import zlib
+{imports}
+
+_weights = None
+_checksum = None
+
+
+def handle(data, context):
+    global _weights, _checksum
+    if _weights is None:
+        with open(os.path.join(context.system_properties.get("model_dir"), "weights.bin"), "rb") as f:
+            _weights = f.read()
+    if data is None:
+        return None
+    if _checksum is None:
+        _checksum = zlib.crc32(_weights)
+    return ["OK"] * len(data)
+'''
+WARMUP_INPUT = b'{"data": "warmup"}'
+
+IMPORT_TIMER = 'import importlib, sys, time; start = time.perf_counter(); ' \
+               'importlib.import_module(sys.argv[1]); print(time.perf_counter() - start)'
+
+
+def make_model(out_dir, name, size_mb, imports=(), warmup_count=1):
+    """
+    Generate a synthetic model archive with a weights file of size_mb MiB, whose manifest
+    declares warmup_count warmup batches, none if 0.
+
+    :return: path of the .mar file
+    """
+    manifest = {'specificationVersion': '1.0', 'implementationVersion': '1.0', 'modelServerVersion': '1.0',
+                'runtime': 'python', 'description': 'cold start benchmark model',
+                'model': {'modelName': name, 'modelVersion': '1.0', 'handler': 'service:handle'}}
+    if warmup_count:
+        manifest['model']['warmup'] = {'inputs': [{'file': 'warmup.json', 'contentType': 'application/json'}],
+                                       'count': warmup_count}
+    service = SERVICE_TEMPLATE.format(imports='\n'.join('import {}'.format(m) for m in imports))
+    mar = os.path.join(out_dir, name + '.mar')
+    chunk = os.urandom(1 << 20)
+    # Stored, not deflated, so that the archive has the size of the weights like real parameters.
+    with zipfile.ZipFile(mar, 'w', zipfile.ZIP_STORED) as z:
+        z.writestr('MAR-INF/MANIFEST.json', json.dumps(manifest, indent=2))
+        z.writestr('service.py', service)
+        if warmup_count:
+            z.writestr('warmup.json', WARMUP_INPUT)
+        with z.open('weights.bin', 'w', force_zip64=True) as f:
+            for _ in range(size_mb):
+                f.write(chunk)
+    return mar
+
+
+def read_manifest(model_dir):
+    with open(os.path.join(model_dir, 'MAR-INF', 'MANIFEST.json')) as f:
+        return json.load(f)
+
+
+def warmup_batches(manifest):
+    """Number of warmup batches the worker runs for a manifest, as in Service.warmup."""
+    warmup = manifest['model'].get('warmup')
+    if not warmup or not warmup.get('inputs'):
+        return 0
+    return int(warmup.get('count', 1)) * len(warmup.get('batchSizes', [None]))
+
+
+def warmup_time(worker, batches, timeout=5.0):
+    """
+    Seconds the worker spent in its warmup batches, the sum of the times it logged for them.
+    The log is read by a thread, so wait for the lines of all batches.
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        times = [float(m.group(1)) for m in map(WARMUP_LOG.search, list(worker.load_log)) if m]
+        if len(times) >= batches or time.perf_counter() > deadline:
+            break
+        time.sleep(0.01)
+    if len(times) < batches:
+        raise RuntimeError('Worker logged {} of {} warmup batches'.format(len(times), batches))
+    return sum(times) / 1000.0
+
+
+def extract(mar, dest):
+    """Extract a model archive, or copy a model directory. Returns the seconds it took."""
+    if os.path.exists(dest):
+        shutil.rmtree(dest)
+    start = time.perf_counter()
+    if os.path.isdir(mar):
+        shutil.copytree(mar, dest)
+    else:
+        with zipfile.ZipFile(mar) as z:
+            z.extractall(dest)
+    return time.perf_counter() - start
+
+
+def time_import(model_dir, handler):
+    """Seconds to import the handler module in a new interpreter."""
+    module = handler.split(':', 1)[0]
+    module = module[:-3] if module.endswith('.py') else module
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (model_dir, env.get('PYTHONPATH'), MMS_BASE) if p)
+    out = subprocess.check_output([sys.executable, '-c', IMPORT_TIMER, module], cwd=model_dir, env=env)
+    return float(out.decode('utf-8').strip().splitlines()[-1])
+
+
+def cold_start(mar, body, content_type, tmp_dir, predicts=10):
+    """
+    Time the phases of one cold start of a worker for a model archive or directory.
+
+    :return: dict of phase to seconds, with the total 'time to first inference'
+    """
+    model_dir = os.path.join(tmp_dir, 'model')
+    result = {'extraction': extract(mar, model_dir)}
+    manifest = read_manifest(model_dir)
+    handler = manifest['model']['handler']
+    import_time = time_import(model_dir, handler)
+
+    name = os.path.splitext(os.path.basename(mar.rstrip('/')))[0]
+    with MockWorker(model_dir, handler, name, tmp_dir=tmp_dir) as worker:
+        result['interpreter start'] = worker.spawn_time
+        result['handler import'] = import_time
+        result['warmup'] = warmup_time(worker, warmup_batches(manifest))
+        result['initialize'] = max(worker.model_load_time - import_time - result['warmup'], 0.0)
+        times = []
+        for idx in range(predicts + 1):
+            start = time.perf_counter()
+            resp = worker.predict([make_request('{}'.format(idx), body, content_type)])
+            times.append(time.perf_counter() - start)
+            if resp['code'] != 200:
+                raise RuntimeError('Predict failed: {} {}'.format(resp['code'], resp['message']))
+    result['first inference'] = times[0]
+    result['steady inference'] = statistics.median(times[1:]) if predicts else None
+    result['time to first inference'] = sum(result[phase] for phase in PHASES)
+    return result
+
+
+def _request(method, url, timeout=60):
+    req = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+def _ready_workers(management_url, name):
+    try:
+        body = _request('GET', '{}/models/{}'.format(management_url, name), 10)
+        workers = json.loads(body.decode('utf-8')).get('workers', [])
+    except (urllib.error.URLError, OSError, ValueError):
+        return 0
+    return sum(1 for w in workers if w.get('status') == 'READY')
+
+
+def _serves(url, name, body, content_type):
+    req = urllib.request.Request('{}/predictions/{}'.format(url, name), data=body, method='POST',
+                                 headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            resp.read()
+            return resp.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def http_cold_start(url, management_url, model_url, name, body, content_type, scale_to, timeout=600,
+                    poll=0.02):
+    """
+    Register a model with one worker and time until it serves the first inference, then scale
+    it up to `scale_to` workers and time until they are all ready. The model is unregistered.
+
+    :return: dict with 'register to first inference' and 'scale up to N workers' in seconds
+    """
+    result = {}
+    query = urllib.parse.urlencode({'url': model_url, 'model_name': name, 'initial_workers': 1,
+                                    'synchronous': 'false'})
+    start = time.perf_counter()
+    _request('POST', '{}/models?{}'.format(management_url, query), timeout)
+    deadline = start + timeout
+    while not _serves(url, name, body, content_type):
+        if time.perf_counter() > deadline:
+            raise RuntimeError('{} did not serve within {}s'.format(name, timeout))
+        time.sleep(poll)
+    result['register to first inference'] = time.perf_counter() - start
+
+    if scale_to > 1:
+        query = urllib.parse.urlencode({'min_worker': scale_to, 'max_worker': scale_to, 'synchronous': 'false'})
+        start = time.perf_counter()
+        _request('PUT', '{}/models/{}?{}'.format(management_url, name, query), timeout)
+        deadline = start + timeout
+        while _ready_workers(management_url, name) < scale_to:
+            if time.perf_counter() > deadline:
+                raise RuntimeError('{} did not scale to {} workers within {}s'.format(name, scale_to, timeout))
+            time.sleep(poll)
+        result['scale up to {} workers'.format(scale_to)] = time.perf_counter() - start
+
+    _request('DELETE', '{}/models/{}'.format(management_url, name), timeout)
+    return result
+
+
+def median_results(runs):
+    keys = [k for k in runs[0] if all(r.get(k) is not None for r in runs)]
+    return {k: statistics.median(r[k] for r in runs) for k in keys}
+
+
+def format_ms(results, columns):
+    rows = [['Model'] + columns]
+    for label, result in results:
+        rows.append([label] + ['{:.1f}'.format(result[c] * 1000) if c in result else '-' for c in columns])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.rjust(w) if i else cell.ljust(w) for i, (cell, w) in
+                               enumerate(zip(row, widths))) for row in rows)
+
+
+def run(pargs, models, tmp_dir):
+    body = loadgen.read_input(pargs)
+    backend = []
+    for mar in models:
+        label = os.path.basename(mar.rstrip('/'))
+        runs = []
+        for _ in range(pargs.repeat):
+            runs.append(cold_start(mar, body, pargs.content_type, tmp_dir, pargs.predicts))
+        backend.append((label, median_results(runs)))
+        print('{}: time to first inference {:.1f} ms'.format(label, backend[-1][1]['time to first inference'] * 1000),
+              flush=True)
+
+    print('\nWorker cold start, median of {} runs, ms'.format(pargs.repeat))
+    print(format_ms(backend, PHASES + ['steady inference', 'time to first inference']))
+
+    http = []
+    if pargs.http:
+        def measure(url, management_url):
+            for mar in models:
+                label = os.path.basename(mar.rstrip('/'))
+                name = 'coldstart_' + os.path.splitext(label)[0].replace('-', '_')
+                runs = [http_cold_start(url, management_url, os.path.basename(mar.rstrip('/')), name, body,
+                                        pargs.content_type, pargs.scale_to) for _ in range(pargs.repeat)]
+                http.append((label, median_results(runs)))
+
+        if pargs.url:
+            management_url = pargs.management_url
+            if management_url is None:
+                target = loadgen.Target(pargs.url, '', b'')
+                management_url = 'http://{}:{}'.format(target.host, target.port + 1)
+            measure(pargs.url, management_url)
+        else:
+            store = os.path.join(tmp_dir, 'store')
+            os.makedirs(store, exist_ok=True)
+            for mar in models:
+                os.symlink(os.path.abspath(mar), os.path.join(store, os.path.basename(mar.rstrip('/'))))
+            with loadgen.LocalServer(store, models=()) as server:
+                measure(server.url, server.management_url)
+        print('\nMMS end to end, median of {} runs, ms'.format(pargs.repeat))
+        print(format_ms(http, sorted(set(k for _, r in http for k in r))))
+
+    if pargs.output:
+        with open(pargs.output, 'w') as f:
+            json.dump({'backend': dict(backend), 'http': dict(http)}, f, indent=2)
+    return backend, http
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-cold-start', description='MMS cold start benchmark')
+    parser.add_argument('--models', nargs='*', default=None,
+                        help='Model archives (.mar) or extracted model directories to measure. When omitted, '
+                             'synthetic models of --sizes are generated')
+    parser.add_argument('--sizes', type=int, nargs='*', default=SIZES_MB, help='Synthetic model sizes in MiB')
+    parser.add_argument('--handler-imports', nargs='*', default=[],
+                        help='Modules the synthetic handlers import, e.g. numpy mxnet')
+    parser.add_argument('--warmup-count', type=int, default=1,
+                        help='Warmup batches declared in the manifests of the synthetic models, 0 for none')
+    parser.add_argument('-i', '--input', default=None, help='File to send as request body, defaults to noop_ip.txt')
+    parser.add_argument('--data', default=None, help='String to send as request body')
+    parser.add_argument('--content-type', default='application/json', help='Content-Type of the requests')
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='Cold starts per model')
+    parser.add_argument('--predicts', type=int, default=10, help='Predicts after the first one, for the steady time')
+    parser.add_argument('--http', action='store_true',
+                        help='Also time register and scale-up end to end against MMS')
+    parser.add_argument('--scale-to', type=int, default=4, help='Workers to scale up to with --http')
+    parser.add_argument('--url', default=None,
+                        help='Inference address of a running MMS for --http, whose model store has the '
+                             '--models. When omitted, a local MMS is started')
+    parser.add_argument('--management-url', default=None,
+                        help='Management address of a running MMS, defaults to the inference port + 1')
+    parser.add_argument('-o', '--output', default=None, help='Write the results as JSON')
+    pargs = parser.parse_args(argv)
+
+    tmp_dir = tempfile.mkdtemp(prefix='mms-cold-start-')
+    try:
+        models = pargs.models
+        if not models:
+            models = [make_model(tmp_dir, 'synthetic-{}mb'.format(size), size, pargs.handler_imports,
+                                 pargs.warmup_count) for size in pargs.sizes]
+        return run(pargs, models, tmp_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Self-contained asyncio load generator for MMS. It needs neither JMeter nor network access,
+and can start a local MMS serving the bundled noop model. For instructions, run with the
+--help flag.
+
+Two modes are supported:
+    closed  N clients each send a request, wait for the response and send the next one.
+    open    Requests are sent at a fixed arrival rate (uniform or Poisson inter-arrival
+            times) regardless of how fast the server responds. Latency is measured from the
+            time a request was scheduled to be sent, so queueing delay is included even when
+            requests wait for a free connection.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+MMS_BASE = os.path.dirname(BENCHMARK_DIR)
+NOOP_MODEL_STORE = os.path.join(MMS_BASE, 'frontend', 'modelarchive', 'src', 'test', 'resources', 'models')
+NOOP_MODEL = 'noop-v1.0'
+NOOP_INPUT = os.path.join(BENCHMARK_DIR, 'noop_ip.txt')
+
+# Same columns as the aggregate report of benchmark.py
+REPORT_COLUMNS = ['Samples', 'Throughput', 'Average', 'Median', 'p90', 'p99', 'Max', 'Error %']
+
+
+class Histogram(object):
+    """
+    Latency histogram in the spirit of HdrHistogram: values (microseconds) are counted in
+    log-linear buckets with 2 ** (SUB_BUCKET_BITS - 1) buckets per power of two, which bounds
+    the relative error of every reported percentile to about 0.1% at constant memory.
+    """
+
+    SUB_BUCKET_BITS = 11
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value):
+        if value < (1 << cls.SUB_BUCKET_BITS):
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return (shift << (cls.SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @classmethod
+    def _highest_equivalent(cls, index):
+        if index < (1 << cls.SUB_BUCKET_BITS):
+            return index
+        shift = (index >> (cls.SUB_BUCKET_BITS - 1)) - 1
+        return ((index - (shift << (cls.SUB_BUCKET_BITS - 1))) << shift) + (1 << shift) - 1
+
+    def record(self, value, count=1):
+        value = max(int(value), 0)
+        self.counts[self._index(value)] += count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        if self.count == 0:
+            return 0
+        rank = max(1, int(round(percent / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self):
+        return {'counts': {str(k): v for k, v in self.counts.items()}, 'count': self.count,
+                'total': self.total, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls()
+        hist.counts.update({int(k): v for k, v in data['counts'].items()})
+        hist.count = data['count']
+        hist.total = data['total']
+        hist.min = data['min']
+        hist.max = data['max']
+        return hist
+
+
+class Result(object):
+    """
+    Outcome of a load run for one label: a latency histogram of the successful requests,
+    error counts by status and the wall clock duration of the run.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.latency = Histogram()
+        self.errors = defaultdict(int)
+        self.duration = 0.0
+
+    @property
+    def samples(self):
+        return self.latency.count + sum(self.errors.values())
+
+    def throughput(self):
+        return self.latency.count / self.duration if self.duration > 0 else 0.0
+
+    def error_rate(self):
+        return 100.0 * sum(self.errors.values()) / self.samples if self.samples else 0.0
+
+    def summary(self):
+        """Report row, latencies in milliseconds."""
+        return {
+            'Samples': self.samples,
+            'Throughput': round(self.throughput(), 2),
+            'Average': round(self.latency.mean() / 1000.0, 2),
+            'Median': round(self.latency.percentile(50) / 1000.0, 2),
+            'p90': round(self.latency.percentile(90) / 1000.0, 2),
+            'p99': round(self.latency.percentile(99) / 1000.0, 2),
+            'Max': round(self.latency.max / 1000.0, 2),
+            'Error %': round(self.error_rate(), 2),
+        }
+
+
+class HttpConnection(object):
+    """Minimal keep-alive HTTP/1.1 client connection on asyncio streams."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def request(self, method, path, body=b'', headers=None):
+        """
+        Send a request and read the whole response.
+
+        :return: tuple of (status, dict of lowercase headers, body)
+        """
+        if self.writer is None:
+            await self.open()
+        lines = ['{} {} HTTP/1.1'.format(method, path), 'Host: {}:{}'.format(self.host, self.port),
+                 'Content-Length: {}'.format(len(body))]
+        lines += ['{}: {}'.format(k, v) for k, v in (headers or {}).items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            response_body = b''.join(chunks)
+        else:
+            response_body = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, response_headers, response_body
+
+
+class ConnectionPool(object):
+    """Pool of keep-alive connections, at most `size` connections are open at any time."""
+
+    def __init__(self, host, port, size):
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = asyncio.Semaphore(size) if size > 0 else None
+
+    async def request(self, method, path, body=b'', headers=None):
+        if self.slots is not None:
+            await self.slots.acquire()
+        conn = self.idle.pop() if self.idle else HttpConnection(self.host, self.port)
+        try:
+            ret = await conn.request(method, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+        else:
+            self.idle.append(conn)
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+        return ret
+
+    def close(self):
+        for conn in self.idle:
+            conn.close()
+        self.idle = []
+
+
+class Target(object):
+    """An inference endpoint and the request to send to it."""
+
+    def __init__(self, url, model, body, content_type='application/octet-stream', headers=None):
+        if '://' in url:
+            url = url.split('://', 1)[1]
+        host, _, port = url.rstrip('/').partition(':')
+        self.host = host
+        self.port = int(port) if port else 80
+        self.model = model
+        self.path = '/predictions/{}'.format(model)
+        self.body = body
+        self.headers = {'Content-Type': content_type}
+        self.headers.update(headers or {})
+
+
+async def send(pool, target, result, start):
+    """Send one request and record its latency relative to start, the loop time it was due."""
+    loop = asyncio.get_event_loop()
+    try:
+        status, _, _ = await pool.request('POST', target.path, target.body, target.headers)
+    except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+        result.errors[type(e).__name__] += 1
+        return
+    if status == 200:
+        result.latency.record((loop.time() - start) * 1e6)
+    else:
+        result.errors[str(status)] += 1
+
+
+async def closed_loop(target, clients, duration=None, requests=None, label=None):
+    """
+    Run `clients` concurrent clients, each sending its next request when the previous one
+    completed, for `duration` seconds or until `requests` requests were sent in total.
+    """
+    loop = asyncio.get_event_loop()
+    result = Result(label or target.model)
+    pool = ConnectionPool(target.host, target.port, clients)
+    begin = loop.time()
+    end = begin + duration if duration else None
+    remaining = [requests]
+
+    async def client():
+        while end is None or loop.time() < end:
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            await send(pool, target, result, loop.time())
+
+    await asyncio.gather(*[client() for _ in range(clients)])
+    result.duration = loop.time() - begin
+    pool.close()
+    return result
+
+
+def arrival_times(rate, duration=None, requests=None, poisson=True, seed=None):
+    """
+    Yield send times in seconds from the start for a fixed arrival rate, with exponential
+    (Poisson process) or constant inter-arrival times.
+    """
+    rng = random.Random(seed)
+    at = 0.0
+    sent = 0
+    while (requests is None or sent < requests) and (duration is None or at < duration):
+        yield at
+        sent += 1
+        at += rng.expovariate(rate) if poisson else 1.0 / rate
+
+
+async def open_loop(target, rate, duration=None, requests=None, poisson=True, connections=0,
+                    seed=None, label=None):
+    """
+    Send requests at `rate` requests per second regardless of the response times, for
+    `duration` seconds or `requests` requests. Latencies are measured from the intended send
+    time. `connections` limits the number of open connections, 0 for unlimited.
+    """
+    loop = asyncio.get_event_loop()
+    result = Result(label or target.model)
+    pool = ConnectionPool(target.host, target.port, connections)
+    begin = loop.time()
+    tasks = []
+    for at in arrival_times(rate, duration, requests, poisson, seed):
+        delay = begin + at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(send(pool, target, result, begin + at)))
+    await asyncio.gather(*tasks)
+    result.duration = loop.time() - begin
+    pool.close()
+    return result
+
+
+def format_table(results):
+    """Format results as the Throughput/Median/p90/p99 table, latencies in ms."""
+    rows = [['Label'] + REPORT_COLUMNS]
+    for result in results:
+        summary = result.summary()
+        rows.append([result.label] + [str(summary[c]) for c in REPORT_COLUMNS])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.rjust(w) if i else cell.ljust(w) for i, (cell, w) in
+                               enumerate(zip(row, widths))) for row in rows)
+
+
+class LocalServer(object):
+    """
+    Starts MMS in the background with the given model store and models, and stops it on exit.
+    Models are given as name=path pairs relative to the model store.
+    """
+
+    def __init__(self, model_store=NOOP_MODEL_STORE, models=('noop=' + NOOP_MODEL,), port=8080,
+                 management_port=8081, config=None, timeout=120):
+        self.model_store = model_store
+        self.models = list(models)
+        self.port = port
+        self.management_port = management_port
+        self.config = config or {}
+        self.timeout = timeout
+        self.config_file = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.port)
+
+    @property
+    def management_url(self):
+        return 'http://127.0.0.1:{}'.format(self.management_port)
+
+    def __enter__(self):
+        config = {'inference_address': self.url, 'management_address': self.management_url}
+        config.update(self.config)
+        fd, self.config_file = tempfile.mkstemp(suffix='.properties')
+        with os.fdopen(fd, 'w') as f:
+            f.write(''.join('{}={}\n'.format(k, v) for k, v in config.items()))
+        cmd = ['multi-model-server', '--start', '--mms-config', self.config_file,
+               '--model-store', self.model_store]
+        if self.models:
+            cmd += ['--models'] + self.models
+        subprocess.check_call(cmd)
+        self.wait_for_models([m.split('=', 1)[0] for m in self.models])
+        return self
+
+    def wait_for_models(self, names):
+        """Block until every model has a worker ready to serve."""
+        deadline = time.time() + self.timeout
+        for name in names:
+            while not self._ready(name):
+                if time.time() > deadline:
+                    raise RuntimeError('Model {} did not become ready in {}s'.format(name, self.timeout))
+                time.sleep(0.5)
+
+    def _ready(self, name):
+        req = urllib.request.Request('{}/models/{}'.format(self.management_url, name))
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                workers = json.loads(resp.read().decode('utf-8')).get('workers', [])
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+        return any(w.get('status') == 'READY' for w in workers)
+
+    def __exit__(self, *args):
+        subprocess.call(['multi-model-server', '--stop'])
+        if self.config_file is not None:
+            os.remove(self.config_file)
+
+
+def read_input(pargs):
+    if pargs.data is not None:
+        return pargs.data.encode('utf-8')
+    with open(pargs.input or NOOP_INPUT, 'rb') as f:
+        return f.read()
+
+
+def run(pargs, url):
+    target = Target(url, pargs.model, read_input(pargs), pargs.content_type)
+    if pargs.warmup:
+        asyncio.run(closed_loop(target, 1, requests=pargs.warmup))
+    if pargs.mode == 'closed':
+        coro = closed_loop(target, pargs.concurrency, pargs.duration, pargs.requests)
+    else:
+        coro = open_loop(target, pargs.rate, pargs.duration, pargs.requests, pargs.arrival == 'poisson',
+                         pargs.connections, pargs.seed)
+    result = asyncio.run(coro)
+    print(format_table([result]))
+    if result.errors:
+        print('Errors: {}'.format(dict(result.errors)))
+    if pargs.output:
+        with open(pargs.output, 'w') as f:
+            json.dump({'label': result.label, 'mode': pargs.mode, 'summary': result.summary(),
+                       'errors': result.errors, 'histogram': result.latency.to_dict()}, f, indent=2)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-loadgen', description='MMS load generator')
+    parser.add_argument('--url', default=None,
+                        help='Inference address of a running MMS, e.g. http://127.0.0.1:8080. '
+                             'When omitted, a local MMS serving the bundled noop model is started')
+    parser.add_argument('-m', '--model', default='noop', help='Model name, defaults to noop')
+    parser.add_argument('-i', '--input', default=None, help='File to send as request body, defaults to noop_ip.txt')
+    parser.add_argument('--data', default=None, help='String to send as request body')
+    parser.add_argument('--content-type', default='application/json', help='Content-Type of the requests')
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed', help='Closed or open loop')
+    parser.add_argument('-c', '--concurrency', type=int, default=10, help='Clients in closed loop mode')
+    parser.add_argument('-r', '--rate', type=float, default=100.0, help='Requests per second in open loop mode')
+    parser.add_argument('--arrival', choices=['poisson', 'uniform'], default='poisson',
+                        help='Inter-arrival times in open loop mode')
+    parser.add_argument('--connections', type=int, default=0,
+                        help='Maximum open connections in open loop mode, 0 for unlimited')
+    parser.add_argument('-d', '--duration', type=float, default=None, help='Seconds to run')
+    parser.add_argument('-n', '--requests', type=int, default=None, help='Number of requests to send')
+    parser.add_argument('--warmup', type=int, default=10, help='Requests to send before measuring')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for Poisson arrivals')
+    parser.add_argument('-o', '--output', default=None, help='Write the summary and histogram as JSON')
+    pargs = parser.parse_args(argv)
+    if pargs.duration is None and pargs.requests is None:
+        pargs.duration = 30.0
+
+    if pargs.url:
+        return run(pargs, pargs.url)
+    with LocalServer() as server:
+        return run(pargs, server.url)
+
+
+if __name__ == '__main__':
+    main()
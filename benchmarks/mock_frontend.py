@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Python implementation of the frontend side of the OTF protocol, to load test
+mms/model_service_worker.py without building the Java frontend. Starts N backend workers on
+Unix sockets the way WorkerLifeCycle does, loads the model, sends batched predict messages at
+a target rate and reports latencies. For instructions, run with the --help flag.
+
+The frames are those of ModelRequestEncoder and ModelResponseDecoder in
+frontend/server/src/main/java/com/amazonaws/ml/mms/util/codec.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import loadgen
+
+MMS_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_SCRIPT = os.path.join(MMS_BASE, 'mms', 'model_service_worker.py')
+NOOP_MODEL_PATH = os.path.join(loadgen.NOOP_MODEL_STORE, loadgen.NOOP_MODEL)
+NOOP_HANDLER = 'service:handle'
+END_OF_LIST = struct.pack('!i', -1)
+
+
+def _field(buf):
+    if isinstance(buf, str):
+        buf = buf.encode('utf-8')
+    return struct.pack('!i', len(buf)) + buf
+
+
+def encode_load_msg(model_name, model_path, handler, batch_size=1, gpu=None, io_fd=''):
+    """Encode a load model frame."""
+    msg = bytearray(b'L')
+    msg += _field(model_name)
+    msg += _field(model_path)
+    msg += struct.pack('!i', max(batch_size, 1))
+    msg += _field(handler)
+    msg += struct.pack('!i', -1 if gpu is None else gpu)
+    msg += _field(io_fd)
+    return bytes(msg)
+
+
+def encode_predict_msg(batch):
+    """
+    Encode a predict frame.
+
+    :param batch: list of requests in the format returned by retrieve_msg, see make_request
+    :return: bytes
+    """
+    msg = bytearray(b'I')
+    for request in batch:
+        msg += _field(request['requestId'])
+        for header in request['headers']:
+            msg += _field(header['name']) + _field(header['value'])
+        msg += END_OF_LIST
+        for parameter in request['parameters']:
+            msg += _field(parameter['name'])
+            msg += _field(parameter['contentType'])
+            msg += _field(parameter['value'])
+        msg += END_OF_LIST
+    msg += END_OF_LIST
+    return bytes(msg)
+
+
+def make_request(request_id, value, content_type='application/octet-stream', name='body', headers=None):
+    return {'requestId': request_id.encode('utf-8'),
+            'headers': [{'name': k.encode('utf-8'), 'value': v.encode('utf-8')} for k, v in (headers or {}).items()],
+            'parameters': [{'name': name, 'contentType': content_type, 'value': value}]}
+
+
+def _recv_exactly(sock, length):
+    buf = bytearray()
+    while len(buf) < length:
+        pkt = sock.recv(length - len(buf))
+        if not pkt:
+            raise ConnectionError('Worker closed the connection')
+        buf += pkt
+    return bytes(buf)
+
+
+def _recv_int(sock):
+    return struct.unpack('!i', _recv_exactly(sock, 4))[0]
+
+
+def _recv_str(sock):
+    return _recv_exactly(sock, _recv_int(sock)).decode('utf-8')
+
+
+def read_response(sock):
+    """
+    Read a load or predict response frame.
+
+    :return: dict with code, message and a list of predictions, each with requestId,
+             contentType, statusCode, reasonPhrase, headers and body
+    """
+    resp = {'code': _recv_int(sock), 'message': _recv_str(sock), 'predictions': []}
+    while True:
+        length = _recv_int(sock)
+        if length == -1:
+            break
+        prediction = {'requestId': _recv_exactly(sock, length).decode('utf-8'),
+                      'contentType': _recv_str(sock),
+                      'statusCode': _recv_int(sock),
+                      'reasonPhrase': _recv_str(sock)}
+        headers = {}
+        for _ in range(_recv_int(sock)):
+            key = _recv_str(sock)
+            headers[key] = _recv_str(sock)
+        prediction['headers'] = headers
+        prediction['body'] = _recv_exactly(sock, _recv_int(sock))
+        resp['predictions'].append(prediction)
+    return resp
+
+
+def _drain(stream):
+    for _ in iter(lambda: stream.read(65536), b''):
+        pass
+
+
+def _collect(stream, lines):
+    for line in iter(stream.readline, b''):
+        lines.append(line.decode('utf-8', 'replace').rstrip())
+
+
+class MockWorker(object):
+    """
+    A backend worker process and the connection to it, as managed by WorkerThread and
+    WorkerLifeCycle in the frontend.
+    """
+
+    def __init__(self, model_path=NOOP_MODEL_PATH, handler=NOOP_HANDLER, model_name='noop', batch_size=1,
+                 gpu=None, tmp_dir=None, env=None, timeout=120):
+        self.model_path = os.path.abspath(model_path)
+        self.handler = handler
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.gpu = gpu
+        self.tmp_dir = tmp_dir or tempfile.gettempdir()
+        self.env = env or {}
+        self.timeout = timeout
+        self.sock_name = os.path.join(self.tmp_dir, '.mms.mock.{}.sock'.format(uuid.uuid4().hex[:12]))
+        self.io_fd = uuid.uuid4().hex
+        self.process = None
+        self.sock = None
+        self.spawn_time = None
+        self.model_load_time = None
+        self.load_time = None
+        self.load_log = []
+
+    def start(self):
+        """
+        Start the worker process, connect and load the model. Returns the load response.
+        Sets spawn_time, the seconds until the worker listens, model_load_time, the seconds
+        to load the model (import the handler, initialize it and run its warmup), and load_time,
+        the sum. The lines the worker logs until the model is loaded are collected in load_log.
+        """
+        begin = time.time()
+        env = dict(os.environ)
+        env.update(self.env)
+        env['PYTHONPATH'] = os.pathsep.join(p for p in (self.model_path, env.get('PYTHONPATH'), MMS_BASE) if p)
+        cmd = [sys.executable, WORKER_SCRIPT, '--sock-type', 'unix', '--sock-name', self.sock_name,
+               '--handler', self.handler, '--model-path', self.model_path, '--model-name', self.model_name,
+               '--preload-model', 'false', '--tmp-dir', self.tmp_dir]
+        self.process = subprocess.Popen(cmd, cwd=self.model_path, env=env, stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT)
+        for line in iter(self.process.stdout.readline, b''):
+            if line.strip() == b'MMS worker started.':
+                break
+        else:
+            raise RuntimeError('Worker exited with code {}'.format(self.process.wait()))
+        threading.Thread(target=_collect, args=(self.process.stdout, self.load_log), daemon=True).start()
+        self.spawn_time = time.time() - begin
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.sock_name)
+        self.sock.sendall(encode_load_msg(self.model_name, self.model_path, self.handler, self.batch_size,
+                                          self.gpu, self.io_fd))
+        resp = read_response(self.sock)
+        self.model_load_time = time.time() - begin - self.spawn_time
+        # After a load the worker redirects its output to these FIFOs, and blocks until they are opened.
+        for suffix in ('-stdout', '-stderr'):
+            path = os.path.join(self.tmp_dir, self.io_fd + suffix)
+            threading.Thread(target=lambda p=path: _drain(open(p, 'rb')), daemon=True).start()
+        self.load_time = time.time() - begin
+        return resp
+
+    def predict(self, batch):
+        """Send a batch and wait for the response."""
+        self.sock.sendall(encode_predict_msg(batch))
+        return read_response(self.sock)
+
+    def stop(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        for path in (self.sock_name, os.path.join(self.tmp_dir, self.io_fd + '-stdout'),
+                     os.path.join(self.tmp_dir, self.io_fd + '-stderr')):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self):
+        resp = self.start()
+        if resp['code'] != 200:
+            self.stop()
+            raise RuntimeError('Failed to load model: {} {}'.format(resp['code'], resp['message']))
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def drive(workers, rate, duration, make_batch, poisson=True, seed=None):
+    """
+    Send batches to the workers at `rate` batches per second in total for `duration` seconds,
+    split evenly across workers. Each worker handles one batch at a time like in the frontend;
+    latency is measured from the time a batch was due, so time spent waiting for a busy worker
+    is included.
+
+    :param make_batch: function returning the batch for a sequence number
+    :return: loadgen.Result with one latency sample per batch
+    """
+    result = loadgen.Result('{} workers @{:g}/s'.format(len(workers), rate))
+    lock = threading.Lock()
+    begin = time.perf_counter()
+
+    def run(idx, worker):
+        times = loadgen.arrival_times(rate / len(workers), duration, poisson=poisson,
+                                      seed=None if seed is None else seed + idx)
+        for seq, at in enumerate(times):
+            delay = begin + at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                resp = worker.predict(make_batch(seq))
+            except (OSError, ConnectionError) as e:
+                with lock:
+                    result.errors[type(e).__name__] += 1
+                return
+            latency = (time.perf_counter() - begin - at) * 1e6
+            with lock:
+                if resp['code'] == 200:
+                    result.latency.record(latency)
+                else:
+                    result.errors[str(resp['code'])] += 1
+
+    threads = [threading.Thread(target=run, args=(idx, w)) for idx, w in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.duration = time.perf_counter() - begin
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-mock-frontend',
+                                     description='Load test MMS backend workers without the frontend')
+    parser.add_argument('--model-path', default=NOOP_MODEL_PATH, help='Extracted model directory, defaults to noop')
+    parser.add_argument('--handler', default=NOOP_HANDLER, help='Handler entry point')
+    parser.add_argument('--model-name', default='noop', help='Model name')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of workers')
+    parser.add_argument('-b', '--batch-size', type=int, default=1, help='Requests per predict message')
+    parser.add_argument('-r', '--rate', type=float, default=100.0, help='Predict messages per second, all workers')
+    parser.add_argument('--arrival', choices=['poisson', 'uniform'], default='poisson', help='Inter-arrival times')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='Seconds to run')
+    parser.add_argument('-p', '--payload-size', type=int, default=1024, help='Random payload size in bytes')
+    parser.add_argument('-i', '--input', default=None, help='File to send as payload instead of random bytes')
+    parser.add_argument('--content-type', default='application/octet-stream', help='Content type of the payload')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    pargs = parser.parse_args(argv)
+
+    if pargs.input:
+        with open(pargs.input, 'rb') as f:
+            payload = f.read()
+    else:
+        payload = bytes(random.Random(pargs.seed).getrandbits(8) for _ in range(pargs.payload_size))
+
+    def make_batch(seq):
+        return [make_request('{}-{}'.format(seq, idx), payload, pargs.content_type) for idx in range(pargs.batch_size)]
+
+    tmp_dir = tempfile.mkdtemp(prefix='mms-mock-')
+    workers = [MockWorker(pargs.model_path, pargs.handler, pargs.model_name, pargs.batch_size, tmp_dir=tmp_dir)
+               for _ in range(pargs.workers)]
+    try:
+        for worker in workers:
+            resp = worker.start()
+            if resp['code'] != 200:
+                raise RuntimeError('Failed to load model: {} {}'.format(resp['code'], resp['message']))
+            print('Worker loaded in {:.2f} s'.format(worker.load_time))
+        result = drive(workers, pargs.rate, pargs.duration, make_batch, pargs.arrival == 'poisson', pargs.seed)
+    finally:
+        for worker in workers:
+            worker.stop()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(loadgen.format_table([result]))
+    print('Requests per second: {:.2f}'.format(result.throughput() * pargs.batch_size))
+    if result.errors:
+        print('Errors: {}'.format(dict(result.errors)))
+    return result
+
+
+if __name__ == '__main__':
+    main()
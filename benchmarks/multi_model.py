@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Multi-model contention benchmark. Registers K models with a number of workers each, sends
+an open loop of requests spread over the models with Zipf distributed popularity, and reports
+the latency per model together with the memory and CPU use of the MMS processes, sampled with
+the metrics of tests/performance/agents. For instructions, run with the --help flag.
+
+With --isolated, every model is also run alone at the request rate it got in the mix, so that
+the latency increase caused by the other models can be read from the report.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+
+import psutil
+
+import loadgen
+import replay
+import slo_sweep
+
+AGENTS_DIR = os.path.join(loadgen.MMS_BASE, 'tests', 'performance', 'agents')
+sys.path.insert(0, AGENTS_DIR)
+
+# pylint: disable=wrong-import-position
+from metrics import ProcessSampler
+from utils.process import get_process_pid_from_file, get_server_pidfile
+
+SERVER_METRICS = ['sum_all_memory_rss', 'frontend_memory_rss', 'sum_workers_memory_rss',
+                  'frontend_cpu_percent', 'sum_workers_cpu_percent']
+REPORT_METRICS = SERVER_METRICS + ['worker_processes', 'host_memory_used']
+
+
+def zipf_weights(count, s):
+    """Popularity of the models by rank, proportional to 1 / rank^s."""
+    weights = [1.0 / (rank ** s) for rank in range(1, count + 1)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def make_requests(models, weights, rate, duration, seed=None):
+    """Poisson arrivals at `rate` per second, each for a model drawn with the given weights."""
+    rng = random.Random(seed)
+    names = [m['name'] for m in models]
+    by_name = {m['name']: m for m in models}
+    requests = []
+    for at in loadgen.arrival_times(rate, duration, seed=seed):
+        model = by_name[rng.choices(names, weights)[0]]
+        requests.append(replay.TraceRequest(at, model['name'], model['body'], model['content_type'], {}))
+    return requests
+
+
+class ServerMonitor(threading.Thread):
+    """
+    Samples the MMS processes every `interval` seconds while running, with the CPU use of the
+    workers grouped by the model they serve.
+    """
+
+    def __init__(self, server_pid, interval=0.5):
+        super(ServerMonitor, self).__init__(daemon=True)
+        self.sampler = ProcessSampler(psutil.Process(server_pid), SERVER_METRICS, children_interval=interval)
+        self.interval = interval
+        self.samples = []
+        self.model_names = {}
+        self.stopped = threading.Event()
+
+    def _model_name(self, pid):
+        if pid not in self.model_names:
+            try:
+                cmdline = self.sampler.workers[pid].cmdline()
+                self.model_names[pid] = cmdline[cmdline.index('--model-name') + 1]
+            except (psutil.Error, ValueError, IndexError):
+                self.model_names[pid] = None
+        return self.model_names[pid]
+
+    def run(self):
+        while not self.stopped.is_set():
+            sample = self.sampler.sample()
+            sample['worker_processes'] = len(self.sampler.worker_stats)
+            sample['host_memory_used'] = psutil.virtual_memory().used
+            cpu = {}
+            for pid, stats in self.sampler.worker_stats.items():
+                name = self._model_name(pid)
+                cpu[name] = cpu.get(name, 0.0) + stats.get('cpu_percent', 0.0)
+            sample['model_cpu_percent'] = cpu
+            self.samples.append(sample)
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def summary(self):
+        """Mean and max of every metric, and the mean worker CPU percent per model."""
+        # The first sample has no CPU percentages yet, psutil needs two readings.
+        samples = self.samples[1:] or self.samples
+        result = {}
+        for metric in REPORT_METRICS:
+            values = [s[metric] for s in samples if s.get(metric) is not None]
+            if values:
+                result[metric] = {'mean': sum(values) / len(values), 'max': max(values)}
+        models = set(name for s in samples for name in s['model_cpu_percent'])
+        result['model_cpu_percent'] = {name: sum(s['model_cpu_percent'].get(name, 0.0) for s in samples)
+                                             / len(samples) for name in models if name}
+        return result
+
+
+def get_server_pid(pargs):
+    if pargs.server_pid:
+        return pargs.server_pid
+    return get_process_pid_from_file(get_server_pidfile('model_server.pid'))
+
+
+def run_load(url, requests, server_pid, interval, connections):
+    monitor = ServerMonitor(server_pid, interval) if server_pid else None
+    if monitor:
+        monitor.start()
+    try:
+        results, total = asyncio.run(replay.replay(url, requests, connections))
+    finally:
+        if monitor:
+            monitor.stop()
+    return results, total, monitor.summary() if monitor else {}
+
+
+def print_report(models, results, total, server, isolated=None):
+    print(loadgen.format_table([results[m['name']] for m in models if m['name'] in results] + [total]))
+    if isolated:
+        print('\nIsolated p99 per model, ms')
+        for model in models:
+            name = model['name']
+            if name in isolated and name in results:
+                mixed, alone = results[name].summary()['p99'], isolated[name].summary()['p99']
+                print('{:<24} alone {:>10}  mixed {:>10}  {:>+8.1f}%'.format(
+                    name, alone, mixed, (mixed - alone) / alone * 100 if alone else 0.0))
+    if server:
+        print('\nMMS processes, mean / max')
+        for metric in REPORT_METRICS:
+            if metric in server:
+                scale = 1024 * 1024 if 'memory' in metric else 1
+                unit = ' MiB' if 'memory' in metric else ''
+                print('{:<24} {:>10.1f} / {:.1f}{}'.format(metric, server[metric]['mean'] / scale,
+                                                           server[metric]['max'] / scale, unit))
+        print('\nMean worker CPU % per model')
+        for model in models:
+            print('{:<24} {:>10.1f}'.format(model['name'], server['model_cpu_percent'].get(model['name'], 0.0)))
+
+
+def run(pargs, url, management_url):
+    if pargs.models:
+        specs = [m.split('=', 1) for m in pargs.models]
+    else:
+        specs = [['{}{}'.format(pargs.prefix, idx), pargs.model_url] for idx in range(pargs.num_models)]
+    workers = pargs.workers + [pargs.workers[-1]] * (len(specs) - len(pargs.workers))
+    body = loadgen.read_input(pargs)
+    models = [{'name': name, 'url': model_url, 'workers': count, 'body': body,
+               'content_type': pargs.content_type} for (name, model_url), count in zip(specs, workers)]
+    weights = zipf_weights(len(models), pargs.zipf)
+
+    for model in models:
+        print('Registering {} with {} workers'.format(model['name'], model['workers']), flush=True)
+        slo_sweep.register(management_url, model['url'], model['name'], 1, 100, model['workers'])
+
+    server_pid = get_server_pid(pargs)
+    if not server_pid:
+        print('MMS pid file not found, process metrics are not collected. Use --server-pid.')
+
+    requests = make_requests(models, weights, pargs.rate, pargs.duration, pargs.seed)
+    print('Sending {} requests at {:g}/s, Zipf s={:g}'.format(len(requests), pargs.rate, pargs.zipf), flush=True)
+    results, total, server = run_load(url, requests, server_pid, pargs.interval, pargs.connections)
+
+    isolated = {}
+    if pargs.isolated:
+        for model, weight in zip(models, weights):
+            print('Running {} alone at {:.2f}/s'.format(model['name'], pargs.rate * weight), flush=True)
+            alone = make_requests([model], [1.0], pargs.rate * weight, pargs.duration, pargs.seed)
+            isolated[model['name']] = asyncio.run(replay.replay(url, alone, pargs.connections))[1]
+
+    print_report(models, results, total, server, isolated)
+    if pargs.output:
+        with open(pargs.output, 'w') as f:
+            json.dump({'rate': pargs.rate, 'zipf': pargs.zipf, 'duration': pargs.duration,
+                       'models': [{'name': m['name'], 'workers': m['workers'], 'weight': w,
+                                   'summary': results[m['name']].summary() if m['name'] in results else None,
+                                   'isolated': isolated[m['name']].summary() if m['name'] in isolated else None}
+                                  for m, w in zip(models, weights)],
+                       'total': total.summary(), 'server': server}, f, indent=2)
+    return results, total, server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-multi-model',
+                                     description='MMS multi-model contention benchmark')
+    parser.add_argument('--url', default=None,
+                        help='Inference address of a running MMS on this host. When omitted, a local MMS '
+                             'is started')
+    parser.add_argument('--management-url', default=None,
+                        help='Management address of a running MMS, defaults to the inference port + 1')
+    parser.add_argument('--server-pid', type=int, default=None,
+                        help='Pid of the MMS frontend, defaults to the one in the MMS pid file')
+    parser.add_argument('-k', '--num-models', type=int, default=8,
+                        help='Number of copies of --model-url to register, when --models is not given')
+    parser.add_argument('--model-url', default=loadgen.NOOP_MODEL,
+                        help='Model archive to register K times, defaults to the bundled noop model')
+    parser.add_argument('--prefix', default='model', help='Name prefix of the K models')
+    parser.add_argument('--models', nargs='*', default=None,
+                        help='name=archive pairs to register instead, most popular first')
+    parser.add_argument('-w', '--workers', type=int, nargs='*', default=[1],
+                        help='Workers per model, in model order; the last value applies to the remaining models')
+    parser.add_argument('-i', '--input', default=None, help='File to send as request body, defaults to noop_ip.txt')
+    parser.add_argument('--data', default=None, help='String to send as request body')
+    parser.add_argument('--content-type', default='application/json', help='Content-Type of the requests')
+    parser.add_argument('-r', '--rate', type=float, default=200.0, help='Requests per second over all models')
+    parser.add_argument('-s', '--zipf', type=float, default=1.1,
+                        help='Zipf exponent of the model popularity, 0 for a uniform mix')
+    parser.add_argument('-d', '--duration', type=float, default=60.0, help='Seconds to run')
+    parser.add_argument('--isolated', action='store_true',
+                        help='Also run every model alone at its share of the rate')
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between process metric samples')
+    parser.add_argument('--connections', type=int, default=0, help='Maximum open connections, 0 for unlimited')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed of the arrivals and the model mix')
+    parser.add_argument('-o', '--output', default=None, help='Write the report as JSON')
+    pargs = parser.parse_args(argv)
+
+    if pargs.url:
+        management_url = pargs.management_url
+        if management_url is None:
+            target = loadgen.Target(pargs.url, '', b'')
+            management_url = 'http://{}:{}'.format(target.host, target.port + 1)
+        return run(pargs, pargs.url, management_url)
+    with loadgen.LocalServer(models=()) as server:
+        return run(pargs, server.url, server.management_url)
+
+
+if __name__ == '__main__':
+    main()
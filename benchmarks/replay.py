@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Replays a recorded trace of inference requests against MMS at the original or a scaled speed
+and reports latency, throughput and errors per model. For instructions, run with the --help
+flag.
+
+The trace is a JSON lines file with one request per line:
+    {"timestamp": 1592000000.25, "model": "resnet-18", "payload": "images/cat.jpg",
+     "content_type": "image/jpeg", "headers": {"X-Request-Source": "mobile"}}
+timestamp is in seconds, or an ISO 8601 string. payload is a file path relative to the trace
+file; use "data" instead for an inline string body. content_type and headers are optional.
+Requests are sent when they are due regardless of the responses, and latencies are measured
+from that time, like loadgen.open_loop.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+
+import loadgen
+
+EXAMPLE_TRACE = os.path.join(loadgen.BENCHMARK_DIR, 'replay_example.jsonl')
+
+
+class TraceRequest(object):
+    """A request of a trace, due `at` seconds after the start of the replay."""
+
+    def __init__(self, at, model, body, content_type, headers):
+        self.at = at
+        self.model = model
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers
+
+
+def parse_timestamp(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def read_trace(path, speed=1.0, max_gap=None, limit=None):
+    """
+    Read a trace file.
+
+    :param speed: replay speed factor, 2 replays twice as fast as recorded
+    :param max_gap: shorten idle gaps between requests to this many seconds of the trace
+    :param limit: only read the first `limit` requests
+    :return: list of TraceRequest ordered by send time
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    payloads = {}
+    entries = []
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                timestamp = parse_timestamp(entry['timestamp'])
+                model = entry['model']
+            except (ValueError, KeyError) as e:
+                raise ValueError('{}:{}: invalid trace entry: {}'.format(path, lineno, e))
+            if 'data' in entry:
+                body = entry['data'].encode('utf-8')
+            else:
+                payload = os.path.join(base_dir, entry['payload'])
+                if payload not in payloads:
+                    with open(payload, 'rb') as p:
+                        payloads[payload] = p.read()
+                body = payloads[payload]
+            entries.append((timestamp, lineno, model, body, entry.get('content_type', 'application/octet-stream'),
+                            entry.get('headers') or {}))
+            if limit and len(entries) >= limit:
+                break
+
+    entries.sort(key=lambda e: e[:2])
+    requests = []
+    at = 0.0
+    for idx, (timestamp, _, model, body, content_type, headers) in enumerate(entries):
+        if idx:
+            gap = timestamp - entries[idx - 1][0]
+            at += min(gap, max_gap) if max_gap is not None else gap
+        requests.append(TraceRequest(at / speed, model, body, content_type, headers))
+    return requests
+
+
+async def replay(url, requests, connections=0):
+    """
+    Send the requests when they are due.
+
+    :return: dict of model name to loadgen.Result, and a loadgen.Result of all requests
+    """
+    loop = asyncio.get_event_loop()
+    results = {}
+    targets = {}
+    pool = None
+    begin = loop.time()
+    tasks = []
+    for request in requests:
+        key = (request.model, request.content_type, tuple(sorted(request.headers.items())), id(request.body))
+        target = targets.get(key)
+        if target is None:
+            target = targets[key] = loadgen.Target(url, request.model, request.body, request.content_type,
+                                                   request.headers)
+        if pool is None:
+            pool = loadgen.ConnectionPool(target.host, target.port, connections)
+        result = results.get(request.model)
+        if result is None:
+            result = results[request.model] = loadgen.Result(request.model)
+        delay = begin + request.at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(loadgen.send(pool, target, result, begin + request.at)))
+    await asyncio.gather(*tasks)
+    duration = loop.time() - begin
+    if pool is not None:
+        pool.close()
+
+    total = loadgen.Result('all')
+    total.duration = duration
+    for result in results.values():
+        result.duration = duration
+        total.latency.merge(result.latency)
+        for key, count in result.errors.items():
+            total.errors[key] += count
+    return results, total
+
+
+def run(pargs, url):
+    requests = read_trace(pargs.trace, pargs.speed, pargs.max_gap, pargs.limit)
+    if not requests:
+        raise ValueError('The trace {} is empty'.format(pargs.trace))
+    print('Replaying {} requests to {} models over {:.1f} s'.format(
+        len(requests), len(set(r.model for r in requests)), requests[-1].at), flush=True)
+    results, total = asyncio.run(replay(url, requests, pargs.connections))
+    ordered = [results[m] for m in sorted(results)] + [total]
+    print(loadgen.format_table(ordered))
+    for result in ordered:
+        if result.errors:
+            print('Errors {}: {}'.format(result.label, dict(result.errors)))
+    if pargs.output:
+        with open(pargs.output, 'w') as f:
+            json.dump({'trace': pargs.trace, 'speed': pargs.speed,
+                       'models': {r.label: dict(r.summary(), errors=r.errors) for r in ordered}}, f, indent=2)
+    return results, total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-replay', description='Replay a request trace against MMS')
+    parser.add_argument('trace', nargs='?', default=EXAMPLE_TRACE,
+                        help='JSON lines trace file, defaults to an example trace for the noop model')
+    parser.add_argument('--url', default=None,
+                        help='Inference address of a running MMS. When omitted, a local MMS is started with '
+                             'the --models')
+    parser.add_argument('--model-store', default=loadgen.NOOP_MODEL_STORE,
+                        help='Model store of the local MMS, defaults to the one of the noop model')
+    parser.add_argument('--models', nargs='*', default=['noop=' + loadgen.NOOP_MODEL],
+                        help='name=archive pairs to load in the local MMS, defaults to the noop model')
+    parser.add_argument('-s', '--speed', type=float, default=1.0,
+                        help='Replay speed factor, e.g. 2 to replay twice as fast as recorded')
+    parser.add_argument('--max-gap', type=float, default=None,
+                        help='Shorten idle gaps between requests of the trace to this many seconds')
+    parser.add_argument('-n', '--limit', type=int, default=None, help='Only replay the first N requests')
+    parser.add_argument('--connections', type=int, default=0, help='Maximum open connections, 0 for unlimited')
+    parser.add_argument('-o', '--output', default=None, help='Write the per model summaries as JSON')
+    pargs = parser.parse_args(argv)
+
+    if pargs.url:
+        return run(pargs, pargs.url)
+    with loadgen.LocalServer(pargs.model_store, pargs.models) as server:
+        return run(pargs, server.url)
+
+
+if __name__ == '__main__':
+    main()
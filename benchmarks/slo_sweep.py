@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Latency SLO sweep. Steps an open loop request rate up and reports, per batch configuration,
+the highest throughput MMS sustains with p99 latency within the SLO. For instructions, run
+with the --help flag.
+
+Closed loop benchmarks only send a request after the previous one returned, so a slow
+response delays the requests that would have been sent meanwhile and their queueing delay is
+never measured (coordinated omission). The sweep sends requests on a fixed schedule and
+measures each latency from the time the request was due, see loadgen.open_loop.
+"""
+
+import argparse
+import asyncio
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import loadgen
+
+# A rate is only sustained when the server completes this fraction of the offered requests per
+# second, otherwise its queue grows for as long as the step runs. The offered rate is the number of
+# requests actually sent over the step duration: Poisson arrivals vary around the nominal rate.
+MIN_THROUGHPUT_RATIO = 0.95
+
+
+class Step(object):
+    """Result of one rate step of a sweep."""
+
+    def __init__(self, rate, result, slo, max_error, duration):
+        self.rate = rate
+        self.result = result
+        self.offered = result.samples / duration
+        summary = result.summary()
+        self.p99 = summary['p99']
+        self.sustained = (summary['p99'] <= slo and summary['Error %'] <= max_error
+                          and result.throughput() >= MIN_THROUGHPUT_RATIO * self.offered)
+
+
+def rates(start, stop, step, factor=None):
+    """Linear steps from start to stop, or geometric steps if factor is given."""
+    rate = start
+    while rate <= stop + 1e-9:
+        yield rate
+        rate = rate * factor if factor else rate + step
+
+
+def sweep(target, rate_steps, duration, slo, max_error=1.0, connections=0, early_stop=2, seed=None):
+    """
+    Run an open loop step for every rate. Stops after `early_stop` consecutive steps missed the
+    SLO, 0 to run every step.
+
+    :return: list of Step
+    """
+    steps = []
+    misses = 0
+    for rate in rate_steps:
+        label = '{} @{:g}/s'.format(target.model, rate)
+        result = asyncio.run(loadgen.open_loop(target, rate, duration, connections=connections, seed=seed,
+                                               label=label))
+        step = Step(rate, result, slo, max_error, duration)
+        steps.append(step)
+        summary = result.summary()
+        print('rate {:>8g}/s  throughput {:>8}  median {:>8}  p90 {:>8}  p99 {:>8}  errors {:>6}%{}'.format(
+            rate, summary['Throughput'], summary['Median'], summary['p90'], summary['p99'], summary['Error %'],
+            '' if step.sustained else '  SLO missed'), flush=True)
+        misses = 0 if step.sustained else misses + 1
+        if early_stop and misses >= early_stop:
+            break
+    return steps
+
+
+def max_sustainable(steps):
+    """The sustained step with the highest achieved throughput, or None."""
+    sustained = [s for s in steps if s.sustained]
+    return max(sustained, key=lambda s: s.result.throughput()) if sustained else None
+
+
+def register(management_url, model_url, model_name, batch_size, max_batch_delay, workers):
+    """Register (or re-register) the model with the given batch configuration."""
+    req = urllib.request.Request('{}/models/{}'.format(management_url, model_name), method='DELETE')
+    try:
+        urllib.request.urlopen(req, timeout=60).close()
+    except urllib.error.HTTPError as e:
+        if e.code != 404:
+            raise
+    query = urllib.parse.urlencode({'url': model_url, 'model_name': model_name, 'batch_size': batch_size,
+                                    'max_batch_delay': max_batch_delay, 'initial_workers': workers,
+                                    'synchronous': 'true'})
+    req = urllib.request.Request('{}/models?{}'.format(management_url, query), method='POST')
+    urllib.request.urlopen(req, timeout=600).close()
+
+
+def run(pargs, url, management_url):
+    body = loadgen.read_input(pargs)
+    target = loadgen.Target(url, pargs.model, body, pargs.content_type)
+    configs = pargs.batch_sizes or [None]
+    report = []
+    for batch_size in configs:
+        name = pargs.model if batch_size is None else '{} batch_size={}'.format(pargs.model, batch_size)
+        if batch_size is not None:
+            register(management_url, pargs.model_url, pargs.model, batch_size, pargs.max_batch_delay,
+                     pargs.workers)
+        print('\n{}, p99 SLO {} ms'.format(name, pargs.slo))
+        if pargs.warmup:
+            asyncio.run(loadgen.closed_loop(target, 1, requests=pargs.warmup))
+        steps = sweep(target, rates(pargs.start, pargs.stop, pargs.step, pargs.factor), pargs.duration,
+                      pargs.slo, pargs.max_error, pargs.connections, pargs.early_stop, pargs.seed)
+        best = max_sustainable(steps)
+        report.append({
+            'config': name,
+            'batch_size': batch_size,
+            'max_throughput': round(best.result.throughput(), 2) if best else 0.0,
+            'rate': best.rate if best else None,
+            'p99': best.p99 if best else None,
+            'steps': [dict(s.result.summary(), rate=s.rate, offered=round(s.offered, 2), sustained=s.sustained)
+                      for s in steps],
+        })
+
+    print('\nMax sustainable throughput at p99 <= {} ms'.format(pargs.slo))
+    width = max(len(r['config']) for r in report)
+    for r in report:
+        print('{}  {:>10} req/s  (p99 {} ms)'.format(r['config'].ljust(width), r['max_throughput'], r['p99']))
+    if pargs.output:
+        with open(pargs.output, 'w') as f:
+            json.dump({'slo': pargs.slo, 'configs': report}, f, indent=2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-slo-sweep', description='MMS latency SLO sweep')
+    parser.add_argument('--url', default=None,
+                        help='Inference address of a running MMS. When omitted, a local MMS is started '
+                             'with the bundled noop model')
+    parser.add_argument('--management-url', default=None,
+                        help='Management address of a running MMS, defaults to the inference port + 1')
+    parser.add_argument('-m', '--model', default='noop', help='Model name, defaults to noop')
+    parser.add_argument('--model-url', default=loadgen.NOOP_MODEL,
+                        help='Model archive to register for every batch size, defaults to the bundled noop model')
+    parser.add_argument('-i', '--input', default=None, help='File to send as request body, defaults to noop_ip.txt')
+    parser.add_argument('--data', default=None, help='String to send as request body')
+    parser.add_argument('--content-type', default='application/json', help='Content-Type of the requests')
+    parser.add_argument('--slo', type=float, required=True, help='p99 latency SLO in ms')
+    parser.add_argument('--max-error', type=float, default=1.0, help='Maximum error percentage of a sustained rate')
+    parser.add_argument('--start', type=float, default=10.0, help='First request rate per second')
+    parser.add_argument('--stop', type=float, default=1000.0, help='Last request rate per second')
+    parser.add_argument('--step', type=float, default=10.0, help='Rate increment')
+    parser.add_argument('--factor', type=float, default=None,
+                        help='Multiply the rate by this factor at every step instead of adding --step')
+    parser.add_argument('-d', '--duration', type=float, default=30.0, help='Seconds per rate step')
+    parser.add_argument('--early-stop', type=int, default=2,
+                        help='Stop after this many consecutive steps missed the SLO, 0 to run all steps')
+    parser.add_argument('--batch-sizes', type=int, nargs='*', default=None,
+                        help='Re-register the model with each batch size and sweep each configuration')
+    parser.add_argument('--max-batch-delay', type=int, default=100, help='max_batch_delay in ms for --batch-sizes')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Workers per configuration for --batch-sizes')
+    parser.add_argument('--connections', type=int, default=0, help='Maximum open connections, 0 for unlimited')
+    parser.add_argument('--warmup', type=int, default=10, help='Requests to send before every sweep')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for Poisson arrivals')
+    parser.add_argument('-o', '--output', default=None, help='Write all steps and results as JSON')
+    pargs = parser.parse_args(argv)
+
+    if pargs.url:
+        management_url = pargs.management_url
+        if management_url is None:
+            target = loadgen.Target(pargs.url, pargs.model, b'')
+            management_url = 'http://{}:{}'.format(target.host, target.port + 1)
+        return run(pargs, pargs.url, management_url)
+    models = () if pargs.batch_sizes else ('{}={}'.format(pargs.model, pargs.model_url),)
+    with loadgen.LocalServer(models=models) as server:
+        return run(pargs, server.url, server.management_url)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Micro-benchmarks of the Python worker hot path, without the frontend: decoding predict frames
+with retrieve_msg over a socketpair, encoding responses with create_predict_response,
+Service.predict with a noop handler, and the per batch MetricsStore work. Results are stored as
+JSON and can be compared with an earlier run. For instructions, run with the --help flag.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import timeit
+
+MMS_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MMS_BASE)
+
+# pylint: disable=wrong-import-position
+from mms.context import Context, RequestProcessor
+from mms.metrics.metrics_store import MetricsStore
+from mms.protocol.otf_message_handler import create_predict_response, retrieve_msg
+from mms.service import Service
+
+from mock_frontend import encode_predict_msg, make_request
+
+BATCH_SIZES = [1, 8, 32]
+PAYLOAD_SIZES = [64, 4096, 262144]
+HEADERS = {'Content-Type': 'application/octet-stream', 'Accept': '*/*', 'User-Agent': 'microbench'}
+
+
+def make_batch(batch_size, payload_size):
+    payload = os.urandom(payload_size)
+    return [make_request('{:08d}-0000-0000-0000-000000000000'.format(idx), payload, headers=HEADERS)
+            for idx in range(batch_size)]
+
+
+def noop_handler(data, context):  # pylint: disable=unused-argument
+    return ['OK'] * len(data)
+
+
+def measure(func, number, repeat):
+    """Run func number times per repetition; returns per call statistics in microseconds."""
+    times = [t / number * 1e6 for t in timeit.repeat(func, number=number, repeat=repeat)]
+    return {'min_us': round(min(times), 3), 'median_us': round(statistics.median(times), 3),
+            'stdev_us': round(statistics.stdev(times), 3) if len(times) > 1 else 0.0,
+            'number': number, 'repeat': repeat}
+
+
+def bench_decode(frame, number, repeat):
+    """retrieve_msg of number frames written to a socketpair by another thread."""
+    times = []
+    for _ in range(repeat):
+        reader, writer = socket.socketpair()
+        sender = threading.Thread(target=lambda: [writer.sendall(frame) for _ in range(number)])
+        start = time.perf_counter()
+        sender.start()
+        for _ in range(number):
+            retrieve_msg(reader)
+        times.append((time.perf_counter() - start) / number * 1e6)
+        sender.join()
+        reader.close()
+        writer.close()
+    return {'min_us': round(min(times), 3), 'median_us': round(statistics.median(times), 3),
+            'stdev_us': round(statistics.stdev(times), 3) if len(times) > 1 else 0.0,
+            'number': number, 'repeat': repeat}
+
+
+def run_benchmarks(batch_sizes, payload_sizes, number, repeat, pattern=None):
+    results = {}
+
+    def add(name, func):
+        if pattern and pattern not in name:
+            return
+        results[name] = func()
+        print('{:<40} median {:>12.3f} us  min {:>12.3f} us'.format(
+            name, results[name]['median_us'], results[name]['min_us']), flush=True)
+
+    for batch_size in batch_sizes:
+        for payload_size in payload_sizes:
+            suffix = '/batch={}/payload={}'.format(batch_size, payload_size)
+            batch = make_batch(batch_size, payload_size)
+            frame = encode_predict_msg(batch)
+            # Fewer iterations for large frames, so that every case takes a similar time.
+            n = max(10, number * 4096 // max(4096, len(frame)))
+
+            add('decode' + suffix, lambda: bench_decode(frame, n, repeat))
+
+            decoded = [dict(r, parameters=[dict(p) for p in r['parameters']]) for r in batch]
+            service = Service('noop', MMS_BASE, None, noop_handler, None, batch_size)
+            add('predict' + suffix, lambda: measure(lambda: service.predict(decoded), n, repeat))
+
+            req_id_map = {idx: r['requestId'].decode('utf-8') for idx, r in enumerate(batch)}
+            outputs = [os.urandom(payload_size) for _ in range(batch_size)]
+            context = Context('noop', MMS_BASE, None, batch_size, None, '1.0')
+            context.request_processor = [RequestProcessor(dict(HEADERS)) for _ in range(batch_size)]
+            add('encode' + suffix, lambda: measure(
+                lambda: create_predict_response(outputs, req_id_map, 'Prediction success', 200, context), n, repeat))
+
+        req_id_map = {idx: str(idx) for idx in range(batch_size)}
+
+        def metrics():
+            store = MetricsStore(req_id_map, 'noop')
+            store.add_time('PredictionTime', 1.0)
+            for idx in range(batch_size):
+                store.add_counter('Requests', 1, idx)
+
+        add('metrics/batch={}'.format(batch_size), lambda: measure(metrics, number, repeat))
+
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=MMS_BASE,
+                                         stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+            'timestamp': int(time.time())}
+
+
+def compare(results, baseline):
+    """Print the relative change of the median of every case present in both runs."""
+    print('\n{:<40} {:>12} {:>12} {:>8}'.format('case', 'base us', 'new us', 'change'))
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = (result['median_us'] - base['median_us']) / base['median_us'] * 100
+        print('{:<40} {:>12.3f} {:>12.3f} {:>+7.1f}%'.format(name, base['median_us'], result['median_us'], change))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multi-model-server-worker-microbench',
+                                     description='Micro-benchmarks of the MMS Python worker hot path')
+    parser.add_argument('-b', '--batch-sizes', type=int, nargs='*', default=BATCH_SIZES, help='Batch sizes')
+    parser.add_argument('-p', '--payload-sizes', type=int, nargs='*', default=PAYLOAD_SIZES,
+                        help='Payload sizes in bytes')
+    parser.add_argument('-n', '--number', type=int, default=1000, help='Calls per repetition for small frames')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Repetitions per case')
+    parser.add_argument('-k', '--filter', default=None, help='Only run cases whose name contains this string')
+    parser.add_argument('-o', '--output', default=None, help='Write the results as JSON')
+    parser.add_argument('--compare', default=None, help='JSON results of an earlier run to compare with')
+    pargs = parser.parse_args(argv)
+
+    results = run_benchmarks(pargs.batch_sizes, pargs.payload_sizes, pargs.number, pargs.repeat, pargs.filter)
+    if pargs.output:
+        with open(pargs.output, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2, sort_keys=True)
+    if pargs.compare:
+        with open(pargs.compare) as f:
+            compare(results, json.load(f)['results'])
+    return results
+
+
+if __name__ == '__main__':
+    main()
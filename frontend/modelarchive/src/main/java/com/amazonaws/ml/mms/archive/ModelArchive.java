@@ -33,13 +33,17 @@ import java.nio.charset.StandardCharsets;
 import java.security.DigestInputStream;
 import java.security.MessageDigest;
 import java.security.NoSuchAlgorithmException;
+import java.util.Base64;
 import java.util.Enumeration;
+import java.util.Locale;
 import java.util.regex.Pattern;
 import java.util.zip.ZipEntry;
 import java.util.zip.ZipFile;
 import java.util.zip.ZipOutputStream;
 import org.apache.commons.io.FileUtils;
 import org.apache.commons.io.IOUtils;
+import org.apache.commons.io.input.CloseShieldInputStream;
+import org.apache.commons.io.output.NullOutputStream;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
@@ -53,6 +57,10 @@ public class ModelArchive {
             Pattern.compile("http(s)?://.*", Pattern.CASE_INSENSITIVE);
 
     private static final String MANIFEST_FILE = "MANIFEST.json";
+    private static final String SHA256_FRAGMENT = "sha256=";
+    private static final String SHA256_DIGEST = "sha-256=";
+
+    public static final int DEFAULT_DOWNLOAD_CONNECTIONS = 4;
 
     private Manifest manifest;
     private String url;
@@ -68,8 +76,28 @@ public class ModelArchive {
 
     public static ModelArchive downloadModel(String modelStore, String url)
             throws ModelException, IOException {
+        return downloadModel(modelStore, url, DEFAULT_DOWNLOAD_CONNECTIONS);
+    }
+
+    /**
+     * Loads a model archive from the model store or downloads it from a http(s) url.
+     *
+     * <p>Large archives are downloaded with up to {@code connections} parallel range requests if
+     * the server supports them, and extracted while they are downloading. An expected SHA-256
+     * digest of the archive can be given as url fragment, {@code model.mar#sha256=<hex digest>}, or
+     * by the server in a {@code Digest} header. The archive is rejected if it does not match.
+     *
+     * @param modelStore model store directory
+     * @param url model store relative path or http(s) url
+     * @param connections maximum number of parallel connections used for a download
+     * @return the model archive
+     * @throws ModelException if the model cannot be found, downloaded or is invalid
+     * @throws IOException if the model cannot be extracted
+     */
+    public static ModelArchive downloadModel(String modelStore, String url, int connections)
+            throws ModelException, IOException {
         if (URL_PATTERN.matcher(url).matches()) {
-            File modelDir = download(url);
+            File modelDir = download(url, connections);
             return load(url, modelDir, true);
         }
 
@@ -87,7 +115,7 @@ public class ModelArchive {
         }
         if (modelLocation.isFile()) {
             try (InputStream is = new FileInputStream(modelLocation)) {
-                File unzipDir = unzip(is, null);
+                File unzipDir = unzip(is, null, null);
                 return load(url, unzipDir, true);
             }
         }
@@ -143,10 +171,12 @@ public class ModelArchive {
         }
     }
 
-    private static File download(String path) throws ModelException, IOException {
+    private static File download(String path, int connections)
+            throws ModelException, IOException {
         HttpURLConnection conn;
+        URL url;
         try {
-            URL url = new URL(path);
+            url = new URL(path);
             conn = (HttpURLConnection) url.openConnection();
             if (conn.getResponseCode() != HttpURLConnection.HTTP_OK) {
                 throw new DownloadModelException(
@@ -173,17 +203,59 @@ public class ModelArchive {
                 }
                 File dir = new File(modelDir, eTag);
                 if (dir.exists()) {
+                    conn.disconnect();
                     logger.info("model folder already exists: {}", eTag);
                     return dir;
                 }
             }
 
-            return unzip(conn.getInputStream(), eTag);
+            String digest = getExpectedDigest(url, conn.getHeaderField("Digest"));
+            long length = conn.getContentLengthLong();
+            if (connections > 1
+                    && length >= 2 * RangedDownload.DEFAULT_CHUNK_SIZE
+                    && "bytes".equalsIgnoreCase(conn.getHeaderField("Accept-Ranges"))) {
+                conn.disconnect();
+                logger.info("Downloading {} with {} connections.", path, connections);
+                try (RangedDownload download =
+                        new RangedDownload(
+                                url, length, connections, RangedDownload.DEFAULT_CHUNK_SIZE)) {
+                    return unzip(download.getInputStream(), eTag, digest);
+                }
+            }
+
+            return unzip(conn.getInputStream(), eTag, digest);
         } catch (SocketTimeoutException e) {
             throw new DownloadModelException("Download model timeout: " + path, e);
         }
     }
 
+    /**
+     * Returns the expected SHA-256 digest of a download as hex string, from the url fragment
+     * "sha256=&lt;hex&gt;" or the "SHA-256=&lt;base64&gt;" entry of the Digest response header.
+     */
+    static String getExpectedDigest(URL url, String digestHeader) {
+        String ref = url.getRef();
+        if (ref != null && ref.toLowerCase(Locale.ROOT).startsWith(SHA256_FRAGMENT)) {
+            return ref.substring(SHA256_FRAGMENT.length()).toLowerCase(Locale.ROOT);
+        }
+        if (digestHeader != null) {
+            for (String entry : digestHeader.split(",")) {
+                String value = entry.trim();
+                if (value.toLowerCase(Locale.ROOT).startsWith(SHA256_DIGEST)) {
+                    try {
+                        byte[] digest =
+                                Base64.getDecoder()
+                                        .decode(value.substring(SHA256_DIGEST.length()));
+                        return Hex.toHexString(digest);
+                    } catch (IllegalArgumentException e) {
+                        logger.warn("Ignoring invalid Digest header: {}", digestHeader);
+                    }
+                }
+            }
+        }
+        return null;
+    }
+
     private static ModelArchive load(String url, File dir, boolean extracted)
             throws InvalidModelException, IOException {
         boolean failed = true;
@@ -266,7 +338,20 @@ public class ModelArchive {
         }
     }
 
-    public static File unzip(InputStream is, String eTag) throws IOException {
+    /**
+     * Extracts a model archive into the model directory named after its eTag, or the SHA1 digest
+     * of the archive if the eTag is null.
+     *
+     * @param is archive stream
+     * @param eTag name of the model directory, may be null
+     * @param sha256 expected SHA-256 digest of the whole stream as hex string, null to skip the
+     *     verification
+     * @return the model directory
+     * @throws DownloadModelException if the archive does not match the expected digest
+     * @throws IOException if the archive cannot be extracted
+     */
+    public static File unzip(InputStream is, String eTag, String sha256)
+            throws DownloadModelException, IOException {
         File tmpDir = FileUtils.getTempDirectory();
         File modelDir = new File(tmpDir, "models");
         FileUtils.forceMkdir(modelDir);
@@ -276,12 +361,34 @@ public class ModelArchive {
         FileUtils.forceMkdir(tmp);
 
         MessageDigest md;
+        MessageDigest sha256Md;
         try {
             md = MessageDigest.getInstance("SHA1");
+            sha256Md = MessageDigest.getInstance("SHA-256");
         } catch (NoSuchAlgorithmException e) {
             throw new AssertionError(e);
         }
-        ZipUtils.unzip(new DigestInputStream(is, md), tmp);
+        boolean failed = true;
+        try (DigestInputStream sha256Is = new DigestInputStream(is, sha256Md)) {
+            ZipUtils.unzip(new DigestInputStream(new CloseShieldInputStream(sha256Is), md), tmp);
+            // The zip stream stops before the central directory, the digest covers the archive.
+            IOUtils.copy(sha256Is, NullOutputStream.NULL_OUTPUT_STREAM);
+            if (sha256 != null) {
+                String actual = Hex.toHexString(sha256Md.digest());
+                if (!actual.equalsIgnoreCase(sha256)) {
+                    throw new DownloadModelException(
+                            "Model archive digest mismatch, expected sha256: "
+                                    + sha256
+                                    + ", actual: "
+                                    + actual);
+                }
+            }
+            failed = false;
+        } finally {
+            if (failed) {
+                FileUtils.deleteQuietly(tmp);
+            }
+        }
         if (eTag == null) {
             eTag = Hex.toHexString(md.digest());
         }
@@ -0,0 +1,252 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.archive;
+
+import java.io.Closeable;
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InterruptedIOException;
+import java.net.HttpURLConnection;
+import java.net.URL;
+import java.nio.ByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.file.StandardOpenOption;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.atomic.AtomicInteger;
+import org.apache.commons.io.FileUtils;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+/**
+ * Downloads a file with several HTTP range requests in parallel. Chunks are fetched in order, so
+ * the downloaded prefix of the file grows while the download is running and can be consumed through
+ * {@link #getInputStream()}, e.g. to extract an archive while the rest is still downloading. A
+ * chunk that fails is resumed from the last byte received.
+ */
+final class RangedDownload implements Closeable {
+
+    private static final Logger logger = LoggerFactory.getLogger(RangedDownload.class);
+
+    static final long DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024;
+    static final int MAX_RETRIES = 3;
+    private static final int READ_TIMEOUT = 30000;
+
+    private URL url;
+    private long length;
+    private long chunkSize;
+    private int chunks;
+    private long[] received;
+    private int completeChunks;
+    private IOException failure;
+    private boolean closed;
+    private AtomicInteger nextChunk;
+    private File file;
+    private FileChannel channel;
+    private ExecutorService executor;
+
+    RangedDownload(URL url, long length, int connections, long chunkSize) throws IOException {
+        this.url = url;
+        this.length = length;
+        this.chunkSize = chunkSize;
+        chunks = (int) ((length + chunkSize - 1) / chunkSize);
+        received = new long[chunks];
+        nextChunk = new AtomicInteger();
+
+        File modelDir = new File(FileUtils.getTempDirectory(), "models");
+        FileUtils.forceMkdir(modelDir);
+        file = File.createTempFile("model", ".part", modelDir);
+        channel =
+                FileChannel.open(
+                        file.toPath(), StandardOpenOption.READ, StandardOpenOption.WRITE);
+
+        int threads = Math.min(connections, chunks);
+        executor = Executors.newFixedThreadPool(threads);
+        for (int i = 0; i < threads; ++i) {
+            executor.submit(this::fetchChunks);
+        }
+        executor.shutdown();
+    }
+
+    /**
+     * Returns a stream over the downloaded file. Reads block until the requested bytes have been
+     * downloaded, and fail if the download failed.
+     *
+     * @return stream over the whole file
+     */
+    InputStream getInputStream() {
+        return new PrefixInputStream();
+    }
+
+    private void fetchChunks() {
+        int chunk;
+        while ((chunk = nextChunk.getAndIncrement()) < chunks) {
+            try {
+                fetchChunk(chunk);
+            } catch (IOException e) {
+                fail(e);
+                return;
+            } catch (RuntimeException e) {
+                fail(new IOException(e));
+                return;
+            }
+        }
+    }
+
+    private void fetchChunk(int chunk) throws IOException {
+        long start = chunk * chunkSize;
+        long end = start + chunkSize(chunk) - 1;
+        byte[] buf = new byte[64 * 1024];
+        int retries = 0;
+        long position;
+        while ((position = start + received(chunk)) <= end) {
+            try {
+                fetchRange(chunk, position, end, buf);
+            } catch (IOException e) {
+                if (isClosed() || ++retries > MAX_RETRIES) {
+                    throw e;
+                }
+                logger.warn("Download of {} failed at byte {}, resuming.", url, position, e);
+                continue;
+            }
+            if (start + received(chunk) <= end && ++retries > MAX_RETRIES) {
+                throw new IOException("Incomplete response for range " + position + '-' + end);
+            }
+        }
+    }
+
+    private void fetchRange(int chunk, long start, long end, byte[] buf) throws IOException {
+        HttpURLConnection conn = (HttpURLConnection) url.openConnection();
+        try {
+            conn.setReadTimeout(READ_TIMEOUT);
+            conn.setRequestProperty("Range", "bytes=" + start + '-' + end);
+            if (conn.getResponseCode() != HttpURLConnection.HTTP_PARTIAL) {
+                throw new IOException(
+                        "Range request not supported, code: " + conn.getResponseCode());
+            }
+            try (InputStream is = conn.getInputStream()) {
+                long position = start;
+                int read;
+                while (position <= end && (read = is.read(buf)) != -1) {
+                    read = (int) Math.min(read, end - position + 1);
+                    ByteBuffer bb = ByteBuffer.wrap(buf, 0, read);
+                    while (bb.hasRemaining()) {
+                        channel.write(bb, position + bb.position());
+                    }
+                    position += read;
+                    progress(chunk, read);
+                }
+            }
+        } catch (IOException e) {
+            conn.disconnect();
+            throw e;
+        }
+    }
+
+    private synchronized long received(int chunk) {
+        return received[chunk];
+    }
+
+    private synchronized void progress(int chunk, int bytes) throws IOException {
+        if (closed) {
+            throw new InterruptedIOException("Download cancelled.");
+        }
+        received[chunk] += bytes;
+        while (completeChunks < chunks
+                && received[completeChunks] == chunkSize(completeChunks)) {
+            ++completeChunks;
+        }
+        notifyAll();
+    }
+
+    private synchronized void fail(IOException e) {
+        if (failure == null) {
+            failure = e;
+        }
+        notifyAll();
+    }
+
+    private synchronized boolean isClosed() {
+        return closed;
+    }
+
+    private long chunkSize(int chunk) {
+        return Math.min(chunkSize, length - chunk * chunkSize);
+    }
+
+    /** Number of bytes from the beginning of the file that have been downloaded. */
+    private long available() {
+        if (completeChunks == chunks) {
+            return length;
+        }
+        return completeChunks * chunkSize + received[completeChunks];
+    }
+
+    private synchronized long awaitAvailable(long position) throws IOException {
+        try {
+            while (failure == null && !closed && position >= available()) {
+                wait();
+            }
+        } catch (InterruptedException e) {
+            throw new InterruptedIOException("Interrupted while downloading: " + url);
+        }
+        if (failure != null) {
+            throw new IOException("Failed to download: " + url, failure);
+        }
+        if (closed) {
+            throw new IOException("Download closed.");
+        }
+        return available();
+    }
+
+    @Override
+    public void close() throws IOException {
+        synchronized (this) {
+            closed = true;
+            notifyAll();
+        }
+        executor.shutdownNow();
+        channel.close();
+        FileUtils.deleteQuietly(file);
+    }
+
+    private final class PrefixInputStream extends InputStream {
+
+        private long position;
+
+        @Override
+        public int read() throws IOException {
+            byte[] buf = new byte[1];
+            int read = read(buf, 0, 1);
+            return read == -1 ? -1 : buf[0] & 0xff;
+        }
+
+        @Override
+        public int read(byte[] b, int off, int len) throws IOException {
+            if (len == 0) {
+                return 0;
+            }
+            if (position >= length) {
+                return -1;
+            }
+            long available = awaitAvailable(position);
+            int toRead = (int) Math.min(len, available - position);
+            int read = channel.read(ByteBuffer.wrap(b, off, toRead), position);
+            if (read > 0) {
+                position += read;
+            }
+            return read;
+        }
+    }
+}
@@ -0,0 +1,152 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.archive;
+
+import com.sun.net.httpserver.HttpExchange;
+import com.sun.net.httpserver.HttpServer;
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.net.InetSocketAddress;
+import java.net.URL;
+import java.nio.file.Files;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.Random;
+import java.util.concurrent.Executors;
+import java.util.concurrent.atomic.AtomicInteger;
+import org.apache.commons.io.IOUtils;
+import org.testng.Assert;
+import org.testng.annotations.AfterClass;
+import org.testng.annotations.BeforeClass;
+import org.testng.annotations.Test;
+
+public class RangedDownloadTest {
+
+    private static final long CHUNK_SIZE = 64 * 1024;
+
+    private HttpServer server;
+    private byte[] content;
+    private byte[] archive;
+    private AtomicInteger requests = new AtomicInteger();
+    private AtomicInteger failures = new AtomicInteger();
+
+    @BeforeClass
+    public void beforeClass() throws IOException {
+        content = new byte[1024 * 1024 + 123];
+        new Random(0).nextBytes(content);
+
+        File mar = new File("build/tmp/test/noop-ranged.mar");
+        mar.getParentFile().mkdirs();
+        ZipUtils.zip(new File("src/test/resources/models/noop-v1.0"), mar, false);
+        archive = Files.readAllBytes(mar.toPath());
+
+        server = HttpServer.create(new InetSocketAddress("127.0.0.1", 0), 0);
+        server.createContext("/content", exchange -> serve(exchange, content));
+        server.createContext("/noop.mar", exchange -> serve(exchange, archive));
+        server.setExecutor(Executors.newFixedThreadPool(4));
+        server.start();
+    }
+
+    @AfterClass
+    public void afterClass() {
+        server.stop(0);
+    }
+
+    @Test
+    public void testParallelDownload() throws IOException {
+        requests.set(0);
+        try (RangedDownload download =
+                        new RangedDownload(url("/content"), content.length, 4, CHUNK_SIZE);
+                InputStream is = download.getInputStream()) {
+            Assert.assertEquals(IOUtils.toByteArray(is), content);
+        }
+        Assert.assertEquals(requests.get(), (content.length + CHUNK_SIZE - 1) / CHUNK_SIZE);
+    }
+
+    @Test
+    public void testResumeDownload() throws IOException {
+        requests.set(0);
+        failures.set(3);
+        try (RangedDownload download =
+                        new RangedDownload(url("/content"), content.length, 4, CHUNK_SIZE);
+                InputStream is = download.getInputStream()) {
+            Assert.assertEquals(IOUtils.toByteArray(is), content);
+        }
+        Assert.assertEquals(failures.get(), 0);
+        Assert.assertEquals(requests.get(), (content.length + CHUNK_SIZE - 1) / CHUNK_SIZE + 3);
+    }
+
+    @Test
+    public void testDigest() throws ModelException, IOException, NoSuchAlgorithmException {
+        String digest = Hex.toHexString(MessageDigest.getInstance("SHA-256").digest(archive));
+        ModelArchive model =
+                ModelArchive.downloadModel(null, url("/noop.mar#sha256=" + digest).toString());
+        Assert.assertEquals(model.getModelName(), "noop");
+        model.clean();
+
+        try {
+            ModelArchive.downloadModel(null, url("/noop.mar#sha256=0123").toString());
+            Assert.fail("Digest mismatch not detected.");
+        } catch (DownloadModelException e) {
+            Assert.assertTrue(e.getMessage().startsWith("Model archive digest mismatch"));
+        }
+    }
+
+    @Test
+    public void testDigestHeader() throws IOException {
+        URL url = url("/noop.mar");
+        Assert.assertEquals(
+                ModelArchive.getExpectedDigest(url, "MD5=HUXZLQLMuI/KZ5KDcJPcOA==, SHA-256=AAEC"),
+                "000102");
+        Assert.assertEquals(
+                ModelArchive.getExpectedDigest(url("/noop.mar#SHA256=ABCD"), null), "abcd");
+        Assert.assertNull(ModelArchive.getExpectedDigest(url, null));
+    }
+
+    private URL url(String path) throws IOException {
+        return new URL("http://127.0.0.1:" + server.getAddress().getPort() + path);
+    }
+
+    private void serve(HttpExchange exchange, byte[] data) throws IOException {
+        requests.incrementAndGet();
+        String range = exchange.getRequestHeaders().getFirst("Range");
+        exchange.getResponseHeaders().add("Accept-Ranges", "bytes");
+        if (range == null) {
+            exchange.sendResponseHeaders(200, data.length);
+            try (OutputStream os = exchange.getResponseBody()) {
+                os.write(data);
+            }
+            return;
+        }
+
+        String[] bounds = range.substring("bytes=".length()).split("-");
+        int start = Integer.parseInt(bounds[0]);
+        int end = Integer.parseInt(bounds[1]);
+        int length = end - start + 1;
+        exchange.getResponseHeaders()
+                .add("Content-Range", "bytes " + start + '-' + end + '/' + data.length);
+        exchange.sendResponseHeaders(206, length);
+        OutputStream os = exchange.getResponseBody();
+        if (failures.getAndUpdate(i -> Math.max(0, i - 1)) > 0) {
+            // Drop the connection half way through the range.
+            os.write(data, start, length / 2);
+            os.flush();
+            exchange.close();
+            return;
+        }
+        os.write(data, start, length);
+        os.close();
+    }
+}
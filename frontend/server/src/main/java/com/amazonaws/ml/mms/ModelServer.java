@@ -20,6 +20,7 @@ import com.amazonaws.ml.mms.util.ConfigManager;
 import com.amazonaws.ml.mms.util.Connector;
 import com.amazonaws.ml.mms.util.ConnectorType;
 import com.amazonaws.ml.mms.util.ServerGroups;
+import com.amazonaws.ml.mms.wlm.AutoScaler;
 import com.amazonaws.ml.mms.wlm.ModelManager;
 import com.amazonaws.ml.mms.wlm.WorkLoadManager;
 import io.netty.bootstrap.ServerBootstrap;
@@ -29,6 +30,7 @@ import io.netty.channel.ChannelOption;
 import io.netty.channel.EventLoopGroup;
 import io.netty.channel.FixedRecvByteBufAllocator;
 import io.netty.channel.ServerChannel;
+import io.netty.handler.codec.http.HttpResponseStatus;
 import io.netty.handler.ssl.SslContext;
 import io.netty.util.internal.logging.InternalLoggerFactory;
 import io.netty.util.internal.logging.Slf4JLoggerFactory;
@@ -41,8 +43,11 @@ import java.util.HashMap;
 import java.util.InvalidPropertiesFormatException;
 import java.util.List;
 import java.util.ServiceLoader;
-import java.util.Set;
+import java.util.concurrent.CompletableFuture;
 import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.TimeUnit;
 import java.util.concurrent.TimeoutException;
 import java.util.concurrent.atomic.AtomicBoolean;
 import org.apache.commons.cli.CommandLine;
@@ -64,6 +69,7 @@ public class ModelServer {
     private List<ChannelFuture> futures = new ArrayList<>(2);
     private AtomicBoolean stopped = new AtomicBoolean(false);
     private ConfigManager configManager;
+    private ExecutorService startupPool;
     public static final int MAX_RCVBUF_SIZE = 4096;
 
     /** Creates a new {@code ModelServer} instance. */
@@ -103,6 +109,9 @@ public class ModelServer {
             List<ChannelFuture> channelFutures = start();
             // Create and schedule metrics manager
             MetricManager.scheduleMetrics(configManager);
+            if (configManager.isAutoScalingEnabled()) {
+                AutoScaler.scheduleAutoScaling(configManager);
+            }
             System.out.println("Model server started."); // NOPMD
             channelFutures.get(0).sync();
         } catch (InvalidPropertiesFormatException e) {
@@ -122,29 +131,32 @@ public class ModelServer {
         }
     }
 
-    private void initModelStore() {
+    /**
+     * Initializes the model manager and lists the models to load at startup.
+     *
+     * @return pairs of {model name, url}, model name is null when it should be derived from the
+     *     url
+     */
+    private List<String[]> initModelStore() {
         WorkLoadManager wlm = new WorkLoadManager(configManager, serverGroups.getBackendGroup());
         ModelManager.init(configManager, wlm);
-        Set<String> startupModels = ModelManager.getInstance().getStartupModels();
-        String defaultModelName;
+        List<String[]> initialModels = new ArrayList<>();
         String loadModels = configManager.getLoadModels();
         if (loadModels == null || loadModels.isEmpty()) {
-            return;
+            return initialModels;
         }
 
-        ModelManager modelManager = ModelManager.getInstance();
-        int workers = configManager.getDefaultWorkers();
         if ("ALL".equalsIgnoreCase(loadModels)) {
             String modelStore = configManager.getModelStore();
             if (modelStore == null) {
                 logger.warn("Model store is not configured.");
-                return;
+                return initialModels;
             }
 
             File modelStoreDir = new File(modelStore);
             if (!modelStoreDir.exists()) {
                 logger.warn("Model store path is not found: {}", modelStore);
-                return;
+                return initialModels;
             }
 
             // Check folders to see if they can be models as well
@@ -160,74 +172,105 @@ public class ModelServer {
                             && !fileName.endsWith(".model")) {
                         continue;
                     }
-                    try {
-                        logger.debug(
-                                "Loading models from model store: {} preload_model: {}",
-                                file.getName(),
-                                configManager.getPreloadModel());
-                        defaultModelName = getDefaultModelName(fileName);
-
-                        ModelArchive archive =
-                                modelManager.registerModel(
-                                        file.getName(),
-                                        defaultModelName,
-                                        configManager.getPreloadModel());
-                        modelManager.updateModel(archive.getModelName(), workers, workers);
-                        startupModels.add(archive.getModelName());
-                    } catch (ModelException
-                            | IOException
-                            | InterruptedException
-                            | ExecutionException
-                            | TimeoutException e) {
-                        logger.warn("Failed to load model: " + file.getAbsolutePath(), e);
-                    }
+                    initialModels.add(new String[] {null, fileName});
                 }
             }
+        } else {
+            String[] models = loadModels.split(",");
+            for (String model : models) {
+                String[] pair = model.split("=", 2);
+                String modelName = null;
+                String url;
+                if (pair.length == 1) {
+                    url = pair[0];
+                } else {
+                    modelName = pair[0];
+                    url = pair[1];
+                }
+                if (url.isEmpty()) {
+                    continue;
+                }
+                initialModels.add(new String[] {modelName, url});
+            }
+        }
+
+        return initialModels;
+    }
+
+    private void loadInitialModels(List<String[]> initialModels) {
+        if (initialModels.isEmpty()) {
             return;
         }
 
-        String[] models = loadModels.split(",");
-        for (String model : models) {
-            String[] pair = model.split("=", 2);
-            String modelName = null;
-            String url;
-            if (pair.length == 1) {
-                url = pair[0];
-            } else {
-                modelName = pair[0];
-                url = pair[1];
-            }
-            if (url.isEmpty()) {
-                continue;
+        // Archive extraction and backend server start are independent per model, so the
+        // registrations run concurrently. Parallelism is bounded to avoid starting more python
+        // interpreters at once than there are cores to run them. The listeners are already bound,
+        // so /ping reports the readiness of each model while they load.
+        int workers = configManager.getDefaultWorkers();
+        int threads =
+                Math.max(1, Math.min(configManager.getStartupModelThreads(), initialModels.size()));
+        logger.info("Loading {} initial models with {} threads.", initialModels.size(), threads);
+
+        startupPool = Executors.newFixedThreadPool(threads);
+        try {
+            for (String[] pair : initialModels) {
+                startupPool.execute(() -> loadInitialModel(pair[0], pair[1], workers));
             }
+        } finally {
+            startupPool.shutdown();
+        }
+    }
+
+    /**
+     * Waits until the models to load at startup are registered and their workers started.
+     *
+     * @return false if the timeout elapsed first
+     * @throws InterruptedException if interrupted
+     */
+    public boolean awaitInitialModels(long timeout, TimeUnit unit) throws InterruptedException {
+        return startupPool == null || startupPool.awaitTermination(timeout, unit);
+    }
 
-            try {
-                logger.info(
-                        "Loading initial models: {} preload_model: {}",
-                        url,
-                        configManager.getPreloadModel());
-                defaultModelName = getDefaultModelName(url);
-
-                ModelArchive archive =
-                        modelManager.registerModel(
-                                url,
-                                modelName,
-                                null,
-                                null,
-                                1,
-                                100,
-                                configManager.getDefaultResponseTimeout(),
-                                defaultModelName,
-                                configManager.getPreloadModel());
-                modelManager.updateModel(archive.getModelName(), workers, workers);
-                startupModels.add(archive.getModelName());
-            } catch (ModelException
-                    | IOException
-                    | InterruptedException
-                    | ExecutionException
-                    | TimeoutException e) {
-                logger.warn("Failed to load model: " + url, e);
+    private void loadInitialModel(String modelName, String url, int workers) {
+        ModelManager modelManager = ModelManager.getInstance();
+        long begin = System.currentTimeMillis();
+        try {
+            logger.info(
+                    "Loading initial models: {} preload_model: {}",
+                    url,
+                    configManager.getPreloadModel());
+            String defaultModelName = getDefaultModelName(url);
+
+            ModelArchive archive =
+                    modelManager.registerModel(
+                            url,
+                            modelName,
+                            null,
+                            null,
+                            1,
+                            100,
+                            configManager.getDefaultResponseTimeout(),
+                            defaultModelName,
+                            configManager.getPreloadModel());
+            CompletableFuture<HttpResponseStatus> future =
+                    modelManager.updateModel(archive.getModelName(), workers, workers);
+            modelManager.getStartupModels().add(archive.getModelName());
+            // Wait for the workers to load, so that the pool also bounds the worker starts.
+            HttpResponseStatus status =
+                    future.get(configManager.getDefaultResponseTimeout(), TimeUnit.SECONDS);
+            if (!HttpResponseStatus.OK.equals(status)) {
+                logger.warn("Failed to start workers of model {}: {}", url, status);
             }
+            logger.info(
+                    "Model {} registered in {} ms.",
+                    archive.getModelName(),
+                    System.currentTimeMillis() - begin);
+        } catch (ModelException
+                | IOException
+                | InterruptedException
+                | ExecutionException
+                | TimeoutException e) {
+            logger.warn("Failed to load model: " + url, e);
         }
     }
 
@@ -312,7 +355,7 @@ public class ModelServer {
 
         logger.info(configManager.dumpConfigurations());
 
-        initModelStore();
+        List<String[]> initialModels = initModelStore();
 
         Connector inferenceConnector = configManager.getListener(false);
         Connector managementConnector = configManager.getListener(true);
@@ -344,6 +387,7 @@ public class ModelServer {
                             inferenceConnector, serverGroup, workerGroup, ConnectorType.BOTH));
         }
 
+        loadInitialModels(initialModels);
         return futures;
     }
 
@@ -378,6 +422,9 @@ public class ModelServer {
         }
 
         stopped.set(true);
+        if (startupPool != null) {
+            startupPool.shutdownNow();
+        }
         for (ChannelFuture future : futures) {
             future.channel().close();
         }
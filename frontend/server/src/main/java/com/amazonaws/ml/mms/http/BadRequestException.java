@@ -26,6 +26,19 @@ public class BadRequestException extends IllegalArgumentException {
         super(message);
     }
 
+    /**
+     * Constructs an {@code BadRequestException} with the specified detail message and cause.
+     *
+     * @param message The detail message (which is saved for later retrieval by the {@link
+     *     #getMessage()} method)
+     * @param cause The cause (which is saved for later retrieval by the {@link #getCause()}
+     *     method). (A null value is permitted, and indicates that the cause is nonexistent or
+     *     unknown.)
+     */
+    public BadRequestException(String message, Throwable cause) {
+        super(message, cause);
+    }
+
     /**
      * Constructs an {@code BadRequestException} with the specified detail message and cause.
      *
@@ -27,6 +27,14 @@ public class DescribeModelResponse {
     private int maxWorkers;
     private int batchSize;
     private int maxBatchDelay;
+    private String batchPolicy;
+    private Integer latencySlo;
+    private int[] bucketBoundaries;
+    private boolean coalesceRequests;
+    private Long cacheTtl;
+    private Long cacheSize;
+    private Long cacheHits;
+    private Long cacheMisses;
     private String status;
     private boolean loadedAtStartup;
 
@@ -117,6 +125,70 @@ public class DescribeModelResponse {
         this.maxBatchDelay = maxBatchDelay;
     }
 
+    public String getBatchPolicy() {
+        return batchPolicy;
+    }
+
+    public void setBatchPolicy(String batchPolicy) {
+        this.batchPolicy = batchPolicy;
+    }
+
+    public Integer getLatencySlo() {
+        return latencySlo;
+    }
+
+    public void setLatencySlo(Integer latencySlo) {
+        this.latencySlo = latencySlo;
+    }
+
+    public int[] getBucketBoundaries() {
+        return bucketBoundaries;
+    }
+
+    public void setBucketBoundaries(int[] bucketBoundaries) {
+        this.bucketBoundaries = bucketBoundaries;
+    }
+
+    public boolean isCoalesceRequests() {
+        return coalesceRequests;
+    }
+
+    public void setCoalesceRequests(boolean coalesceRequests) {
+        this.coalesceRequests = coalesceRequests;
+    }
+
+    public Long getCacheTtl() {
+        return cacheTtl;
+    }
+
+    public void setCacheTtl(Long cacheTtl) {
+        this.cacheTtl = cacheTtl;
+    }
+
+    public Long getCacheSize() {
+        return cacheSize;
+    }
+
+    public void setCacheSize(Long cacheSize) {
+        this.cacheSize = cacheSize;
+    }
+
+    public Long getCacheHits() {
+        return cacheHits;
+    }
+
+    public void setCacheHits(Long cacheHits) {
+        this.cacheHits = cacheHits;
+    }
+
+    public Long getCacheMisses() {
+        return cacheMisses;
+    }
+
+    public void setCacheMisses(Long cacheMisses) {
+        this.cacheMisses = cacheMisses;
+    }
+
     public String getStatus() {
         return status;
     }
@@ -171,6 +171,8 @@ public class InferenceRequestHandler extends HttpRequestHandlerChain {
         }
 
         Job job = new Job(ctx, modelName, WorkerCommands.PREDICT, input);
+        job.setPriority(req.headers().getInt(Model.PRIORITY_HEADER, 0));
+        job.setTimeout(req.headers().getInt(Model.TIMEOUT_HEADER, 0));
         if (!ModelManager.getInstance().addJob(job)) {
             throw new ServiceUnavailableException(
                     "No worker is available to serve request: " + modelName);
@@ -20,8 +20,10 @@ import com.amazonaws.ml.mms.http.messages.RegisterModelRequest;
 import com.amazonaws.ml.mms.util.ConfigManager;
 import com.amazonaws.ml.mms.util.JsonUtils;
 import com.amazonaws.ml.mms.util.NettyUtils;
+import com.amazonaws.ml.mms.wlm.BatchPolicy;
 import com.amazonaws.ml.mms.wlm.Model;
 import com.amazonaws.ml.mms.wlm.ModelManager;
+import com.amazonaws.ml.mms.wlm.ResponseCache;
 import com.amazonaws.ml.mms.wlm.WorkerThread;
 import io.netty.channel.ChannelHandlerContext;
 import io.netty.handler.codec.http.FullHttpRequest;
@@ -33,11 +35,13 @@ import io.netty.handler.codec.http.QueryStringDecoder;
 import io.netty.util.CharsetUtil;
 import java.io.IOException;
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Collections;
 import java.util.List;
 import java.util.Map;
 import java.util.concurrent.CompletableFuture;
 import java.util.concurrent.ExecutionException;
+import java.util.concurrent.TimeUnit;
 import java.util.concurrent.TimeoutException;
 import java.util.function.Function;
 import software.amazon.ai.mms.servingsdk.ModelServerEndpoint;
@@ -84,7 +88,7 @@ public class ManagementRequestHandler extends HttpRequestHandlerChain {
                 if (HttpMethod.GET.equals(method)) {
                     handleDescribeModel(ctx, segments[2]);
                 } else if (HttpMethod.PUT.equals(method)) {
-                    handleScaleModel(ctx, decoder, segments[2]);
+                    handleUpdateModel(ctx, decoder, segments[2]);
                 } else if (HttpMethod.DELETE.equals(method)) {
                     handleUnregisterModel(ctx, segments[2]);
                 } else {
@@ -148,6 +152,17 @@ public class ManagementRequestHandler extends HttpRequestHandlerChain {
         resp.setModelUrl(model.getModelUrl());
         resp.setBatchSize(model.getBatchSize());
         resp.setMaxBatchDelay(model.getMaxBatchDelay());
+        resp.setBatchPolicy(model.getBatchPolicy().getName());
+        resp.setLatencySlo(model.getBatchPolicy().getLatencySlo());
+        resp.setBucketBoundaries(model.getBucketBoundaries());
+        resp.setCoalesceRequests(model.isCoalesceRequests());
+        ResponseCache cache = model.getResponseCache();
+        if (cache != null) {
+            resp.setCacheTtl(TimeUnit.MILLISECONDS.toSeconds(cache.getTtl()));
+            resp.setCacheSize(cache.getCapacity() / 1024 / 1024);
+            resp.setCacheHits(cache.getHits());
+            resp.setCacheMisses(cache.getMisses());
+        }
         resp.setMaxWorkers(model.getMaxWorkers());
         resp.setMinWorkers(model.getMinWorkers());
         resp.setLoadedAtStartup(modelManager.getStartupModels().contains(modelName));
@@ -196,6 +211,16 @@ public class ManagementRequestHandler extends HttpRequestHandlerChain {
         if (responseTimeout == -1) {
             responseTimeout = ConfigManager.getInstance().getDefaultResponseTimeout();
         }
+        BatchPolicy batchPolicy =
+                createBatchPolicy(
+                        registerModelRequest.getBatchPolicy(),
+                        registerModelRequest.getLatencySlo());
+        int[] bucketBoundaries = parseBucketBoundaries(registerModelRequest.getBucketBoundaries());
+        int cacheTtl = registerModelRequest.getCacheTtl();
+        int cacheSize = registerModelRequest.getCacheSize();
+        if (cacheTtl < 0 || (cacheTtl > 0 && cacheSize <= 0)) {
+            throw new BadRequestException("cache_ttl and cache_size must be positive.");
+        }
         Manifest.RuntimeType runtimeType = null;
         if (runtime != null) {
             try {
@@ -225,6 +250,19 @@ public class ManagementRequestHandler extends HttpRequestHandlerChain {
         }
 
         modelName = archive.getModelName();
+        modelManager.setBatchPolicy(modelName, batchPolicy);
+        if (bucketBoundaries != null) {
+            modelManager.setBucketBoundaries(modelName, bucketBoundaries);
+        }
+        modelManager.setCoalesceRequests(modelName, registerModelRequest.isCoalesceRequests());
+        if (cacheTtl > 0) {
+            ResponseCache cache =
+                    new ResponseCache(
+                            modelName,
+                            TimeUnit.SECONDS.toMillis(cacheTtl),
+                            cacheSize * 1024L * 1024L);
+            modelManager.setResponseCache(modelName, cache);
+        }
 
         final String msg = "Model \"" + modelName + "\" registered";
         if (initialWorkers <= 0) {
@@ -259,6 +297,33 @@ public class ManagementRequestHandler extends HttpRequestHandlerChain {
         NettyUtils.sendJsonResponse(ctx, new StatusResponse(msg));
     }
 
+    private void handleUpdateModel(
+            ChannelHandlerContext ctx, QueryStringDecoder decoder, String modelName)
+            throws ModelException {
+        Map<String, List<String>> params = decoder.parameters();
+        boolean swap = params.containsKey("url");
+        boolean batching =
+                params.containsKey("batch_policy") || params.containsKey("bucket_boundaries");
+        boolean scaling =
+                params.containsKey("min_worker")
+                        || params.containsKey("max_worker")
+                        || params.containsKey("number_gpu");
+        // Each update is applied on its own, a mixed request would silently lose some settings.
+        if ((swap ? 1 : 0) + (batching ? 1 : 0) + (scaling ? 1 : 0) > 1) {
+            throw new BadRequestException(
+                    "Parameters url, batch_policy/bucket_boundaries and min_worker/max_worker"
+                            + " cannot be combined, update them in separate calls.");
+        }
+
+        if (swap) {
+            handleSwapModel(ctx, decoder, modelName);
+        } else if (batching) {
+            handleBatching(ctx, decoder, modelName);
+        } else {
+            handleScaleModel(ctx, decoder, modelName);
+        }
+    }
+
     private void handleScaleModel(
             ChannelHandlerContext ctx, QueryStringDecoder decoder, String modelName)
             throws ModelNotFoundException {
@@ -277,6 +342,100 @@ public class ManagementRequestHandler extends HttpRequestHandlerChain {
         updateModelWorkers(ctx, modelName, minWorkers, maxWorkers, synchronous, null);
     }
 
+    private void handleBatching(
+            ChannelHandlerContext ctx, QueryStringDecoder decoder, String modelName)
+            throws ModelNotFoundException {
+        ModelManager modelManager = ModelManager.getInstance();
+        if (decoder.parameters().containsKey("batch_policy")) {
+            BatchPolicy batchPolicy =
+                    createBatchPolicy(
+                            NettyUtils.getParameter(decoder, "batch_policy", null),
+                            NettyUtils.getIntParameter(decoder, "latency_slo", 0));
+            modelManager.setBatchPolicy(modelName, batchPolicy);
+        }
+        if (decoder.parameters().containsKey("bucket_boundaries")) {
+            int[] bucketBoundaries =
+                    parseBucketBoundaries(
+                            NettyUtils.getParameter(decoder, "bucket_boundaries", null));
+            modelManager.setBucketBoundaries(modelName, bucketBoundaries);
+        }
+
+        Model model = modelManager.getModels().get(modelName);
+        String msg = "Model \"" + modelName + "\" uses " + model.getBatchPolicy().getName();
+        if (model.getBucketBoundaries() != null) {
+            msg += " bucketed";
+        }
+        NettyUtils.sendJsonResponse(ctx, new StatusResponse(msg + " batching"));
+    }
+
+    private static BatchPolicy createBatchPolicy(String name, int latencySlo) {
+        try {
+            return BatchPolicy.create(name, latencySlo);
+        } catch (IllegalArgumentException e) {
+            throw new BadRequestException(e);
+        }
+    }
+
+    private static int[] parseBucketBoundaries(String value) {
+        if (value == null || value.isEmpty()) {
+            return null;
+        }
+        String[] tokens = value.split(",");
+        int[] boundaries = new int[tokens.length];
+        for (int i = 0; i < tokens.length; ++i) {
+            try {
+                boundaries[i] = Integer.parseInt(tokens[i].trim());
+            } catch (NumberFormatException e) {
+                throw new BadRequestException("Invalid bucket_boundaries: " + value, e);
+            }
+            if (boundaries[i] <= 0) {
+                throw new BadRequestException("Invalid bucket_boundaries: " + value);
+            }
+        }
+        Arrays.sort(boundaries);
+        return boundaries;
+    }
+
+    private void handleSwapModel(
+            ChannelHandlerContext ctx, QueryStringDecoder decoder, String modelName)
+            throws ModelException {
+        String modelUrl = NettyUtils.getParameter(decoder, "url", null);
+        if (modelUrl == null || modelUrl.isEmpty()) {
+            throw new BadRequestException("Parameter url is required.");
+        }
+        boolean synchronous =
+                Boolean.parseBoolean(NettyUtils.getParameter(decoder, "synchronous", null));
+
+        ModelManager modelManager = ModelManager.getInstance();
+        CompletableFuture<HttpResponseStatus> future;
+        try {
+            future = modelManager.swapModel(modelName, modelUrl);
+        } catch (IOException e) {
+            throw new InternalServerException("Failed to save model: " + modelUrl, e);
+        }
+
+        if (!synchronous) {
+            NettyUtils.sendJsonResponse(
+                    ctx,
+                    new StatusResponse("Processing model update..."),
+                    HttpResponseStatus.ACCEPTED);
+            return;
+        }
+        future.thenAccept(
+                v -> {
+                    if (HttpResponseStatus.OK.equals(v)) {
+                        NettyUtils.sendJsonResponse(
+                                ctx, new StatusResponse("Model \"" + modelName + "\" updated"));
+                    } else {
+                        NettyUtils.sendError(
+                                ctx,
+                                v,
+                                new InternalServerException(
+                                        "Failed to update model, previous version restored"));
+                    }
+                });
+    }
+
     private void updateModelWorkers(
             final ChannelHandlerContext ctx,
             final String modelName,
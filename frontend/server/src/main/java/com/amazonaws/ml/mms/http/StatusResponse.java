@@ -12,9 +12,12 @@
  */
 package com.amazonaws.ml.mms.http;
 
+import java.util.Map;
+
 public class StatusResponse {
 
     private String status;
+    private Map<String, String> models;
 
     public StatusResponse() {}
 
@@ -29,4 +32,12 @@ public class StatusResponse {
     public void setStatus(String status) {
         this.status = status;
     }
+
+    public Map<String, String> getModels() {
+        return models;
+    }
+
+    public void setModels(Map<String, String> models) {
+        this.models = models;
+    }
 }
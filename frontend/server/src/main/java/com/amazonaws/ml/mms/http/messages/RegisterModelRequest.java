@@ -34,6 +34,24 @@ public class RegisterModelRequest {
     @SerializedName("max_batch_delay")
     private int maxBatchDelay;
 
+    @SerializedName("batch_policy")
+    private String batchPolicy;
+
+    @SerializedName("latency_slo")
+    private int latencySlo;
+
+    @SerializedName("bucket_boundaries")
+    private String bucketBoundaries;
+
+    @SerializedName("coalesce_requests")
+    private boolean coalesceRequests;
+
+    @SerializedName("cache_ttl")
+    private int cacheTtl;
+
+    @SerializedName("cache_size")
+    private int cacheSize;
+
     @SerializedName("initial_workers")
     private int initialWorkers;
 
@@ -55,6 +73,13 @@ public class RegisterModelRequest {
         handler = NettyUtils.getParameter(decoder, "handler", null);
         batchSize = NettyUtils.getIntParameter(decoder, "batch_size", 1);
         maxBatchDelay = NettyUtils.getIntParameter(decoder, "max_batch_delay", 100);
+        batchPolicy = NettyUtils.getParameter(decoder, "batch_policy", null);
+        latencySlo = NettyUtils.getIntParameter(decoder, "latency_slo", 0);
+        bucketBoundaries = NettyUtils.getParameter(decoder, "bucket_boundaries", null);
+        coalesceRequests =
+                Boolean.parseBoolean(NettyUtils.getParameter(decoder, "coalesce_requests", null));
+        cacheTtl = NettyUtils.getIntParameter(decoder, "cache_ttl", 0);
+        cacheSize = NettyUtils.getIntParameter(decoder, "cache_size", 64);
         initialWorkers =
                 NettyUtils.getIntParameter(
                         decoder,
@@ -69,6 +94,7 @@ public class RegisterModelRequest {
     public RegisterModelRequest() {
         batchSize = 1;
         maxBatchDelay = 100;
+        cacheSize = 64;
         synchronous = true;
         initialWorkers = ConfigManager.getInstance().getConfiguredDefaultWorkersPerModel();
         responseTimeout = -1;
@@ -95,6 +121,30 @@ public class RegisterModelRequest {
         return maxBatchDelay;
     }
 
+    public String getBatchPolicy() {
+        return batchPolicy;
+    }
+
+    public Integer getLatencySlo() {
+        return latencySlo;
+    }
+
+    public String getBucketBoundaries() {
+        return bucketBoundaries;
+    }
+
+    public Boolean isCoalesceRequests() {
+        return coalesceRequests;
+    }
+
+    public Integer getCacheTtl() {
+        return cacheTtl;
+    }
+
+    public Integer getCacheSize() {
+        return cacheSize;
+    }
+
     public Integer getInitialWorkers() {
         return initialWorkers;
     }
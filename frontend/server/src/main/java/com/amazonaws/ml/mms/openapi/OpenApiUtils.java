@@ -96,6 +96,9 @@ public final class OpenApiUtils {
         Schema schema = new Schema("object");
         schema.addProperty(
                 "status", new Schema("string", "Overall status of the Model Server."), true);
+        Schema models = new Schema("object", "Readiness of each registered model.");
+        models.setAdditionalProperties(new Schema("string"));
+        schema.addProperty("models", models, false);
         MediaType mediaType = new MediaType(HttpHeaderValues.APPLICATION_JSON.toString(), schema);
 
         Operation operation = new Operation("ping");
@@ -319,6 +322,7 @@ public final class OpenApiUtils {
                         "integer",
                         "100",
                         "Maximum delay for batch aggregation, default: 100."));
+        addBatchingParameters(operation);
         operation.addParameter(
                 new QueryParameter(
                         "response_timeout",
@@ -343,6 +347,27 @@ public final class OpenApiUtils {
                         "boolean",
                         "false",
                         "Decides if model should be preloaded, default: false."));
+        operation.addParameter(
+                new QueryParameter(
+                        "coalesce_requests",
+                        "boolean",
+                        "false",
+                        "Decides whether identical requests that arrive while one of them is queued"
+                                + " or running share its response, default: false."));
+        operation.addParameter(
+                new QueryParameter(
+                        "cache_ttl",
+                        "integer",
+                        "0",
+                        "Time, in seconds, responses are cached by request input. Use only for"
+                                + " deterministic models, default: 0, no caching."));
+        operation.addParameter(
+                new QueryParameter(
+                        "cache_size",
+                        "integer",
+                        "64",
+                        "Maximum size, in MB, of the response cache. The least recently used"
+                                + " responses are evicted first, default: 64."));
 
         Manifest.RuntimeType[] types = Manifest.RuntimeType.values();
         List<String> runtimeTypes = new ArrayList<>(types.length);
@@ -421,6 +446,34 @@ public final class OpenApiUtils {
                 "maxBatchDelay",
                 new Schema("integer", "Configured maximum batch delay in ms."),
                 false);
+        schema.addProperty(
+                "batchPolicy", new Schema("string", "Batch aggregation policy."), false);
+        schema.addProperty(
+                "latencySlo",
+                new Schema("integer", "Latency SLO in ms of the adaptive batch policy."),
+                false);
+        Schema bucketBoundaries =
+                new Schema("array", "Payload length boundaries of the batching buckets.");
+        bucketBoundaries.setItems(new Schema("integer"));
+        schema.addProperty("bucketBoundaries", bucketBoundaries, false);
+        schema.addProperty(
+                "coalesceRequests",
+                new Schema("boolean", "Whether identical requests are coalesced."),
+                false);
+        schema.addProperty(
+                "cacheTtl",
+                new Schema("integer", "Response cache time to live in seconds."),
+                false);
+        schema.addProperty(
+                "cacheSize", new Schema("integer", "Response cache size in MB."), false);
+        schema.addProperty(
+                "cacheHits",
+                new Schema("integer", "Number of requests answered from the response cache."),
+                false);
+        schema.addProperty(
+                "cacheMisses",
+                new Schema("integer", "Number of requests not found in the response cache."),
+                false);
         schema.addProperty(
                 "status", new Schema("string", "Overall health status of the model"), true);
 
@@ -492,6 +545,13 @@ public final class OpenApiUtils {
                         "Waiting up to the specified wait time if necessary for"
                                 + " a worker to complete all pending requests. Use 0 to terminate backend"
                                 + " worker process immediately. Use -1 for wait infinitely."));
+        operation.addParameter(
+                new QueryParameter(
+                        "url",
+                        "Model archive URL of a new version of the model. When present, the"
+                                + " workers load the new version one at a time and switch to it"
+                                + " without dropping requests."));
+        addBatchingParameters(operation);
 
         MediaType status = getStatusResponse();
         MediaType error = getErrorResponse();
@@ -501,11 +561,39 @@ public final class OpenApiUtils {
         operation.addResponse(new Response("210", "Partial Success", status));
         operation.addResponse(new Response("400", "Bad request", error));
         operation.addResponse(new Response("404", "Model not found", error));
+        operation.addResponse(new Response("409", "Model update in progress", error));
         operation.addResponse(new Response("500", "Internal Server Error", error));
 
         return operation;
     }
 
+    private static void addBatchingParameters(Operation operation) {
+        Parameter batchPolicy =
+                new QueryParameter(
+                        "batch_policy",
+                        "string",
+                        "fixed",
+                        "Batch aggregation policy. fixed always waits up to max_batch_delay for"
+                                + " batch_size requests, adaptive tunes both from observed latency"
+                                + " to meet latency_slo, default: fixed.");
+        List<String> policies = new ArrayList<>();
+        policies.add("fixed");
+        policies.add("adaptive");
+        batchPolicy.getSchema().setEnumeration(policies);
+        operation.addParameter(batchPolicy);
+        operation.addParameter(
+                new QueryParameter(
+                        "latency_slo",
+                        "integer",
+                        "Target request latency in ms, required for the adaptive batch policy."));
+        operation.addParameter(
+                new QueryParameter(
+                        "bucket_boundaries",
+                        "Comma separated payload lengths in bytes. When present, each batch only"
+                                + " contains requests of the same length bucket, or of the same"
+                                + " X-MMS-Bucket header. Empty disables bucketing."));
+    }
+
     private static Path getModelPath(String modelName) {
         Operation operation =
                 new Operation(modelName, "A predict entry point for model: " + modelName + '.');
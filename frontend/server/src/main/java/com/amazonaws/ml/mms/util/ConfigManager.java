@@ -12,6 +12,7 @@
  */
 package com.amazonaws.ml.mms.util;
 
+import com.amazonaws.ml.mms.archive.ModelArchive;
 import io.netty.handler.ssl.SslContext;
 import io.netty.handler.ssl.SslContextBuilder;
 import io.netty.handler.ssl.util.SelfSignedCertificate;
@@ -69,6 +70,8 @@ public final class ConfigManager {
     private static final String MMS_NUMBER_OF_NETTY_THREADS = "number_of_netty_threads";
     private static final String MMS_NETTY_CLIENT_THREADS = "netty_client_threads";
     private static final String MMS_JOB_QUEUE_SIZE = "job_queue_size";
+    private static final String MMS_STARTUP_MODEL_THREADS = "startup_model_threads";
+    private static final String MMS_MODEL_DOWNLOAD_CONNECTIONS = "model_download_connections";
     private static final String MMS_NUMBER_OF_GPU = "number_of_gpu";
     private static final String MMS_ASYNC_LOGGING = "async_logging";
     private static final String MMS_CORS_ALLOWED_ORIGIN = "cors_allowed_origin";
@@ -92,6 +95,12 @@ public final class ConfigManager {
     private static final String USE_NATIVE_IO = "use_native_io";
     private static final String IO_RATIO = "io_ratio";
     private static final String METRIC_TIME_INTERVAL = "metric_time_interval";
+    private static final String ENABLE_AUTOSCALING = "enable_autoscaling";
+    private static final String AUTOSCALE_INTERVAL = "autoscale_interval";
+    private static final String AUTOSCALE_UP_COOLDOWN = "autoscale_up_cooldown";
+    private static final String AUTOSCALE_DOWN_COOLDOWN = "autoscale_down_cooldown";
+    private static final String AUTOSCALE_LATENCY_TARGET = "autoscale_latency_target";
+    private static final String AUTOSCALE_MEMORY_LIMIT = "autoscale_memory_limit";
     private static final String ENABLE_ENVVARS_CONFIG = "enable_envvars_config";
 
     // Variables which are local
@@ -271,6 +280,16 @@ public final class ConfigManager {
         return getIntProperty(MMS_JOB_QUEUE_SIZE, 100);
     }
 
+    public int getStartupModelThreads() {
+        return getIntProperty(
+                MMS_STARTUP_MODEL_THREADS, Runtime.getRuntime().availableProcessors());
+    }
+
+    public int getModelDownloadConnections() {
+        return getIntProperty(
+                MMS_MODEL_DOWNLOAD_CONNECTIONS, ModelArchive.DEFAULT_DOWNLOAD_CONNECTIONS);
+    }
+
     public int getNumberOfGpu() {
         return getIntProperty(MMS_NUMBER_OF_GPU, 0);
     }
@@ -311,6 +330,30 @@ public final class ConfigManager {
         return getIntProperty(METRIC_TIME_INTERVAL, 60);
     }
 
+    public boolean isAutoScalingEnabled() {
+        return Boolean.parseBoolean(getProperty(ENABLE_AUTOSCALING, "false"));
+    }
+
+    public int getAutoScaleInterval() {
+        return getIntProperty(AUTOSCALE_INTERVAL, 10);
+    }
+
+    public int getAutoScaleUpCooldown() {
+        return getIntProperty(AUTOSCALE_UP_COOLDOWN, 30);
+    }
+
+    public int getAutoScaleDownCooldown() {
+        return getIntProperty(AUTOSCALE_DOWN_COOLDOWN, 300);
+    }
+
+    public int getAutoScaleLatencyTarget() {
+        return getIntProperty(AUTOSCALE_LATENCY_TARGET, 0);
+    }
+
+    public int getAutoScaleMemoryLimit() {
+        return getIntProperty(AUTOSCALE_MEMORY_LIMIT, 0);
+    }
+
     public String getModelServerHome() {
         String mmsHome = System.getenv("MODEL_SERVER_HOME");
         if (mmsHome == null) {
@@ -496,6 +539,10 @@ public final class ConfigManager {
                 + getNettyClientThreads()
                 + "\nDefault workers per model: "
                 + getDefaultWorkers()
+                + "\nStartup model threads: "
+                + getStartupModelThreads()
+                + "\nModel download connections: "
+                + getModelDownloadConnections()
                 + "\nBlacklist Regex: "
                 + prop.getProperty(MMS_BLACKLIST_ENV_VARS, "N/A")
                 + "\nMaximum Response Size: "
@@ -505,7 +552,9 @@ public final class ConfigManager {
                 + "\nPreload model: "
                 + prop.getProperty(MMS_PRELOAD_MODEL, "false")
                 + "\nPrefer direct buffer: "
-                + prop.getProperty(MMS_PREFER_DIRECT_BUFFER, "false");
+                + prop.getProperty(MMS_PREFER_DIRECT_BUFFER, "false")
+                + "\nAutoscaling: "
+                + isAutoScalingEnabled();
     }
 
     public boolean useNativeIo() {
@@ -12,14 +12,41 @@
  */
 package com.amazonaws.ml.mms.util.messages;
 
+import com.amazonaws.ml.mms.archive.Hex;
+import java.nio.ByteBuffer;
 import java.nio.charset.StandardCharsets;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.HashMap;
+import java.util.HashSet;
 import java.util.List;
+import java.util.Locale;
 import java.util.Map;
+import java.util.Set;
+import java.util.TreeMap;
 
 public class RequestInput {
 
+    // Headers that differ between identical requests without changing the inference result.
+    private static final Set<String> DIGEST_EXCLUDED_HEADERS =
+            new HashSet<>(
+                    Arrays.asList(
+                            "accept-encoding",
+                            "connection",
+                            "content-length",
+                            "date",
+                            "host",
+                            "keep-alive",
+                            "traceparent",
+                            "tracestate",
+                            "user-agent",
+                            "x-amzn-trace-id",
+                            "x-mms-priority",
+                            "x-mms-timeout",
+                            "x-request-id"));
+
     private String requestId;
     private Map<String, String> headers;
     private List<InputParameter> parameters;
@@ -70,4 +97,50 @@ public class RequestInput {
         }
         return null;
     }
+
+    /**
+     * Returns a SHA-256 digest of the parameters and headers of the request. Requests with the
+     * same digest get the same inference result. Headers that only describe the connection or the
+     * scheduling of the request are not part of the digest.
+     *
+     * @return hex encoded digest
+     */
+    public String getDigest() {
+        MessageDigest md;
+        try {
+            md = MessageDigest.getInstance("SHA-256");
+        } catch (NoSuchAlgorithmException e) {
+            throw new AssertionError(e);
+        }
+        for (InputParameter param : parameters) {
+            updateDigest(md, param.getName());
+            CharSequence contentType = param.getContentType();
+            updateDigest(md, contentType == null ? null : contentType.toString());
+            updateDigest(md, param.getValue());
+        }
+        Map<String, String> sortedHeaders = new TreeMap<>();
+        for (Map.Entry<String, String> header : headers.entrySet()) {
+            String name = header.getKey().toLowerCase(Locale.ROOT);
+            if (!DIGEST_EXCLUDED_HEADERS.contains(name)) {
+                sortedHeaders.put(name, header.getValue());
+            }
+        }
+        for (Map.Entry<String, String> header : sortedHeaders.entrySet()) {
+            updateDigest(md, header.getKey());
+            updateDigest(md, header.getValue());
+        }
+        return Hex.toHexString(md.digest());
+    }
+
+    private static void updateDigest(MessageDigest md, String value) {
+        updateDigest(md, value == null ? null : value.getBytes(StandardCharsets.UTF_8));
+    }
+
+    private static void updateDigest(MessageDigest md, byte[] value) {
+        // Length prefix, so that different splits of the same bytes differ.
+        md.update(ByteBuffer.allocate(4).putInt(value == null ? -1 : value.length).array());
+        if (value != null) {
+            md.update(value);
+        }
+    }
 }
@@ -0,0 +1,135 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import java.util.Arrays;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Tunes batch size and batch delay online to meet a latency SLO.
+ *
+ * <p>The policy keeps a moving average of the request inter-arrival time and of the backend
+ * service time for each batch size seen so far. It picks the largest batch that can be collected
+ * at the current arrival rate and served within the SLO, and waits no longer than the SLO leaves
+ * after serving it. Under light load this degrades to batches of one without any wait, under heavy
+ * load batches grow up to the configured batch size. If not even a single request can be served
+ * within the SLO, queued requests are batched up to the configured batch size without waiting, to
+ * maximize throughput.
+ */
+public class AdaptiveBatchPolicy implements BatchPolicy {
+
+    // Weight of the latest sample in the moving averages.
+    private static final double ALPHA = 0.2;
+
+    private int latencySlo;
+    private long lastArrival;
+    private double interArrival;
+    private double[] serviceTime;
+
+    public AdaptiveBatchPolicy(int latencySlo) {
+        this.latencySlo = latencySlo;
+        interArrival = latencySlo;
+        serviceTime = new double[0];
+    }
+
+    @Override
+    public String getName() {
+        return ADAPTIVE;
+    }
+
+    @Override
+    public Integer getLatencySlo() {
+        return latencySlo;
+    }
+
+    @Override
+    public synchronized int getBatchSize(Model model) {
+        return targetBatchSize(model.getBatchSize());
+    }
+
+    @Override
+    public synchronized long getMaxBatchDelay(Model model) {
+        int batchSize = targetBatchSize(model.getBatchSize());
+        double service = estimateServiceTime(batchSize);
+        if (batchSize <= 1 || service < 0 || service >= latencySlo) {
+            return 0;
+        }
+        return Math.min(model.getMaxBatchDelay(), (long) (latencySlo - service));
+    }
+
+    @Override
+    public synchronized void requestArrived(long timestamp) {
+        if (lastArrival != 0) {
+            // Gaps longer than the SLO all mean there is nothing to batch.
+            double gap =
+                    Math.min(
+                            latencySlo,
+                            (double) (timestamp - lastArrival) / TimeUnit.MILLISECONDS.toNanos(1));
+            interArrival += ALPHA * (gap - interArrival);
+        }
+        lastArrival = timestamp;
+    }
+
+    @Override
+    public synchronized void batchCompleted(int batchSize, long duration) {
+        if (batchSize <= 0) {
+            return;
+        }
+        if (batchSize > serviceTime.length) {
+            serviceTime = Arrays.copyOf(serviceTime, batchSize);
+        }
+        double average = serviceTime[batchSize - 1];
+        if (average == 0) {
+            serviceTime[batchSize - 1] = Math.max(duration, 1);
+        } else {
+            serviceTime[batchSize - 1] += ALPHA * (duration - average);
+        }
+    }
+
+    private int targetBatchSize(int maxBatchSize) {
+        if (estimateServiceTime(1) < 0) {
+            // Nothing measured yet, start with single requests.
+            return 1;
+        }
+        for (int batchSize = maxBatchSize; batchSize > 1; --batchSize) {
+            double wait = (batchSize - 1) * interArrival;
+            if (wait + estimateServiceTime(batchSize) <= latencySlo) {
+                return batchSize;
+            }
+        }
+        if (estimateServiceTime(1) > latencySlo) {
+            return maxBatchSize;
+        }
+        return 1;
+    }
+
+    /**
+     * Returns the average service time of a batch, or -1 if nothing was measured yet. Unmeasured
+     * batch sizes are extrapolated linearly from the closest smaller batch size, which
+     * overestimates batching cost until a larger batch was tried.
+     */
+    private double estimateServiceTime(int batchSize) {
+        int size = Math.min(batchSize, serviceTime.length);
+        for (int i = size; i > 0; --i) {
+            if (serviceTime[i - 1] > 0) {
+                return serviceTime[i - 1] * batchSize / i;
+            }
+        }
+        for (int i = size + 1; i <= serviceTime.length; ++i) {
+            if (serviceTime[i - 1] > 0) {
+                return serviceTime[i - 1];
+            }
+        }
+        return -1;
+    }
+}
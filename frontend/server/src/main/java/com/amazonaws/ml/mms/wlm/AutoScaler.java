@@ -0,0 +1,192 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import com.amazonaws.ml.mms.util.ConfigManager;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.TimeUnit;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+/**
+ * Scales the workers of each model between its min and max workers. A worker is added when
+ * requests queue up, batches run full or the p95 latency exceeds the latency target, and removed
+ * when the queue is empty and the remaining workers can take over the load. Workers are only added
+ * while the RSS of all workers stays below the memory limit.
+ */
+public class AutoScaler implements Runnable {
+
+    private static final Logger logger = LoggerFactory.getLogger(AutoScaler.class);
+
+    // Average batch size relative to the batch size above which batches count as full.
+    static final double FULL_BATCH_RATIO = 0.9;
+    // Utilization the remaining workers must stay below for a worker to be removed.
+    static final double SCALE_DOWN_UTILIZATION = 0.7;
+
+    private ModelManager modelManager;
+    private long upCooldown;
+    private long downCooldown;
+    private int latencyTarget;
+    private long memoryLimit;
+    private Map<String, Long> lastScaled;
+
+    /**
+     * Creates an autoscaler for the models of a model manager.
+     *
+     * @param upCooldown time in ms after a scaling event before workers are added
+     * @param downCooldown time in ms after a scaling event before workers are removed
+     * @param latencyTarget p95 latency target in ms for models without a latency SLO, 0 for none
+     * @param memoryLimit RSS limit in bytes for all workers, 0 for none
+     */
+    AutoScaler(
+            ModelManager modelManager,
+            long upCooldown,
+            long downCooldown,
+            int latencyTarget,
+            long memoryLimit) {
+        this.modelManager = modelManager;
+        this.upCooldown = upCooldown;
+        this.downCooldown = downCooldown;
+        this.latencyTarget = latencyTarget;
+        this.memoryLimit = memoryLimit;
+        lastScaled = new HashMap<>();
+    }
+
+    public static void scheduleAutoScaling(ConfigManager configManager) {
+        ModelManager modelManager = ModelManager.getInstance();
+        AutoScaler autoScaler =
+                new AutoScaler(
+                        modelManager,
+                        TimeUnit.SECONDS.toMillis(configManager.getAutoScaleUpCooldown()),
+                        TimeUnit.SECONDS.toMillis(configManager.getAutoScaleDownCooldown()),
+                        configManager.getAutoScaleLatencyTarget(),
+                        configManager.getAutoScaleMemoryLimit() * 1024L * 1024L);
+        int interval = configManager.getAutoScaleInterval();
+        modelManager
+                .getScheduler()
+                .scheduleAtFixedRate(autoScaler, interval, interval, TimeUnit.SECONDS);
+    }
+
+    @Override
+    public void run() {
+        // An exception would cancel all further runs of the scheduled task.
+        try {
+            Map<String, Model> models = modelManager.getModels();
+            lastScaled.keySet().retainAll(models.keySet());
+            long now = System.currentTimeMillis();
+            for (Model model : models.values()) {
+                scale(model, now);
+            }
+        } catch (RuntimeException e) {
+            logger.warn("Failed to autoscale workers.", e);
+        }
+    }
+
+    private void scale(Model model, long now) {
+        String modelName = model.getModelName();
+        ModelStats.Snapshot stats = model.getStats().snapshot();
+        List<WorkerThread> workers = modelManager.getWorkers(modelName);
+        if (workers.isEmpty() || model.getMaxWorkers() <= model.getMinWorkers()) {
+            return;
+        }
+
+        int current = workers.size();
+        int target = getTargetWorkers(model, current, stats);
+        if (target == current) {
+            return;
+        }
+        Long last = lastScaled.get(modelName);
+        long cooldown = target > current ? upCooldown : downCooldown;
+        if (last != null && now - last < cooldown) {
+            return;
+        }
+        if (target > current && !hasMemoryFor(workers, target - current)) {
+            logger.warn("Memory limit reached, cannot add workers for model {}.", modelName);
+            return;
+        }
+
+        logger.info(
+                "Scaling model {} from {} to {} workers, queue size: {}, p95 latency: {} ms.",
+                modelName,
+                current,
+                target,
+                model.getQueueSize(),
+                stats.getP95Latency());
+        if (modelManager.scaleWorkers(modelName, target)) {
+            lastScaled.put(modelName, now);
+        }
+    }
+
+    /** Returns the number of workers the model needs for the load of the last interval. */
+    int getTargetWorkers(Model model, int workers, ModelStats.Snapshot stats) {
+        int queueSize = model.getQueueSize();
+        int batchSize = Math.max(model.getBatchPolicy().getBatchSize(model), 1);
+        int target = getLatencyTarget(model);
+        boolean slow = target > 0 && stats.getP95Latency() > target;
+
+        if (workers < model.getMaxWorkers()) {
+            // Workers needed to take the whole queue in one batch each.
+            int backlog = (queueSize + batchSize - 1) / batchSize;
+            boolean fullBatches =
+                    batchSize > 1
+                            && queueSize > 0
+                            && stats.getAverageBatchSize() >= FULL_BATCH_RATIO * batchSize;
+            if (backlog > workers) {
+                return Math.min(backlog, model.getMaxWorkers());
+            }
+            if (fullBatches || slow) {
+                return workers + 1;
+            }
+        }
+
+        if (workers > Math.max(model.getMinWorkers(), 1)
+                && queueSize == 0
+                && !slow
+                && stats.getDuration() > 0) {
+            double utilization =
+                    (double) stats.getBusyTime() / (stats.getDuration() * (workers - 1));
+            if (utilization < SCALE_DOWN_UTILIZATION) {
+                return workers - 1;
+            }
+        }
+        return workers;
+    }
+
+    private int getLatencyTarget(Model model) {
+        Integer latencySlo = model.getBatchPolicy().getLatencySlo();
+        return latencySlo == null ? latencyTarget : latencySlo;
+    }
+
+    private boolean hasMemoryFor(List<WorkerThread> workers, int count) {
+        if (memoryLimit <= 0) {
+            return true;
+        }
+        long total = 0;
+        for (WorkerThread worker : modelManager.getWorkers().values()) {
+            total += worker.getMemory();
+        }
+        long modelMemory = 0;
+        int measured = 0;
+        for (WorkerThread worker : workers) {
+            if (worker.getMemory() > 0) {
+                modelMemory += worker.getMemory();
+                ++measured;
+            }
+        }
+        // A new worker is expected to use as much memory as the model's other workers.
+        long workerMemory = measured == 0 ? 0 : modelMemory / measured;
+        return total + workerMemory * count <= memoryLimit;
+    }
+}
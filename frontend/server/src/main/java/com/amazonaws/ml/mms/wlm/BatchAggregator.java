@@ -19,7 +19,10 @@ import com.amazonaws.ml.mms.util.messages.ModelWorkerResponse;
 import com.amazonaws.ml.mms.util.messages.Predictions;
 import com.amazonaws.ml.mms.util.messages.RequestInput;
 import io.netty.handler.codec.http.HttpResponseStatus;
+import java.util.ArrayList;
+import java.util.Collections;
 import java.util.LinkedHashMap;
+import java.util.List;
 import java.util.Map;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
@@ -33,7 +36,13 @@ public class BatchAggregator {
 
     public BatchAggregator(Model model) {
         this.model = model;
-        jobs = new LinkedHashMap<>();
+        // Synchronized, so that the scaler can check from its thread whether jobs are held.
+        jobs = Collections.synchronizedMap(new LinkedHashMap<>());
+    }
+
+    /** Returns whether jobs were taken from the queue and are not answered yet. */
+    public boolean hasJobs() {
+        return !jobs.isEmpty();
     }
 
     public BaseModelRequest getRequest(String threadName, WorkerState state)
@@ -42,8 +51,17 @@ public class BatchAggregator {
 
         ModelInferenceRequest req = new ModelInferenceRequest(model.getModelName());
 
-        model.pollBatch(
-                threadName, (state == WorkerState.WORKER_MODEL_LOADED) ? 0 : Long.MAX_VALUE, jobs);
+        try {
+            model.pollBatch(
+                    threadName,
+                    (state == WorkerState.WORKER_MODEL_LOADED) ? 0 : Long.MAX_VALUE,
+                    jobs);
+        } catch (InterruptedException e) {
+            // The worker was stopped, e.g. scaled down while waiting for max_batch_delay, the
+            // jobs taken so far go back to the queue for the other workers.
+            sendError(null, "Worker stopped.", HttpResponseStatus.SERVICE_UNAVAILABLE);
+            throw e;
+        }
 
         for (Job j : jobs.values()) {
             if (j.isControlCmd()) {
@@ -76,6 +94,8 @@ public class BatchAggregator {
                 return;
             }
 
+            long now = System.currentTimeMillis();
+            ResponseCache cache = model.getResponseCache();
             for (Predictions prediction : message.getPredictions()) {
                 String jobId = prediction.getRequestId();
                 Job job = jobs.remove(jobId);
@@ -88,6 +108,14 @@ public class BatchAggregator {
                         prediction.getStatusCode(),
                         prediction.getReasonPhrase(),
                         prediction.getHeaders());
+                model.getStats().requestCompleted(now - job.getBegin());
+                if (cache != null && prediction.getStatusCode() == 200) {
+                    cache.put(
+                            job,
+                            prediction.getResp(),
+                            prediction.getContentType(),
+                            prediction.getHeaders());
+                }
             }
         } else {
             for (String reqId : jobs.keySet()) {
@@ -126,10 +154,11 @@ public class BatchAggregator {
             }
         } else {
             // Send the error message to all the jobs
-            for (Map.Entry<String, Job> j : jobs.entrySet()) {
-                String jobsId = j.getValue().getJobId();
-                Job job = jobs.remove(jobsId);
-
+            List<Job> held = new ArrayList<>(jobs.values());
+            jobs.clear();
+            // In reverse, so that the jobs are requeued in their original order.
+            for (int i = held.size() - 1; i >= 0; --i) {
+                Job job = held.get(i);
                 if (job.isControlCmd()) {
                     job.sendError(status, error);
                 } else {
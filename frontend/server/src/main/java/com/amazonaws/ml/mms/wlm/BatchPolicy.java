@@ -0,0 +1,62 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+/**
+ * Decides how many inference requests {@link Model#pollBatch} aggregates into one batch and how
+ * long it waits for them. The model's batch size and max batch delay are upper bounds for every
+ * policy.
+ */
+public interface BatchPolicy {
+
+    String FIXED = "fixed";
+    String ADAPTIVE = "adaptive";
+
+    String getName();
+
+    /** Returns the latency SLO in ms the policy batches for, or null if it has none. */
+    Integer getLatencySlo();
+
+    int getBatchSize(Model model);
+
+    long getMaxBatchDelay(Model model);
+
+    /**
+     * Called when an inference request is queued.
+     *
+     * @param timestamp arrival time from {@link System#nanoTime()}
+     */
+    void requestArrived(long timestamp);
+
+    /**
+     * Called when the backend returned the response of a batch.
+     *
+     * @param batchSize number of requests in the batch
+     * @param duration backend service time of the batch in ms
+     */
+    void batchCompleted(int batchSize, long duration);
+
+    static BatchPolicy create(String name, int latencySlo) {
+        if (name == null || FIXED.equalsIgnoreCase(name)) {
+            return new FixedBatchPolicy();
+        }
+        if (ADAPTIVE.equalsIgnoreCase(name)) {
+            if (latencySlo <= 0) {
+                throw new IllegalArgumentException(
+                        "Parameter latency_slo is required for adaptive batching.");
+            }
+            return new AdaptiveBatchPolicy(latencySlo);
+        }
+        throw new IllegalArgumentException("Invalid batch policy: " + name);
+    }
+}
@@ -0,0 +1,43 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+/** Always aggregates up to the configured batch size, waiting up to the configured delay. */
+public class FixedBatchPolicy implements BatchPolicy {
+
+    @Override
+    public String getName() {
+        return FIXED;
+    }
+
+    @Override
+    public Integer getLatencySlo() {
+        return null;
+    }
+
+    @Override
+    public int getBatchSize(Model model) {
+        return model.getBatchSize();
+    }
+
+    @Override
+    public long getMaxBatchDelay(Model model) {
+        return model.getMaxBatchDelay();
+    }
+
+    @Override
+    public void requestArrived(long timestamp) {}
+
+    @Override
+    public void batchCompleted(int batchSize, long duration) {}
+}
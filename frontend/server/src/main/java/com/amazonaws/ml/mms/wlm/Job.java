@@ -22,6 +22,9 @@ import io.netty.handler.codec.http.FullHttpResponse;
 import io.netty.handler.codec.http.HttpHeaderNames;
 import io.netty.handler.codec.http.HttpResponseStatus;
 import io.netty.handler.codec.http.HttpVersion;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
 import java.util.Map;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
@@ -37,6 +40,14 @@ public class Job {
     private RequestInput input;
     private long begin;
     private long scheduled;
+    private String bucketKey;
+    private int priority;
+    private long deadline;
+    private String digest;
+    // Identical requests that get the response of this job, see Model#setCoalesceRequests.
+    private List<Job> coalescedJobs;
+    private boolean completed;
+    private Runnable completionListener;
 
     public Job(
             ChannelHandlerContext ctx, String modelName, WorkerCommands cmd, RequestInput input) {
@@ -69,6 +80,91 @@ public class Job {
         return input;
     }
 
+    /** Returns the digest of the request input, see {@link RequestInput#getDigest()}. */
+    public String getDigest() {
+        if (digest == null) {
+            digest = input.getDigest();
+        }
+        return digest;
+    }
+
+    /** Returns the arrival time of the job in ms. */
+    public long getBegin() {
+        return begin;
+    }
+
+    public String getBucketKey() {
+        return bucketKey;
+    }
+
+    public void setBucketKey(String bucketKey) {
+        this.bucketKey = bucketKey;
+    }
+
+    public int getPriority() {
+        return priority;
+    }
+
+    public void setPriority(int priority) {
+        this.priority = priority;
+    }
+
+    /** Returns the time in ms by which the job must be scheduled, or 0 if it has no deadline. */
+    public long getDeadline() {
+        return deadline;
+    }
+
+    /**
+     * Sets the deadline of the job relative to its arrival.
+     *
+     * @param timeout time in ms the client waits for the response, 0 or less for none
+     */
+    public void setTimeout(long timeout) {
+        deadline = timeout > 0 ? begin + timeout : 0;
+    }
+
+    public boolean isExpired(long now) {
+        return deadline > 0 && now > deadline;
+    }
+
+    /** Returns whether the job has to be scheduled out of arrival order. */
+    public boolean isPrioritized() {
+        return priority != 0 || deadline > 0;
+    }
+
+    /**
+     * Attaches an identical request to this job, unless the job has already been answered.
+     *
+     * @return whether the request gets the response of this job
+     */
+    public synchronized boolean attach(Job job) {
+        if (completed) {
+            return false;
+        }
+        if (coalescedJobs == null) {
+            coalescedJobs = new ArrayList<>();
+        }
+        coalescedJobs.add(job);
+        return true;
+    }
+
+    /** Sets a callback that runs once the job is answered, before its attached jobs. */
+    public void setCompletionListener(Runnable completionListener) {
+        this.completionListener = completionListener;
+    }
+
+    /** Marks the job as answered and returns the jobs attached to it. */
+    synchronized List<Job> complete() {
+        if (completed) {
+            return Collections.emptyList();
+        }
+        completed = true;
+        if (completionListener != null) {
+            completionListener.run();
+        }
+        return coalescedJobs == null ? Collections.emptyList() : coalescedJobs;
+    }
+
     public void setScheduled() {
         scheduled = System.currentTimeMillis();
     }
@@ -109,6 +205,10 @@ public class Job {
                 "Waiting time: {}, Backend time: {}",
                 scheduled - begin,
                 System.currentTimeMillis() - scheduled);
+
+        for (Job job : complete()) {
+            job.response(body, contentType, statusCode, statusPhrase, responseHeaders);
+        }
     }
 
     public void sendError(HttpResponseStatus status, String error) {
@@ -126,5 +226,9 @@ public class Job {
                 "Waiting time: {}, Inference time: {}",
                 scheduled - begin,
                 System.currentTimeMillis() - begin);
+
+        for (Job job : complete()) {
+            job.sendError(status, error);
+        }
     }
 }
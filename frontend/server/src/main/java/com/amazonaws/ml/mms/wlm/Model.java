@@ -14,7 +14,11 @@ package com.amazonaws.ml.mms.wlm;
 
 import com.amazonaws.ml.mms.archive.ModelArchive;
 import com.amazonaws.ml.mms.util.ConfigManager;
+import com.amazonaws.ml.mms.util.messages.InputParameter;
+import com.amazonaws.ml.mms.util.messages.RequestInput;
+import io.netty.handler.codec.http.HttpResponseStatus;
 import java.io.File;
+import java.util.Iterator;
 import java.util.Map;
 import java.util.Objects;
 import java.util.concurrent.ConcurrentHashMap;
@@ -29,13 +33,33 @@ import org.slf4j.LoggerFactory;
 public class Model {
 
     public static final String DEFAULT_DATA_QUEUE = "DATA_QUEUE";
+    // Request header that overrides the bucket computed from the payload length.
+    public static final String BUCKET_HEADER = "X-MMS-Bucket";
+    // Request headers for scheduling: higher priority first, then earliest deadline.
+    public static final String PRIORITY_HEADER = "X-MMS-Priority";
+    public static final String TIMEOUT_HEADER = "X-MMS-Timeout";
+    // How often a worker waiting for inference requests checks its control queue, in ms.
+    private static final long CONTROL_POLL_INTERVAL = 100;
     private static final Logger logger = LoggerFactory.getLogger(Model.class);
 
-    private ModelArchive modelArchive;
+    private volatile ModelArchive modelArchive;
     private int minWorkers;
     private int maxWorkers;
     private int batchSize;
     private int maxBatchDelay;
+    private volatile BatchPolicy batchPolicy;
+    // Payload length boundaries of the batching buckets, null if batches are not bucketed.
+    private volatile int[] bucketBoundaries;
+    private final Object arrivals = new Object();
+    private long arrivalCount;
+    // Number of queued jobs with a priority or deadline. While there are any, jobs are not
+    // taken in arrival order.
+    private AtomicInteger prioritizedJobs;
+    private ModelStats stats;
+    private volatile ResponseCache responseCache;
+    private volatile boolean coalesceRequests;
+    // Queued or running jobs by input digest, identical requests are attached to them.
+    private ConcurrentMap<String, Job> coalescingJobs;
     private String preloadModel;
     private AtomicInteger port; // Port on which the model server is running
     private ReentrantLock lock;
@@ -52,10 +76,14 @@ public class Model {
         this.preloadModel = preloadModel;
         batchSize = 1;
         maxBatchDelay = 100;
+        batchPolicy = new FixedBatchPolicy();
         jobsDb = new ConcurrentHashMap<>();
         // Always have a queue for data
         jobsDb.putIfAbsent(DEFAULT_DATA_QUEUE, new LinkedBlockingDeque<>(queueSize));
         failedInfReqs = new AtomicInteger(0);
+        prioritizedJobs = new AtomicInteger(0);
+        stats = new ModelStats();
+        coalescingJobs = new ConcurrentHashMap<>();
         port = new AtomicInteger(-1);
         lock = new ReentrantLock();
     }
@@ -76,6 +104,10 @@ public class Model {
         return modelArchive;
     }
 
+    public void setModelArchive(ModelArchive modelArchive) {
+        this.modelArchive = modelArchive;
+    }
+
     public int getMinWorkers() {
         return minWorkers;
     }
@@ -108,6 +140,53 @@ public class Model {
         this.maxBatchDelay = maxBatchDelay;
     }
 
+    public BatchPolicy getBatchPolicy() {
+        return batchPolicy;
+    }
+
+    public void setBatchPolicy(BatchPolicy batchPolicy) {
+        this.batchPolicy = batchPolicy;
+    }
+
+    public int[] getBucketBoundaries() {
+        return bucketBoundaries;
+    }
+
+    public void setBucketBoundaries(int[] bucketBoundaries) {
+        this.bucketBoundaries = bucketBoundaries;
+    }
+
+    public ResponseCache getResponseCache() {
+        return responseCache;
+    }
+
+    /** Sets the cache responses are served from before requests are queued, null for none. */
+    public void setResponseCache(ResponseCache responseCache) {
+        this.responseCache = responseCache;
+    }
+
+    public boolean isCoalesceRequests() {
+        return coalesceRequests;
+    }
+
+    /**
+     * Enables request coalescing: while a request is queued or running, identical requests are
+     * attached to it and get its response, without taking a batch slot. Requests with a priority
+     * or deadline are not coalesced.
+     */
+    public void setCoalesceRequests(boolean coalesceRequests) {
+        this.coalesceRequests = coalesceRequests;
+    }
+
+    public ModelStats getStats() {
+        return stats;
+    }
+
+    /** Returns the number of inference requests waiting for a worker. */
+    public int getQueueSize() {
+        return jobsDb.get(DEFAULT_DATA_QUEUE).size();
+    }
+
     public void addJob(String threadId, Job job) {
         LinkedBlockingDeque<Job> blockingDeque = jobsDb.get(threadId);
         if (blockingDeque == null) {
@@ -124,11 +203,110 @@ public class Model {
     }
 
     public boolean addJob(Job job) {
-        return jobsDb.get(DEFAULT_DATA_QUEUE).offer(job);
+        ResponseCache cache = responseCache;
+        if (cache != null && cache.respond(job)) {
+            return true;
+        }
+        if (coalesceRequests && !job.isPrioritized() && coalesce(job)) {
+            return true;
+        }
+        int[] boundaries = bucketBoundaries;
+        if (boundaries != null) {
+            job.setBucketKey(getBucketKey(job.getPayload(), boundaries));
+        }
+        if (jobsDb.get(DEFAULT_DATA_QUEUE).offer(job)) {
+            batchPolicy.requestArrived(System.nanoTime());
+            enqueued(job);
+            return true;
+        }
+        // Requests attached in the meantime share the fate of the rejected one.
+        for (Job coalesced : job.complete()) {
+            coalesced.sendError(
+                    HttpResponseStatus.SERVICE_UNAVAILABLE,
+                    "No worker is available to serve request: " + job.getModelName());
+        }
+        return false;
+    }
+
+    /**
+     * Attaches the job to an identical queued or running job, or registers it as the one that
+     * identical jobs attach to.
+     *
+     * @return whether the job was attached and must not be queued
+     */
+    private boolean coalesce(Job job) {
+        String digest = job.getDigest();
+        Job leader;
+        while ((leader = coalescingJobs.putIfAbsent(digest, job)) != null) {
+            if (leader.attach(job)) {
+                logger.trace("Request {} coalesced into {}.", job.getJobId(), leader.getJobId());
+                return true;
+            }
+            // The leader has just been answered.
+            coalescingJobs.remove(digest, leader);
+        }
+        job.setCompletionListener(() -> coalescingJobs.remove(digest, job));
+        return false;
+    }
+
+    /**
+     * Returns the bucket of a request: the {@value #BUCKET_HEADER} header if present, otherwise
+     * the smallest boundary not less than the payload length, or "overflow" beyond the largest.
+     */
+    static String getBucketKey(RequestInput input, int[] boundaries) {
+        for (Map.Entry<String, String> header : input.getHeaders().entrySet()) {
+            if (BUCKET_HEADER.equalsIgnoreCase(header.getKey())) {
+                return header.getValue();
+            }
+        }
+        long length = 0;
+        for (InputParameter param : input.getParameters()) {
+            if (param.getValue() != null) {
+                length += param.getValue().length;
+            }
+        }
+        for (int boundary : boundaries) {
+            if (length <= boundary) {
+                return String.valueOf(boundary);
+            }
+        }
+        return "overflow";
     }
 
     public void addFirst(Job job) {
         jobsDb.get(DEFAULT_DATA_QUEUE).addFirst(job);
+        enqueued(job);
+    }
+
+    private void enqueued(Job job) {
+        if (job.isPrioritized()) {
+            prioritizedJobs.incrementAndGet();
+        }
+        synchronized (arrivals) {
+            ++arrivalCount;
+            arrivals.notifyAll();
+        }
+    }
+
+    private void dequeued(Job job) {
+        if (job.isPrioritized()) {
+            prioritizedJobs.decrementAndGet();
+        }
+    }
+
+    private long getArrivalCount() {
+        synchronized (arrivals) {
+            return arrivalCount;
+        }
+    }
+
+    /** Waits up to timeout ms for a job to be queued, unless one was queued since count. */
+    private void awaitArrival(long count, long timeout) throws InterruptedException {
+        synchronized (arrivals) {
+            if (count == arrivalCount && timeout > 0) {
+                arrivals.wait(timeout);
+            }
+        }
     }
 
     public void pollBatch(String threadId, long waitTime, Map<String, Job> jobsRepo)
@@ -151,28 +329,32 @@ public class Model {
             }
         }
 
+        // Control commands, e.g. a model swap, are picked up while waiting for inference requests.
         try {
-            lock.lockInterruptibly();
-            long maxDelay = maxBatchDelay;
+            while (!lock.tryLock(CONTROL_POLL_INTERVAL, TimeUnit.MILLISECONDS)) {
+                if (pollControlJob(threadId, jobsRepo)) {
+                    return;
+                }
+            }
+            BatchPolicy policy = batchPolicy;
             jobsQueue = jobsDb.get(DEFAULT_DATA_QUEUE);
 
-            Job j = jobsQueue.poll(Long.MAX_VALUE, TimeUnit.MILLISECONDS);
-            logger.trace("get first job: {}", Objects.requireNonNull(j).getJobId());
+            Job j;
+            while ((j = pollJob(jobsQueue)) == null) {
+                if (pollControlJob(threadId, jobsRepo)) {
+                    return;
+                }
+            }
+            logger.trace("get first job: {}", j.getJobId());
 
             jobsRepo.put(j.getJobId(), j);
-            long begin = System.currentTimeMillis();
-            for (int i = 0; i < batchSize - 1; ++i) {
-                j = jobsQueue.poll(maxDelay, TimeUnit.MILLISECONDS);
-                if (j == null) {
-                    break;
-                }
-                long end = System.currentTimeMillis();
-                maxDelay -= end - begin;
-                begin = end;
-                jobsRepo.put(j.getJobId(), j);
-                if (maxDelay <= 0) {
-                    break;
-                }
+            int size = policy.getBatchSize(this);
+            long maxDelay = policy.getMaxBatchDelay(this);
+            boolean bucketed = bucketBoundaries != null;
+            if (bucketed || prioritizedJobs.get() > 0) {
+                fillBatch(jobsQueue, bucketed, j.getBucketKey(), size, maxDelay, jobsRepo);
+            } else {
+                fillBatchInOrder(jobsQueue, size, maxDelay, jobsRepo);
             }
             logger.trace("sending jobs, size: {}", jobsRepo.size());
         } finally {
@@ -182,6 +364,138 @@ public class Model {
         }
     }
 
+    /**
+     * Takes the first job of a batch, waiting up to {@link #CONTROL_POLL_INTERVAL} for one. Jobs
+     * are taken in arrival order unless any queued job has a priority or deadline.
+     */
+    private Job pollJob(LinkedBlockingDeque<Job> jobsQueue) throws InterruptedException {
+        if (prioritizedJobs.get() > 0) {
+            long count = getArrivalCount();
+            Job j = selectJob(jobsQueue, false, null);
+            if (j == null) {
+                awaitArrival(count, CONTROL_POLL_INTERVAL);
+            }
+            return j;
+        }
+        Job j = jobsQueue.poll(CONTROL_POLL_INTERVAL, TimeUnit.MILLISECONDS);
+        if (j != null) {
+            dequeued(j);
+            if (j.isExpired(System.currentTimeMillis())) {
+                expire(j);
+                return null;
+            }
+        }
+        return j;
+    }
+
+    /** Adds queued requests to the batch in arrival order, waiting up to maxDelay for more. */
+    private void fillBatchInOrder(
+            LinkedBlockingDeque<Job> jobsQueue, int size, long maxDelay, Map<String, Job> jobsRepo)
+            throws InterruptedException {
+        long begin = System.currentTimeMillis();
+        while (jobsRepo.size() < size) {
+            // Once the delay is used up, only take requests that are already queued.
+            Job j =
+                    maxDelay > 0
+                            ? jobsQueue.poll(maxDelay, TimeUnit.MILLISECONDS)
+                            : jobsQueue.poll();
+            if (j == null) {
+                break;
+            }
+            long end = System.currentTimeMillis();
+            maxDelay -= end - begin;
+            begin = end;
+            dequeued(j);
+            if (j.isExpired(end)) {
+                expire(j);
+            } else {
+                jobsRepo.put(j.getJobId(), j);
+            }
+        }
+    }
+
+    /**
+     * Adds the most urgent queued requests to the batch, waiting up to maxDelay for more to
+     * arrive. If bucketed, only requests of the given bucket are added and the others stay queued.
+     */
+    private void fillBatch(
+            LinkedBlockingDeque<Job> jobsQueue,
+            boolean bucketed,
+            String bucket,
+            int size,
+            long maxDelay,
+            Map<String, Job> jobsRepo)
+            throws InterruptedException {
+        long deadline = System.currentTimeMillis() + maxDelay;
+        while (true) {
+            long count = getArrivalCount();
+            Job j;
+            while (jobsRepo.size() < size && (j = selectJob(jobsQueue, bucketed, bucket)) != null) {
+                jobsRepo.put(j.getJobId(), j);
+            }
+            long remaining = deadline - System.currentTimeMillis();
+            if (jobsRepo.size() >= size || remaining <= 0) {
+                return;
+            }
+            awaitArrival(count, remaining);
+        }
+    }
+
+    /**
+     * Removes and returns the most urgent queued job: highest priority first, then earliest
+     * deadline, then arrival order. Jobs whose deadline has passed are rejected on the way.
+     */
+    private Job selectJob(LinkedBlockingDeque<Job> jobsQueue, boolean bucketed, String bucket) {
+        long now = System.currentTimeMillis();
+        Job best = null;
+        Iterator<Job> it = jobsQueue.iterator();
+        while (it.hasNext()) {
+            Job j = it.next();
+            if (j.isExpired(now)) {
+                it.remove();
+                dequeued(j);
+                expire(j);
+            } else if ((!bucketed || Objects.equals(bucket, j.getBucketKey()))
+                    && (best == null || isMoreUrgent(j, best))) {
+                best = j;
+            }
+        }
+        if (best == null || !jobsQueue.removeFirstOccurrence(best)) {
+            return null;
+        }
+        dequeued(best);
+        return best;
+    }
+
+    private static boolean isMoreUrgent(Job job, Job other) {
+        if (job.getPriority() != other.getPriority()) {
+            return job.getPriority() > other.getPriority();
+        }
+        long deadline = job.getDeadline() > 0 ? job.getDeadline() : Long.MAX_VALUE;
+        long otherDeadline = other.getDeadline() > 0 ? other.getDeadline() : Long.MAX_VALUE;
+        return deadline < otherDeadline;
+    }
+
+    private void expire(Job job) {
+        logger.debug("Request {} expired before it was scheduled.", job.getJobId());
+        job.sendError(
+                HttpResponseStatus.SERVICE_UNAVAILABLE,
+                "Request deadline exceeded before it was scheduled.");
+    }
+
+    private boolean pollControlJob(String threadId, Map<String, Job> jobsRepo) {
+        LinkedBlockingDeque<Job> controlQueue = jobsDb.get(threadId);
+        if (controlQueue == null) {
+            return false;
+        }
+        Job j = controlQueue.poll();
+        if (j == null) {
+            return false;
+        }
+        jobsRepo.put(j.getJobId(), j);
+        return true;
+    }
+
     public int getPort() {
         return port.get();
     }
@@ -16,6 +16,7 @@ import com.amazonaws.ml.mms.archive.Manifest;
 import com.amazonaws.ml.mms.archive.ModelArchive;
 import com.amazonaws.ml.mms.archive.ModelException;
 import com.amazonaws.ml.mms.archive.ModelNotFoundException;
+import com.amazonaws.ml.mms.http.BadRequestException;
 import com.amazonaws.ml.mms.http.ConflictStatusException;
 import com.amazonaws.ml.mms.http.StatusResponse;
 import com.amazonaws.ml.mms.util.ConfigManager;
@@ -23,10 +24,11 @@ import com.amazonaws.ml.mms.util.NettyUtils;
 import io.netty.channel.ChannelHandlerContext;
 import io.netty.handler.codec.http.HttpResponseStatus;
 import java.io.IOException;
-import java.util.HashSet;
+import java.util.Arrays;
 import java.util.List;
 import java.util.Map;
 import java.util.Set;
+import java.util.TreeMap;
 import java.util.concurrent.CompletableFuture;
 import java.util.concurrent.ConcurrentHashMap;
 import java.util.concurrent.ExecutionException;
@@ -45,7 +47,8 @@ public final class ModelManager {
     private ConfigManager configManager;
     private WorkLoadManager wlm;
     private ConcurrentHashMap<String, Model> models;
-    private HashSet<String> startupModels;
+    private Set<String> startupModels;
+    private Set<String> swappingModels;
     private ScheduledExecutorService scheduler;
 
     private ModelManager(ConfigManager configManager, WorkLoadManager wlm) {
@@ -53,7 +56,8 @@ public final class ModelManager {
         this.wlm = wlm;
         models = new ConcurrentHashMap<>();
         scheduler = Executors.newScheduledThreadPool(2);
-        this.startupModels = new HashSet<>();
+        this.startupModels = ConcurrentHashMap.newKeySet();
+        this.swappingModels = ConcurrentHashMap.newKeySet();
     }
 
     public ScheduledExecutorService getScheduler() {
@@ -96,7 +100,11 @@ public final class ModelManager {
             throws ModelException, IOException, InterruptedException, ExecutionException,
                     TimeoutException {
 
-        ModelArchive archive = ModelArchive.downloadModel(configManager.getModelStore(), url);
+        ModelArchive archive =
+                ModelArchive.downloadModel(
+                        configManager.getModelStore(),
+                        url,
+                        configManager.getModelDownloadConnections());
         if (modelName == null || modelName.isEmpty()) {
             if (archive.getModelName() == null || archive.getModelName().isEmpty()) {
                 archive.getManifest().getModel().setModelName(defaultModelName);
@@ -171,6 +179,80 @@ public final class ModelManager {
         return httpResponseStatus;
     }
 
+    public CompletableFuture<HttpResponseStatus> swapModel(String modelName, String url)
+            throws ModelException, IOException {
+        Model model = models.get(modelName);
+        if (model == null) {
+            throw new ModelNotFoundException("Model not found: " + modelName);
+        }
+        // Workers of a preloaded model fork from its server thread, which keeps the version it
+        // preloaded, so workers started after a swap would serve the previous version.
+        if (Boolean.parseBoolean(model.preloadModel())) {
+            throw new BadRequestException(
+                    "Model "
+                            + modelName
+                            + " is preloaded, unregister and register it to update it.");
+        }
+        if (!swappingModels.add(modelName)) {
+            throw new ConflictStatusException("Model " + modelName + " is already being updated.");
+        }
+
+        ModelArchive current = model.getModelArchive();
+        ModelArchive archive;
+        try {
+            archive =
+                    ModelArchive.downloadModel(
+                            configManager.getModelStore(),
+                            url,
+                            configManager.getModelDownloadConnections());
+            if (archive.getModelDir().equals(current.getModelDir())) {
+                swappingModels.remove(modelName);
+                return CompletableFuture.completedFuture(HttpResponseStatus.OK);
+            }
+
+            // The new version is served under the registered name, by the running backend.
+            Manifest.Model manifestModel = archive.getManifest().getModel();
+            if (manifestModel != null) {
+                manifestModel.setModelName(modelName);
+                if (manifestModel.getHandler() == null || manifestModel.getHandler().isEmpty()) {
+                    manifestModel.setHandler(current.getHandler());
+                }
+            }
+            archive.validate();
+            if (archive.getManifest().getRuntime() != current.getManifest().getRuntime()) {
+                archive.clean();
+                throw new BadRequestException(
+                        "Runtime of " + url + " does not match the registered model.");
+            }
+        } catch (ModelException | IOException | RuntimeException e) {
+            swappingModels.remove(modelName);
+            throw e;
+        }
+
+        logger.info("Swapping model {} to {}.", modelName, url);
+        model.setModelArchive(archive);
+        return wlm.swapModel(model)
+                .thenCompose(
+                        status -> {
+                            if (HttpResponseStatus.OK.equals(status)) {
+                                current.clean();
+                                logger.info("Model {} swapped to {}.", modelName, url);
+                                return CompletableFuture.completedFuture(status);
+                            }
+                            logger.warn("Failed to swap model {}, rolling back.", modelName);
+                            model.setModelArchive(current);
+                            return wlm.swapModel(model)
+                                    .thenApply(
+                                            s -> {
+                                                if (HttpResponseStatus.OK.equals(s)) {
+                                                    archive.clean();
+                                                }
+                                                return status;
+                                            });
+                        })
+                .whenComplete((status, t) -> swappingModels.remove(modelName));
+    }
+
     public void startBackendServer(Model model)
             throws InterruptedException, ExecutionException, TimeoutException {
         CompletableFuture<HttpResponseStatus> future = new CompletableFuture<>();
@@ -192,6 +274,61 @@ public final class ModelManager {
         return wlm.modelChanged(model);
     }
 
+    public boolean scaleWorkers(String modelName, int workers) {
+        Model model = models.get(modelName);
+        if (model == null) {
+            return false;
+        }
+        return wlm.scaleWorkers(model, workers);
+    }
+
+    public void setBatchPolicy(String modelName, BatchPolicy batchPolicy)
+            throws ModelNotFoundException {
+        Model model = models.get(modelName);
+        if (model == null) {
+            throw new ModelNotFoundException("Model not found: " + modelName);
+        }
+        model.setBatchPolicy(batchPolicy);
+        logger.info("Model {} uses {} batch policy.", modelName, batchPolicy.getName());
+    }
+
+    public void setBucketBoundaries(String modelName, int[] bucketBoundaries)
+            throws ModelNotFoundException {
+        Model model = models.get(modelName);
+        if (model == null) {
+            throw new ModelNotFoundException("Model not found: " + modelName);
+        }
+        model.setBucketBoundaries(bucketBoundaries);
+        logger.info(
+                "Model {} batch buckets: {}.", modelName, Arrays.toString(bucketBoundaries));
+    }
+
+    public void setResponseCache(String modelName, ResponseCache responseCache)
+            throws ModelNotFoundException {
+        Model model = models.get(modelName);
+        if (model == null) {
+            throw new ModelNotFoundException("Model not found: " + modelName);
+        }
+        model.setResponseCache(responseCache);
+        if (responseCache != null) {
+            logger.info(
+                    "Model {} caches responses for {} ms, up to {} bytes.",
+                    modelName,
+                    responseCache.getTtl(),
+                    responseCache.getCapacity());
+        }
+    }
+
+    public void setCoalesceRequests(String modelName, boolean coalesceRequests)
+            throws ModelNotFoundException {
+        Model model = models.get(modelName);
+        if (model == null) {
+            throw new ModelNotFoundException("Model not found: " + modelName);
+        }
+        model.setCoalesceRequests(coalesceRequests);
+        logger.info("Model {} request coalescing: {}.", modelName, coalesceRequests);
+    }
+
     public Map<String, Model> getModels() {
         return models;
     }
@@ -224,9 +361,15 @@ public final class ModelManager {
                     String response = "Healthy";
                     int numWorking = 0;
                     int numScaled = 0;
+                    Map<String, String> modelStatus = new TreeMap<>();
                     for (Map.Entry<String, Model> m : models.entrySet()) {
-                        numScaled += m.getValue().getMinWorkers();
-                        numWorking += wlm.getNumRunningWorkers(m.getValue().getModelName());
+                        String modelName = m.getValue().getModelName();
+                        int minWorkers = m.getValue().getMinWorkers();
+                        numScaled += minWorkers;
+                        numWorking += wlm.getNumRunningWorkers(modelName);
+                        modelStatus.put(
+                                modelName,
+                                getReadiness(wlm.getNumLoadedWorkers(modelName), minWorkers));
                     }
 
                     if ((numWorking > 0) && (numWorking < numScaled)) {
@@ -237,12 +380,22 @@ public final class ModelManager {
 
                     // TODO: Check if its OK to send other 2xx errors to ALB for "Partial Healthy"
                     // and "Unhealthy"
-                    NettyUtils.sendJsonResponse(
-                            ctx, new StatusResponse(response), HttpResponseStatus.OK);
+                    StatusResponse status = new StatusResponse(response);
+                    status.setModels(modelStatus);
+                    NettyUtils.sendJsonResponse(ctx, status, HttpResponseStatus.OK);
                 };
         wlm.scheduleAsync(r);
     }
 
+    private static String getReadiness(int numLoaded, int minWorkers) {
+        if (numLoaded > 0 && numLoaded >= minWorkers) {
+            return "Healthy";
+        } else if (numLoaded > 0) {
+            return "Partial Healthy";
+        }
+        return "Unhealthy";
+    }
+
     public boolean scaleRequestStatus(String modelName) {
         Model model = ModelManager.getInstance().getModels().get(modelName);
         int numWorkers = wlm.getNumRunningWorkers(modelName);
@@ -0,0 +1,122 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import java.util.Arrays;
+
+/**
+ * Inference statistics of a model over an interval: request latencies, batch sizes and the time
+ * workers spent on batches. {@link AutoScaler} takes a snapshot per run, which starts the next
+ * interval.
+ */
+public class ModelStats {
+
+    // Latency samples kept per interval, later samples overwrite the oldest ones.
+    private static final int MAX_SAMPLES = 4096;
+
+    private long[] latencies;
+    private int requests;
+    private int batches;
+    private long batchedRequests;
+    private long busyTime;
+    private long start;
+
+    public ModelStats() {
+        latencies = new long[MAX_SAMPLES];
+        start = System.currentTimeMillis();
+    }
+
+    /**
+     * Records a request that got its response.
+     *
+     * @param latency time in ms from arrival to response
+     */
+    public synchronized void requestCompleted(long latency) {
+        latencies[requests % MAX_SAMPLES] = latency;
+        ++requests;
+    }
+
+    /**
+     * Records a batch served by a worker.
+     *
+     * @param size number of requests in the batch
+     * @param duration time in ms the worker took for the batch
+     */
+    public synchronized void batchCompleted(int size, long duration) {
+        ++batches;
+        batchedRequests += size;
+        busyTime += duration;
+    }
+
+    /** Returns the statistics of the current interval and starts a new one. */
+    public synchronized Snapshot snapshot() {
+        long now = System.currentTimeMillis();
+        int samples = Math.min(requests, MAX_SAMPLES);
+        long[] sorted = Arrays.copyOf(latencies, samples);
+        Arrays.sort(sorted);
+        long p95 = samples == 0 ? 0 : sorted[(int) Math.ceil(samples * 0.95) - 1];
+        double averageBatchSize = batches == 0 ? 0 : (double) batchedRequests / batches;
+        Snapshot snapshot = new Snapshot(now - start, requests, p95, averageBatchSize, busyTime);
+
+        requests = 0;
+        batches = 0;
+        batchedRequests = 0;
+        busyTime = 0;
+        start = now;
+        return snapshot;
+    }
+
+    public static final class Snapshot {
+
+        private long duration;
+        private int requests;
+        private long p95Latency;
+        private double averageBatchSize;
+        private long busyTime;
+
+        Snapshot(
+                long duration,
+                int requests,
+                long p95Latency,
+                double averageBatchSize,
+                long busyTime) {
+            this.duration = duration;
+            this.requests = requests;
+            this.p95Latency = p95Latency;
+            this.averageBatchSize = averageBatchSize;
+            this.busyTime = busyTime;
+        }
+
+        /** Returns the length of the interval in ms. */
+        public long getDuration() {
+            return duration;
+        }
+
+        public int getRequests() {
+            return requests;
+        }
+
+        public long getP95Latency() {
+            return p95Latency;
+        }
+
+        public double getAverageBatchSize() {
+            return averageBatchSize;
+        }
+
+        /** Returns the total time in ms all workers of the model spent on batches. */
+        public long getBusyTime() {
+            return busyTime;
+        }
+    }
+}
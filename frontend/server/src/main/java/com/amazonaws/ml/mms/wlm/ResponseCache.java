@@ -0,0 +1,166 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import com.amazonaws.ml.mms.metrics.Dimension;
+import com.amazonaws.ml.mms.metrics.Metric;
+import com.amazonaws.ml.mms.util.ConfigManager;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.concurrent.atomic.AtomicLong;
+
+/**
+ * Caches the inference responses of a deterministic model by input digest. Entries expire after a
+ * time to live, and the least recently used entries are evicted when the cached responses exceed
+ * the capacity in bytes.
+ */
+public class ResponseCache {
+
+    private static final org.apache.log4j.Logger loggerMmsMetrics =
+            org.apache.log4j.Logger.getLogger(ConfigManager.MODEL_SERVER_METRICS_LOGGER);
+
+    private long ttl;
+    private long capacity;
+    private long size;
+    private LinkedHashMap<String, Entry> entries;
+    private AtomicLong hits;
+    private AtomicLong misses;
+    private Metric hitMetric;
+    private Metric missMetric;
+
+    /**
+     * Creates a response cache for a model.
+     *
+     * @param ttl time in ms a response is served from the cache
+     * @param capacity maximum size in bytes of the cached responses
+     */
+    public ResponseCache(String modelName, long ttl, long capacity) {
+        this.ttl = ttl;
+        this.capacity = capacity;
+        entries = new LinkedHashMap<>(16, 0.75f, true);
+        hits = new AtomicLong();
+        misses = new AtomicLong();
+        String hostName = ConfigManager.getInstance().getHostName();
+        Dimension dimension = new Dimension("ModelName", modelName);
+        hitMetric = new Metric("CacheHit", "1", "Count", hostName, dimension);
+        missMetric = new Metric("CacheMiss", "1", "Count", hostName, dimension);
+    }
+
+    public long getTtl() {
+        return ttl;
+    }
+
+    public long getCapacity() {
+        return capacity;
+    }
+
+    public long getHits() {
+        return hits.get();
+    }
+
+    public long getMisses() {
+        return misses.get();
+    }
+
+    /**
+     * Sends the cached response for the input of the job, if there is one.
+     *
+     * @return whether the job has been answered from the cache
+     */
+    public boolean respond(Job job) {
+        Entry entry = get(job.getDigest(), System.currentTimeMillis());
+        if (entry == null) {
+            misses.incrementAndGet();
+            loggerMmsMetrics.info(missMetric);
+            return false;
+        }
+        hits.incrementAndGet();
+        loggerMmsMetrics.info(hitMetric);
+        job.response(entry.body, entry.contentType, 200, null, entry.headers);
+        return true;
+    }
+
+    /** Caches a successful response for the input of the job. */
+    public void put(Job job, byte[] body, String contentType, Map<String, String> headers) {
+        put(job.getDigest(), new Entry(body, contentType, headers), System.currentTimeMillis());
+    }
+
+    /** Drops all cached responses, when the model is swapped to another version. */
+    public synchronized void clear() {
+        entries.clear();
+        size = 0;
+    }
+
+    synchronized Entry get(String digest, long now) {
+        Entry entry = entries.get(digest);
+        if (entry == null) {
+            return null;
+        }
+        if (entry.expires < now) {
+            remove(digest);
+            return null;
+        }
+        return entry;
+    }
+
+    synchronized void put(String digest, Entry entry, long now) {
+        if (entry.size > capacity) {
+            return;
+        }
+        remove(digest);
+        entry.expires = now + ttl;
+        entries.put(digest, entry);
+        size += entry.size;
+        Iterator<Entry> it = entries.values().iterator();
+        while (size > capacity) {
+            size -= it.next().size;
+            it.remove();
+        }
+    }
+
+    synchronized long size() {
+        return size;
+    }
+
+    private void remove(String digest) {
+        Entry entry = entries.remove(digest);
+        if (entry != null) {
+            size -= entry.size;
+        }
+    }
+
+    static final class Entry {
+
+        byte[] body;
+        String contentType;
+        Map<String, String> headers;
+        long size;
+        long expires;
+
+        Entry(byte[] body, String contentType, Map<String, String> headers) {
+            this.body = body;
+            this.contentType = contentType;
+            this.headers = headers;
+            size = body.length;
+            if (contentType != null) {
+                size += contentType.length();
+            }
+            if (headers != null) {
+                for (Map.Entry<String, String> header : headers.entrySet()) {
+                    size += header.getKey().length() + header.getValue().length();
+                }
+            }
+        }
+    }
+}
@@ -104,6 +104,21 @@ public class WorkLoadManager {
         return numWorking;
     }
 
+    public int getNumLoadedWorkers(String modelName) {
+        int numLoaded = 0;
+        List<WorkerThread> threads = workers.getOrDefault(modelName, null);
+
+        if (threads != null) {
+            for (WorkerThread thread : threads) {
+                if (thread.getState() == WorkerState.WORKER_MODEL_LOADED) {
+                    numLoaded += 1;
+                }
+            }
+        }
+
+        return numLoaded;
+    }
+
     public CompletableFuture<HttpResponseStatus> modelChanged(Model model) {
         synchronized (model.getModelName()) {
             CompletableFuture<HttpResponseStatus> future = new CompletableFuture<>();
@@ -140,6 +155,82 @@ public class WorkLoadManager {
         }
     }
 
+    /**
+     * Adds or removes workers of a model towards count, within its min and max workers. Only idle
+     * workers are removed, so requests in flight are not failed.
+     *
+     * @return whether workers were added or removed
+     */
+    public boolean scaleWorkers(Model model, int count) {
+        synchronized (model.getModelName()) {
+            List<WorkerThread> threads = workers.get(model.getModelName());
+            if (threads == null || threads.isEmpty()) {
+                return false;
+            }
+            int minWorker = Math.max(model.getMinWorkers(), 1);
+            int target = Math.max(minWorker, Math.min(count, model.getMaxWorkers()));
+            int currentWorkers = threads.size();
+            if (currentWorkers < target) {
+                addThreads(threads, model, target - currentWorkers, new CompletableFuture<>());
+                return true;
+            }
+            boolean scaled = false;
+            for (int i = currentWorkers - 1; i >= 0 && threads.size() > target; --i) {
+                WorkerThread thread = threads.get(i);
+                if (!thread.isBusy()) {
+                    threads.remove(i);
+                    thread.shutdown();
+                    scaled = true;
+                }
+            }
+            return scaled;
+        }
+    }
+
+    public CompletableFuture<HttpResponseStatus> swapModel(Model model) {
+        CompletableFuture<HttpResponseStatus> future = new CompletableFuture<>();
+        threadPool.execute(
+                () -> {
+                    try {
+                        // Second pass catches workers that were starting when the swap began.
+                        if (swapWorkers(model) && swapWorkers(model)) {
+                            future.complete(HttpResponseStatus.OK);
+                        } else {
+                            future.complete(HttpResponseStatus.INTERNAL_SERVER_ERROR);
+                        }
+                    } catch (InterruptedException | ExecutionException e) {
+                        logger.warn("Model swap interrupted: {}", model.getModelName(), e);
+                        future.complete(HttpResponseStatus.INTERNAL_SERVER_ERROR);
+                    } catch (TimeoutException e) {
+                        logger.warn("Model swap timed out: {}", model.getModelName());
+                        future.complete(HttpResponseStatus.REQUEST_TIMEOUT);
+                    } finally {
+                        // Responses of the previous version must not be served after a swap.
+                        ResponseCache cache = model.getResponseCache();
+                        if (cache != null) {
+                            cache.clear();
+                        }
+                    }
+                });
+        return future;
+    }
+
+    private boolean swapWorkers(Model model)
+            throws InterruptedException, ExecutionException, TimeoutException {
+        String modelPath = model.getModelDir().getAbsolutePath();
+        // One worker at a time, so the others keep serving requests while it loads.
+        for (WorkerThread thread : getWorkers(model.getModelName())) {
+            if (thread.getState() != WorkerState.WORKER_MODEL_LOADED
+                    || modelPath.equals(thread.getModelPath())) {
+                continue;
+            }
+            if (!thread.swapModel().get(model.getResponseTimeout(), TimeUnit.SECONDS)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
     private CompletableFuture<HttpResponseStatus> shutdownServerThread(
             Model model, CompletableFuture<HttpResponseStatus> future) {
         model.getServerThread().shutdown();
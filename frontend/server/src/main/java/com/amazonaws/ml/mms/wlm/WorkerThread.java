@@ -21,6 +21,8 @@ import com.amazonaws.ml.mms.util.codec.ModelRequestEncoder;
 import com.amazonaws.ml.mms.util.codec.ModelResponseDecoder;
 import com.amazonaws.ml.mms.util.messages.BaseModelRequest;
 import com.amazonaws.ml.mms.util.messages.InputParameter;
+import com.amazonaws.ml.mms.util.messages.ModelInferenceRequest;
+import com.amazonaws.ml.mms.util.messages.ModelLoadModelRequest;
 import com.amazonaws.ml.mms.util.messages.ModelWorkerResponse;
 import com.amazonaws.ml.mms.util.messages.RequestInput;
 import com.amazonaws.ml.mms.util.messages.WorkerCommands;
@@ -41,6 +43,7 @@ import java.net.SocketAddress;
 import java.nio.channels.Channels;
 import java.util.UUID;
 import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.CompletableFuture;
 import java.util.concurrent.CountDownLatch;
 import java.util.concurrent.TimeUnit;
 import java.util.concurrent.atomic.AtomicBoolean;
@@ -80,9 +83,11 @@ public class WorkerThread implements Runnable {
     private long memory;
     private long startTime;
     private AtomicReference<Thread> currentThread = new AtomicReference<>();
+    private AtomicReference<CompletableFuture<Boolean>> pendingSwap = new AtomicReference<>();
+    private volatile String modelPath;
     private String workerId;
     private String threadName;
-    private BaseModelRequest req;
+    private volatile BaseModelRequest req;
     private WorkerState state;
 
     private WorkerLifeCycle lifeCycle;
@@ -141,11 +146,14 @@ public class WorkerThread implements Runnable {
             throws WorkerInitializationException, InterruptedException, FileNotFoundException {
         int responseTimeout = model.getResponseTimeout();
         while (isRunning()) {
-            req = aggregator.getRequest(backendChannel.id().asLongText(), state);
-            backendChannel.writeAndFlush(req).sync();
+            BaseModelRequest request =
+                    aggregator.getRequest(backendChannel.id().asLongText(), state);
+            // Only set once sent, jobs of a request that was not sent are requeued on exit.
+            backendChannel.writeAndFlush(request).sync();
+            req = request;
             long begin = System.currentTimeMillis();
             // TODO: Change this to configurable param
-            ModelWorkerResponse reply = replies.poll(responseTimeout, TimeUnit.MINUTES);
+            ModelWorkerResponse reply = replies.poll(responseTimeout, TimeUnit.SECONDS);
             long duration = System.currentTimeMillis() - begin;
             logger.info("Backend response time: {}", duration);
 
@@ -160,8 +168,26 @@ public class WorkerThread implements Runnable {
             switch (req.getCommand()) {
                 case PREDICT:
                     model.resetFailedInfReqs();
+                    if (reply.getCode() == 200) {
+                        int batchSize = ((ModelInferenceRequest) req).getRequestBatch().size();
+                        model.getBatchPolicy().batchCompleted(batchSize, duration);
+                        model.getStats().batchCompleted(batchSize, duration);
+                    }
                     break;
                 case LOAD:
+                    CompletableFuture<Boolean> swap = pendingSwap.getAndSet(null);
+                    if (swap != null) {
+                        if (reply.getCode() == 200) {
+                            modelPath = ((ModelLoadModelRequest) req).getModelPath();
+                        } else {
+                            logger.warn(
+                                    "{} failed to swap model: {}",
+                                    getWorkerName(),
+                                    reply.getMessage());
+                        }
+                        swap.complete(reply.getCode() == 200);
+                        break;
+                    }
                     String message = reply.getMessage();
                     String tmpdir = System.getProperty("java.io.tmpdir");
                     out =
@@ -173,6 +199,7 @@ public class WorkerThread implements Runnable {
                                     tmpdir + '/' + backendChannel.id().asLongText() + "-stderr",
                                     "rw");
                     if (reply.getCode() == 200) {
+                        modelPath = ((ModelLoadModelRequest) req).getModelPath();
                         setState(WorkerState.WORKER_MODEL_LOADED, HttpResponseStatus.OK);
                         lifeCycle.setPid(
                                 Integer.parseInt(
@@ -245,9 +272,12 @@ public class WorkerThread implements Runnable {
                 status = HttpResponseStatus.INSUFFICIENT_STORAGE;
             }
 
-            if (!serverThread && req != null) {
-                aggregator.sendError(req, "Worker died.", status);
-            } else if (serverThread) {
+            if (!serverThread) {
+                if (req != null) {
+                    aggregator.sendError(req, "Worker died.", status);
+                }
+                aggregator.sendError(null, "Worker stopped.", status);
+            } else {
                 model.setPort(-1);
                 if (process != null && process.isAlive()) {
                     process.destroyForcibly();
@@ -259,6 +289,10 @@ public class WorkerThread implements Runnable {
                     }
                 }
             }
+            CompletableFuture<Boolean> swap = pendingSwap.getAndSet(null);
+            if (swap != null) {
+                swap.complete(false);
+            }
             setState(WorkerState.WORKER_STOPPED, status);
             lifeCycle.exit();
             retry();
@@ -328,21 +362,9 @@ public class WorkerThread implements Runnable {
                                     future -> {
                                         // TODO:
                                         // use gpu, batch size in load model command
-                                        RequestInput input =
-                                                new RequestInput(UUID.randomUUID().toString());
-                                        if (gpuId >= 0) {
-                                            input.addParameter(
-                                                    new InputParameter(
-                                                            "gpu", String.valueOf(gpuId)));
-                                        }
-
-                                        Job job =
-                                                new Job(
-                                                        null,
-                                                        modelName,
-                                                        WorkerCommands.LOAD,
-                                                        input);
-                                        model.addJob(backendChannel.id().asLongText(), job);
+                                        model.addJob(
+                                                backendChannel.id().asLongText(),
+                                                newLoadJob(modelName));
                                         latch.countDown();
                                     });
 
@@ -361,6 +383,39 @@ public class WorkerThread implements Runnable {
         }
     }
 
+    private Job newLoadJob(String modelName) {
+        RequestInput input = new RequestInput(UUID.randomUUID().toString());
+        if (gpuId >= 0) {
+            input.addParameter(new InputParameter("gpu", String.valueOf(gpuId)));
+        }
+        return new Job(null, modelName, WorkerCommands.LOAD, input);
+    }
+
+    /**
+     * Asks the backend worker to load the model archive currently set on the {@link Model} and to
+     * switch to it once loaded. The worker keeps serving the previous version until the new one is
+     * ready, and keeps it if the new version fails to load.
+     *
+     * @return future completed with true once the worker serves the new version
+     */
+    public CompletableFuture<Boolean> swapModel() {
+        CompletableFuture<Boolean> future = new CompletableFuture<>();
+        if (state != WorkerState.WORKER_MODEL_LOADED || !pendingSwap.compareAndSet(null, future)) {
+            future.complete(false);
+            return future;
+        }
+        model.addJob(backendChannel.id().asLongText(), newLoadJob(model.getModelName()));
+        return future;
+    }
+
+    /**
+     * Returns whether the worker holds jobs, from the moment they are taken from the queue, e.g.
+     * while it waits for max_batch_delay, until they are answered.
+     */
+    public boolean isBusy() {
+        return req instanceof ModelInferenceRequest || aggregator.hasJobs();
+    }
+
     public boolean isRunning() {
         return running.get();
     }
@@ -369,6 +424,10 @@ public class WorkerThread implements Runnable {
         return gpuId;
     }
 
+    public String getModelPath() {
+        return modelPath;
+    }
+
     public long getStartTime() {
         return startTime;
     }
@@ -400,11 +459,11 @@ public class WorkerThread implements Runnable {
         } catch (IOException e) {
             logger.error("Failed to close IO file handles", e);
         }
+        // The worker thread gives back the jobs it holds when it exits, the aggregator is not
+        // safe to use from this thread.
         Thread thread = currentThread.getAndSet(null);
         if (thread != null) {
             thread.interrupt();
-            aggregator.sendError(
-                    null, "Worker scaled down.", HttpResponseStatus.INTERNAL_SERVER_ERROR);
         }
     }
 
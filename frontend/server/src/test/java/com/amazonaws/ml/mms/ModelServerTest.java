@@ -67,6 +67,7 @@ import java.util.List;
 import java.util.Properties;
 import java.util.Scanner;
 import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.TimeUnit;
 import org.apache.commons.io.IOUtils;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
@@ -106,6 +107,7 @@ public class ModelServerTest {
 
         server = new ModelServer(configManager);
         server.start();
+        Assert.assertTrue(server.awaitInitialModels(2, TimeUnit.MINUTES));
 
         try (InputStream is = new FileInputStream("src/test/resources/inference_open_api.json")) {
             listInferenceApisResult = IOUtils.toString(is, StandardCharsets.UTF_8.name());
@@ -167,6 +169,15 @@ public class ModelServerTest {
         testPredictions(channel);
         testPredictionsBinary(channel);
         testPredictionsJson(channel);
+        testSwapModel(managementChannel);
+        testPredictions(channel);
+        testBatchPolicy(managementChannel);
+        testPredictions(channel);
+        testFixedBatchPolicy(managementChannel);
+        testBucketedBatching(
+                managementChannel, "16,1024", "Model \"noop\" uses fixed bucketed batching");
+        testPredictions(channel);
+        testBucketedBatching(managementChannel, "", "Model \"noop\" uses fixed batching");
         testInvocationsJson(channel);
         testInvocationsMultipart(channel);
         testModelsInvokeJson(channel);
@@ -209,6 +220,12 @@ public class ModelServerTest {
         testRegisterModelHttpError();
         testRegisterModelInvalidPath();
         testScaleModelNotFound();
+        testSwapModelNotFound();
+        testSwapPreloadedModel();
+        testBatchPolicyMissingSlo();
+        testUpdateModelMixedParameters("batch_policy=fixed&min_worker=2");
+        testUpdateModelMixedParameters("url=noop-v1.0&max_worker=2");
+        testUpdateModelMixedParameters("url=noop-v1.0&bucket_boundaries=16");
         testScaleModelFailure();
         testUnregisterModelNotFound();
         testUnregisterModelTimeout();
@@ -234,6 +251,7 @@ public class ModelServerTest {
 
         StatusResponse resp = JsonUtils.GSON.fromJson(result, StatusResponse.class);
         Assert.assertEquals(resp.getStatus(), "Healthy");
+        Assert.assertTrue(resp.getModels().containsKey("noop"));
         Assert.assertTrue(headers.contains("x-request-id"));
     }
 
@@ -342,6 +360,78 @@ public class ModelServerTest {
         Assert.assertEquals(resp.getStatus(), "Workers scaled");
     }
 
+    private void testSwapModel(Channel channel) throws InterruptedException {
+        // Swap to another version and back, later tests use the original one.
+        for (String url : new String[] {"noop-v1.0-config-tests", "noop-v1.0"}) {
+            result = null;
+            latch = new CountDownLatch(1);
+            HttpRequest req =
+                    new DefaultFullHttpRequest(
+                            HttpVersion.HTTP_1_1,
+                            HttpMethod.PUT,
+                            "/models/noop?url=" + url + "&synchronous=true");
+            channel.writeAndFlush(req);
+            latch.await();
+
+            StatusResponse resp = JsonUtils.GSON.fromJson(result, StatusResponse.class);
+            Assert.assertEquals(resp.getStatus(), "Model \"noop\" updated");
+        }
+    }
+
+    private void testBatchPolicy(Channel channel) throws InterruptedException {
+        result = null;
+        latch = new CountDownLatch(1);
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1,
+                        HttpMethod.PUT,
+                        "/models/noop?batch_policy=adaptive&latency_slo=100");
+        channel.writeAndFlush(req);
+        latch.await();
+
+        StatusResponse resp = JsonUtils.GSON.fromJson(result, StatusResponse.class);
+        Assert.assertEquals(resp.getStatus(), "Model \"noop\" uses adaptive batching");
+
+        result = null;
+        latch = new CountDownLatch(1);
+        req = new DefaultFullHttpRequest(HttpVersion.HTTP_1_1, HttpMethod.GET, "/models/noop");
+        channel.writeAndFlush(req);
+        latch.await();
+
+        DescribeModelResponse model = JsonUtils.GSON.fromJson(result, DescribeModelResponse.class);
+        Assert.assertEquals(model.getBatchPolicy(), "adaptive");
+        Assert.assertEquals(model.getLatencySlo(), Integer.valueOf(100));
+    }
+
+    private void testFixedBatchPolicy(Channel channel) throws InterruptedException {
+        result = null;
+        latch = new CountDownLatch(1);
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1, HttpMethod.PUT, "/models/noop?batch_policy=fixed");
+        channel.writeAndFlush(req);
+        latch.await();
+
+        StatusResponse resp = JsonUtils.GSON.fromJson(result, StatusResponse.class);
+        Assert.assertEquals(resp.getStatus(), "Model \"noop\" uses fixed batching");
+    }
+
+    private void testBucketedBatching(Channel channel, String boundaries, String expected)
+            throws InterruptedException {
+        result = null;
+        latch = new CountDownLatch(1);
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1,
+                        HttpMethod.PUT,
+                        "/models/noop?bucket_boundaries=" + boundaries);
+        channel.writeAndFlush(req);
+        latch.await();
+
+        StatusResponse resp = JsonUtils.GSON.fromJson(result, StatusResponse.class);
+        Assert.assertEquals(resp.getStatus(), expected);
+    }
+
     private void testUnregisterModel(Channel channel) throws InterruptedException {
         result = null;
         latch = new CountDownLatch(1);
@@ -1005,6 +1095,104 @@ public class ModelServerTest {
         Assert.assertEquals(resp.getMessage(), "Model not found: fake");
     }
 
+    private void testSwapModelNotFound() throws InterruptedException {
+        Channel channel = connect(true);
+        Assert.assertNotNull(channel);
+
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1, HttpMethod.PUT, "/models/fake?url=noop-v1.0");
+        channel.writeAndFlush(req).sync();
+        channel.closeFuture().sync();
+
+        ErrorResponse resp = JsonUtils.GSON.fromJson(result, ErrorResponse.class);
+
+        Assert.assertEquals(resp.getCode(), HttpResponseStatus.NOT_FOUND.code());
+        Assert.assertEquals(resp.getMessage(), "Model not found: fake");
+    }
+
+    private void testSwapPreloadedModel() throws InterruptedException {
+        Channel channel = connect(true);
+        Assert.assertNotNull(channel);
+
+        result = null;
+        latch = new CountDownLatch(1);
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1,
+                        HttpMethod.POST,
+                        "/models?url=noop-v1.0&model_name=noop_preload&preload_model=true");
+        channel.writeAndFlush(req);
+        latch.await();
+
+        StatusResponse status = JsonUtils.GSON.fromJson(result, StatusResponse.class);
+        Assert.assertEquals(status.getStatus(), "Model \"noop_preload\" registered");
+
+        req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1,
+                        HttpMethod.PUT,
+                        "/models/noop_preload?url=noop-v1.0-config-tests");
+        channel.writeAndFlush(req).sync();
+        channel.closeFuture().sync();
+
+        ErrorResponse resp = JsonUtils.GSON.fromJson(result, ErrorResponse.class);
+        Assert.assertEquals(resp.getCode(), HttpResponseStatus.BAD_REQUEST.code());
+        Assert.assertEquals(
+                resp.getMessage(),
+                "Model noop_preload is preloaded, unregister and register it to update it.");
+
+        channel = connect(true);
+        Assert.assertNotNull(channel);
+        result = null;
+        latch = new CountDownLatch(1);
+        req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1, HttpMethod.DELETE, "/models/noop_preload");
+        channel.writeAndFlush(req);
+        latch.await();
+        channel.close();
+
+        status = JsonUtils.GSON.fromJson(result, StatusResponse.class);
+        Assert.assertEquals(status.getStatus(), "Model \"noop_preload\" unregistered");
+    }
+
+    private void testUpdateModelMixedParameters(String query) throws InterruptedException {
+        Channel channel = connect(true);
+        Assert.assertNotNull(channel);
+
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1, HttpMethod.PUT, "/models/noop?" + query);
+        channel.writeAndFlush(req).sync();
+        channel.closeFuture().sync();
+
+        ErrorResponse resp = JsonUtils.GSON.fromJson(result, ErrorResponse.class);
+
+        Assert.assertEquals(resp.getCode(), HttpResponseStatus.BAD_REQUEST.code());
+        Assert.assertEquals(
+                resp.getMessage(),
+                "Parameters url, batch_policy/bucket_boundaries and min_worker/max_worker cannot"
+                        + " be combined, update them in separate calls.");
+    }
+
+    private void testBatchPolicyMissingSlo() throws InterruptedException {
+        Channel channel = connect(true);
+        Assert.assertNotNull(channel);
+
+        HttpRequest req =
+                new DefaultFullHttpRequest(
+                        HttpVersion.HTTP_1_1, HttpMethod.PUT, "/models/noop?batch_policy=adaptive");
+        channel.writeAndFlush(req).sync();
+        channel.closeFuture().sync();
+
+        ErrorResponse resp = JsonUtils.GSON.fromJson(result, ErrorResponse.class);
+
+        Assert.assertEquals(resp.getCode(), HttpResponseStatus.BAD_REQUEST.code());
+        Assert.assertEquals(
+                resp.getMessage(), "Parameter latency_slo is required for adaptive batching.");
+    }
+
     private void testUnregisterModelNotFound() throws InterruptedException {
         Channel channel = connect(true);
         Assert.assertNotNull(channel);
@@ -0,0 +1,94 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import java.util.concurrent.TimeUnit;
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class AdaptiveBatchPolicyTest {
+
+    private Model createModel() {
+        Model model = new Model(null, 100, "false");
+        model.setBatchSize(8);
+        model.setMaxBatchDelay(100);
+        return model;
+    }
+
+    private void arrive(BatchPolicy policy, int count, long interval) {
+        long timestamp = System.nanoTime();
+        for (int i = 0; i < count; ++i) {
+            timestamp += TimeUnit.MILLISECONDS.toNanos(interval);
+            policy.requestArrived(timestamp);
+        }
+    }
+
+    @Test
+    public void testLightLoad() {
+        Model model = createModel();
+        BatchPolicy policy = BatchPolicy.create(BatchPolicy.ADAPTIVE, 100);
+
+        // Nothing measured yet.
+        Assert.assertEquals(policy.getBatchSize(model), 1);
+        Assert.assertEquals(policy.getMaxBatchDelay(model), 0);
+
+        policy.batchCompleted(1, 10);
+        arrive(policy, 50, 200);
+        Assert.assertEquals(policy.getBatchSize(model), 1);
+        Assert.assertEquals(policy.getMaxBatchDelay(model), 0);
+    }
+
+    @Test
+    public void testHeavyLoad() {
+        Model model = createModel();
+        BatchPolicy policy = BatchPolicy.create(BatchPolicy.ADAPTIVE, 100);
+
+        policy.batchCompleted(1, 10);
+        arrive(policy, 50, 1);
+        // 7 ms to collect 8 requests, 80 ms extrapolated to serve them.
+        Assert.assertEquals(policy.getBatchSize(model), 8);
+        Assert.assertEquals(policy.getMaxBatchDelay(model), 20);
+
+        // Serving large batches turns out slower than the SLO allows.
+        for (int i = 0; i < 20; ++i) {
+            policy.batchCompleted(8, 200);
+        }
+        Assert.assertTrue(policy.getBatchSize(model) < 8);
+    }
+
+    @Test
+    public void testSloNotFeasible() {
+        Model model = createModel();
+        BatchPolicy policy = BatchPolicy.create(BatchPolicy.ADAPTIVE, 100);
+
+        policy.batchCompleted(1, 500);
+        arrive(policy, 50, 1);
+        Assert.assertEquals(policy.getBatchSize(model), 8);
+        Assert.assertEquals(policy.getMaxBatchDelay(model), 0);
+    }
+
+    @Test
+    public void testFixedPolicy() {
+        Model model = createModel();
+        BatchPolicy policy = BatchPolicy.create(null, 0);
+
+        Assert.assertEquals(policy.getName(), BatchPolicy.FIXED);
+        Assert.assertEquals(policy.getBatchSize(model), 8);
+        Assert.assertEquals(policy.getMaxBatchDelay(model), 100);
+    }
+
+    @Test(expectedExceptions = IllegalArgumentException.class)
+    public void testInvalidPolicy() {
+        BatchPolicy.create("greedy", 100);
+    }
+}
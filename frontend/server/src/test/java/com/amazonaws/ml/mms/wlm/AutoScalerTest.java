@@ -0,0 +1,76 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import com.amazonaws.ml.mms.util.messages.RequestInput;
+import com.amazonaws.ml.mms.util.messages.WorkerCommands;
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class AutoScalerTest {
+
+    private AutoScaler autoScaler = new AutoScaler(null, 0, 0, 500, 0);
+
+    private Model createModel(int batchSize, int queueSize) {
+        Model model = new Model(null, 100, "false");
+        model.setMinWorkers(1);
+        model.setMaxWorkers(8);
+        model.setBatchSize(batchSize);
+        for (int i = 0; i < queueSize; ++i) {
+            RequestInput input = new RequestInput("r" + i);
+            model.addJob(new Job(null, "noop", WorkerCommands.PREDICT, input));
+        }
+        return model;
+    }
+
+    private ModelStats.Snapshot stats(long p95Latency, double batchSize, long busyTime) {
+        return new ModelStats.Snapshot(10000, 100, p95Latency, batchSize, busyTime);
+    }
+
+    @Test
+    public void testScaleUpForQueue() {
+        Model model = createModel(1, 5);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 2, stats(100, 1, 20000)), 5);
+
+        model = createModel(2, 50);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 2, stats(100, 2, 20000)), 8);
+    }
+
+    @Test
+    public void testScaleUpForFullBatches() {
+        Model model = createModel(4, 2);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 2, stats(100, 3.8, 20000)), 3);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 2, stats(100, 2, 20000)), 2);
+    }
+
+    @Test
+    public void testScaleUpForLatency() {
+        Model model = createModel(1, 0);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 2, stats(800, 1, 10000)), 3);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 8, stats(800, 1, 10000)), 8);
+
+        model.setBatchPolicy(new AdaptiveBatchPolicy(1000));
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 2, stats(800, 1, 10000)), 2);
+    }
+
+    @Test
+    public void testScaleDown() {
+        Model model = createModel(1, 0);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 4, stats(100, 1, 10000)), 3);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 4, stats(100, 1, 25000)), 4);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 1, stats(100, 1, 0)), 1);
+
+        model = createModel(1, 1);
+        Assert.assertEquals(autoScaler.getTargetWorkers(model, 4, stats(100, 1, 0)), 4);
+    }
+}
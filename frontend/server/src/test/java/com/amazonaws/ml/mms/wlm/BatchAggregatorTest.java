@@ -0,0 +1,80 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import com.amazonaws.ml.mms.archive.Manifest;
+import com.amazonaws.ml.mms.archive.ModelArchive;
+import com.amazonaws.ml.mms.util.messages.InputParameter;
+import com.amazonaws.ml.mms.util.messages.RequestInput;
+import com.amazonaws.ml.mms.util.messages.WorkerCommands;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.concurrent.atomic.AtomicBoolean;
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class BatchAggregatorTest {
+
+    private Job createJob(String requestId) {
+        RequestInput input = new RequestInput(requestId);
+        input.addParameter(new InputParameter("data", new byte[1]));
+        return new Job(null, "noop", WorkerCommands.PREDICT, input);
+    }
+
+    @Test
+    public void testScaleDownDuringBatchDelay() throws InterruptedException {
+        Manifest manifest = new Manifest();
+        manifest.getModel().setModelName("noop");
+        Model model = new Model(new ModelArchive(manifest, "noop", null, false), 100, "false");
+        model.setBatchSize(4);
+        model.setMaxBatchDelay(60000);
+        BatchAggregator aggregator = new BatchAggregator(model);
+
+        model.addJob(createJob("a"));
+        model.addJob(createJob("b"));
+
+        AtomicBoolean interrupted = new AtomicBoolean();
+        Thread worker =
+                new Thread(
+                        () -> {
+                            try {
+                                aggregator.getRequest(
+                                        "W-noop-1", WorkerState.WORKER_MODEL_LOADED);
+                            } catch (InterruptedException e) {
+                                interrupted.set(true);
+                            }
+                        });
+        worker.start();
+
+        // The worker holds the jobs while it waits for more to fill the batch.
+        long deadline = System.currentTimeMillis() + 10000;
+        while (!aggregator.hasJobs() && System.currentTimeMillis() < deadline) {
+            Thread.sleep(10);
+        }
+        Assert.assertTrue(aggregator.hasJobs());
+
+        // Scale down, as WorkerThread.shutdown does.
+        worker.interrupt();
+        worker.join(10000);
+        Assert.assertTrue(interrupted.get());
+        Assert.assertFalse(aggregator.hasJobs());
+
+        // The jobs went back to the queue, in order, for the other workers.
+        model.setMaxBatchDelay(0);
+        Map<String, Job> jobs = new LinkedHashMap<>();
+        model.pollBatch("W-noop-2", 0, jobs);
+        Assert.assertEquals(new ArrayList<>(jobs.keySet()), Arrays.asList("a", "b"));
+    }
+}
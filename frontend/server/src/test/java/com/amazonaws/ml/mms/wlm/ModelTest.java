@@ -0,0 +1,132 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import com.amazonaws.ml.mms.util.messages.InputParameter;
+import com.amazonaws.ml.mms.util.messages.RequestInput;
+import com.amazonaws.ml.mms.util.messages.WorkerCommands;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class ModelTest {
+
+    private Job createJob(String requestId, int length, String bucket) {
+        RequestInput input = new RequestInput(requestId);
+        input.addParameter(new InputParameter("data", new byte[length]));
+        if (bucket != null) {
+            input.updateHeaders("x-mms-bucket", bucket);
+        }
+        return new Job(null, "noop", WorkerCommands.PREDICT, input);
+    }
+
+    private List<String> pollBatch(Model model) throws InterruptedException {
+        Map<String, Job> jobs = new LinkedHashMap<>();
+        model.pollBatch("W-noop-1", 0, jobs);
+        return new ArrayList<>(jobs.keySet());
+    }
+
+    @Test
+    public void testBucketedBatching() throws InterruptedException {
+        Model model = new Model(null, 100, "false");
+        model.setBatchSize(4);
+        model.setMaxBatchDelay(0);
+        model.setBucketBoundaries(new int[] {10, 100});
+
+        model.addJob(createJob("a", 5, null));
+        model.addJob(createJob("b", 50, null));
+        model.addJob(createJob("c", 8, null));
+        model.addJob(createJob("d", 60, null));
+        model.addJob(createJob("e", 200, null));
+        model.addJob(createJob("f", 5, "x"));
+        model.addJob(createJob("g", 500, "x"));
+
+        Assert.assertEquals(pollBatch(model), Arrays.asList("a", "c"));
+        Assert.assertEquals(pollBatch(model), Arrays.asList("b", "d"));
+        Assert.assertEquals(pollBatch(model), Arrays.asList("e"));
+        Assert.assertEquals(pollBatch(model), Arrays.asList("f", "g"));
+    }
+
+    @Test
+    public void testUnbucketedBatching() throws InterruptedException {
+        Model model = new Model(null, 100, "false");
+        model.setBatchSize(4);
+        model.setMaxBatchDelay(0);
+
+        model.addJob(createJob("a", 5, null));
+        model.addJob(createJob("b", 50, null));
+        model.addJob(createJob("c", 8, null));
+
+        Assert.assertEquals(pollBatch(model), Arrays.asList("a", "b", "c"));
+    }
+
+    @Test
+    public void testPriorityAndDeadline() throws InterruptedException {
+        Model model = new Model(null, 100, "false");
+        model.setBatchSize(2);
+        model.setMaxBatchDelay(0);
+
+        Job expired = createJob("expired", 5, null);
+        expired.setTimeout(1);
+        Thread.sleep(10);
+
+        Job urgent = createJob("urgent", 5, null);
+        urgent.setPriority(5);
+        Job soon = createJob("soon", 5, null);
+        soon.setTimeout(1000);
+        Job later = createJob("later", 5, null);
+        later.setTimeout(10000);
+
+        model.addJob(createJob("a", 5, null));
+        model.addJob(expired);
+        model.addJob(later);
+        model.addJob(createJob("b", 5, null));
+        model.addJob(soon);
+        model.addJob(urgent);
+
+        Assert.assertEquals(pollBatch(model), Arrays.asList("urgent", "soon"));
+        Assert.assertEquals(pollBatch(model), Arrays.asList("later", "a"));
+        Assert.assertEquals(pollBatch(model), Arrays.asList("b"));
+    }
+
+    @Test
+    public void testCoalescing() throws InterruptedException {
+        Model model = new Model(null, 100, "false");
+        model.setBatchSize(4);
+        model.setMaxBatchDelay(0);
+        model.setCoalesceRequests(true);
+
+        Job a = createJob("a", 5, null);
+        Job b = createJob("b", 5, null);
+        b.getPayload().updateHeaders("User-Agent", "curl");
+        Job urgent = createJob("urgent", 5, null);
+        urgent.setPriority(1);
+
+        model.addJob(a);
+        model.addJob(b);
+        model.addJob(createJob("c", 8, null));
+        model.addJob(createJob("d", 8, "x"));
+        model.addJob(urgent);
+
+        Assert.assertEquals(pollBatch(model), Arrays.asList("urgent", "a", "c", "d"));
+
+        a.response(new byte[0], null, 200, null, null);
+        Assert.assertFalse(a.attach(createJob("e", 5, null)));
+        model.addJob(createJob("f", 5, null));
+        Assert.assertEquals(pollBatch(model), Arrays.asList("f"));
+    }
+}
@@ -0,0 +1,85 @@
+/*
+ * Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+ * with the License. A copy of the License is located at
+ *
+ * http://aws.amazon.com/apache2.0/
+ *
+ * or in the "license" file accompanying this file. This file is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES
+ * OR CONDITIONS OF ANY KIND, either express or implied. See the License for the specific language governing permissions
+ * and limitations under the License.
+ */
+package com.amazonaws.ml.mms.wlm;
+
+import com.amazonaws.ml.mms.util.messages.InputParameter;
+import com.amazonaws.ml.mms.util.messages.RequestInput;
+import com.amazonaws.ml.mms.util.messages.WorkerCommands;
+import org.testng.Assert;
+import org.testng.annotations.Test;
+
+public class ResponseCacheTest {
+
+    private ResponseCache.Entry entry(int size) {
+        return new ResponseCache.Entry(new byte[size], null, null);
+    }
+
+    @Test
+    public void testExpiry() {
+        ResponseCache cache = new ResponseCache("noop", 1000, 1024);
+        cache.put("a", entry(10), 0);
+
+        Assert.assertNotNull(cache.get("a", 1000));
+        Assert.assertNull(cache.get("a", 1001));
+        Assert.assertEquals(cache.size(), 0);
+    }
+
+    @Test
+    public void testLruEviction() {
+        ResponseCache cache = new ResponseCache("noop", 1000, 100);
+        cache.put("a", entry(40), 0);
+        cache.put("b", entry(40), 0);
+        Assert.assertNotNull(cache.get("a", 0));
+        cache.put("c", entry(40), 0);
+
+        Assert.assertNotNull(cache.get("a", 0));
+        Assert.assertNull(cache.get("b", 0));
+        Assert.assertNotNull(cache.get("c", 0));
+        Assert.assertEquals(cache.size(), 80);
+
+        cache.put("d", entry(101), 0);
+        Assert.assertNull(cache.get("d", 0));
+        Assert.assertEquals(cache.size(), 80);
+    }
+
+    @Test
+    public void testClear() {
+        ResponseCache cache = new ResponseCache("noop", 1000, 1024);
+        cache.put("a", entry(10), 0);
+        cache.clear();
+
+        Assert.assertNull(cache.get("a", 0));
+        Assert.assertEquals(cache.size(), 0);
+    }
+
+    @Test
+    public void testModelCache() {
+        Model model = new Model(null, 100, "false");
+        ResponseCache cache = new ResponseCache("noop", 60000, 1024);
+        model.setResponseCache(cache);
+
+        RequestInput input = new RequestInput("a");
+        input.addParameter(new InputParameter("data", "hello"));
+        Job job = new Job(null, "noop", WorkerCommands.PREDICT, input);
+        Assert.assertTrue(model.addJob(job));
+        cache.put(job, new byte[] {1, 2, 3}, "application/octet-stream", null);
+
+        input = new RequestInput("b");
+        input.addParameter(new InputParameter("data", "hello"));
+        Assert.assertTrue(model.addJob(new Job(null, "noop", WorkerCommands.PREDICT, input)));
+
+        Assert.assertEquals(cache.getHits(), 1);
+        Assert.assertEquals(cache.getMisses(), 1);
+        Assert.assertEquals(model.getQueueSize(), 1);
+    }
+}
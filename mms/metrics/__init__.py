@@ -10,10 +10,17 @@
 
 """
 This is a folder for all python worker metrics.
+
+system_metrics pulls in psutil and is only imported on first access.
 """
+from mms.utils.lazy_module import lazy_submodules
+
 from . import dimension
 from . import metric
 from . import metric_encoder
 from . import metrics_store
-from . import system_metrics
 from . import unit
+
+_LAZY_SUBMODULES = ("system_metrics", "process_memory_metric", "metric_collector")
+
+lazy_submodules(__name__, _LAZY_SUBMODULES)
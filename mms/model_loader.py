@@ -11,6 +11,7 @@
 """
 Model loader.
 """
+import gc
 import importlib
 import inspect
 import json
@@ -62,6 +63,12 @@ class ModelLoader(object):
         """
         pass # pylint: disable=unnecessary-pass
 
+    def unload(self):
+        """
+        Release the resources held by the loaded model.
+        """
+        release_memory()
+
     @staticmethod
     def list_model_services(module, parent_class=None):
         """
@@ -113,7 +120,8 @@ class MmsModelLoader(ModelLoader):
         if module_name.endswith(".py"):
             module_name = module_name[:-3]
         module_name = module_name.split("/")[-1]
-        self.module = importlib.import_module(module_name)
+        self.model_dir = model_dir
+        self.module = MmsModelLoader._import_handler_module(module_name, model_dir)
         if self.module is None:
             raise ValueError("Unable to load module {}, make sure it is added to python path".format(module_name))
         if function_name is None:
@@ -154,13 +162,44 @@ class MmsModelLoader(ModelLoader):
 
         return service
 
+    # Model directories this process imported handlers from, the latest version last
+    _model_dirs = []
+
+    @staticmethod
+    def _import_handler_module(module_name, model_dir):
+        """
+        Import the handler module from model_dir. When a different version of the model is already loaded in
+        this process, its directory is removed from sys.path and its modules from the import cache, so that the
+        new version's handler and helper modules are imported instead of the old ones.
+        """
+        for loaded_dir in MmsModelLoader._model_dirs:
+            if loaded_dir != model_dir:
+                evict_model_dir(loaded_dir)
+        MmsModelLoader._model_dirs[:] = [model_dir]
+        while model_dir in sys.path:
+            sys.path.remove(model_dir)
+        sys.path.insert(0, model_dir)
+
+        cached = sys.modules.get(module_name)
+        cached_file = getattr(cached, "__file__", None)
+        if cached_file is not None and not _is_under(cached_file, model_dir):
+            del sys.modules[module_name]
+
+        return importlib.import_module(module_name)
+
     def unload(self):
         # to make sure logs emitted from model on exit get into mms logs,
         # do not delete logging python module
         module_vars = [var for var in vars(self.module) if not var.startswith('__') and not var == "logging"]
         for var in module_vars:
             delattr(self.module, var)
+        if sys.modules.get(self.module.__name__) is self.module:
+            del sys.modules[self.module.__name__]
+        if self.model_dir in MmsModelLoader._model_dirs:
+            MmsModelLoader._model_dirs.remove(self.model_dir)
+            evict_model_dir(self.model_dir)
         del self.module
+        release_memory()
 
 class LegacyModelLoader(ModelLoader):
     """
@@ -202,7 +241,7 @@ class LegacyModelLoader(ModelLoader):
         if module is None:
             raise ValueError("Unable to load module {}".format(service_file))
 
-        from mms.model_service.mxnet_model_service import SingleNodeService
+        from mms.model_service.model_service import SingleNodeService
 
         model_class_definitions = ModelLoader.list_model_services(module, SingleNodeService)
         module_class = model_class_definitions[0]
@@ -213,3 +252,40 @@ class LegacyModelLoader(ModelLoader):
         module.initialize(service.context)
 
         return service
+
+
+def release_memory():
+    """
+    Collect the objects freed by an unloaded model and return cached framework memory, so that a worker
+    which swapped models does not keep both versions resident. Frameworks are only touched if the model
+    already imported them.
+    """
+    gc.collect()
+
+    mx = sys.modules.get("mxnet")
+    if mx is not None:
+        mx.nd.waitall()
+        for gpu_id in range(mx.context.num_gpus()):
+            if hasattr(mx.context.Context, "empty_cache"):
+                mx.gpu(gpu_id).empty_cache()
+
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_initialized():
+        torch.cuda.empty_cache()
+
+
+def _is_under(path, directory):
+    return os.path.abspath(path).startswith(os.path.join(os.path.abspath(directory), ""))
+
+
+def evict_model_dir(model_dir):
+    """
+    Remove a model directory from sys.path and its modules from the import cache, so that modules with the
+    same names in another version of the model are not resolved to this one.
+    """
+    while model_dir in sys.path:
+        sys.path.remove(model_dir)
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path is not None and _is_under(path, model_dir):
+            del sys.modules[name]
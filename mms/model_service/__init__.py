@@ -9,12 +9,18 @@
 # permissions and limitations under the License.
 """
 Model services code
+
+MXNet based services are imported on first access so that non-MXNet handlers
+don't pay the framework import cost.
 """
 import warnings
 
+from mms.utils.lazy_module import lazy_submodules
 from . import model_service
-from . import mxnet_model_service
-from . import mxnet_vision_service
+
+_LAZY_SUBMODULES = ("mxnet_model_service", "mxnet_vision_service", "gluon_vision_service")
 
 warnings.warn("Module mms.model_service is deprecated, please migrate to model archive 1.0 format.",
               DeprecationWarning, stacklevel=2)
+
+lazy_submodules(__name__, _LAZY_SUBMODULES)
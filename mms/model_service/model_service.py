@@ -93,33 +93,63 @@ class ModelService(object):
         """
         return self._signature
 
-    # noinspection PyUnusedLocal
-    def handle(self, data, context):  # pylint: disable=unused-argument
+    def batch_inference(self, batch):
         """
-        Backward compatible handle function.
+        Run inference for a batch of requests. Services that can run a batch at once override
+        this; the default runs one inference per request.
 
-        :param data:
-        :param context:
-        :return:
+        Parameters
+        ----------
+        batch : list of object
+            Raw input of each request.
+
+        Returns
+        -------
+        list of outputs, one per request.
+        """
+        outputs = []
+        for input_data in batch:
+            ret = self.inference([input_data])
+            outputs.append(ret[0] if isinstance(ret, list) else ret)
+        return outputs
 
+    def _get_input(self, request):
+        """
+        Extract the raw input of a request.
+
+        :param request: dict of request parameters
+        :return: raw input
         """
         input_type = self._signature['input_type']
 
-        input_data = []
         data_name = self._signature["inputs"][0]["data_name"]
-        form_data = data[0].get(data_name)
+        form_data = request.get(data_name)
         if form_data is None:
-            form_data = data[0].get("body")
+            form_data = request.get("body")
 
         if form_data is None:
-            form_data = data[0].get("data")
+            form_data = request.get("data")
 
         if input_type == "application/json":
             # user might not send content in HTTP request
             if isinstance(form_data, (bytes, bytearray)):
                 form_data = ast.literal_eval(form_data.decode("utf-8"))
 
-        input_data.append(form_data)
+        return form_data
+
+    # noinspection PyUnusedLocal
+    def handle(self, data, context):  # pylint: disable=unused-argument
+        """
+        Backward compatible handle function.
+
+        :param data: list of requests of the batch
+        :param context:
+        :return: list of outputs, one per request
+
+        """
+        input_data = [self._get_input(request) for request in data]
+        if len(input_data) > 1:
+            return self.batch_inference(input_data)
 
         ret = self.inference(input_data)
         if isinstance(ret, list):
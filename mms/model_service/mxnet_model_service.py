@@ -14,6 +14,7 @@
 import json
 import os
 import logging
+import time
 
 import mxnet as mx
 from mxnet.io import DataBatch
@@ -66,6 +67,8 @@ class MXNetBaseService(SingleNodeService):
         self.param_filename = None
         self.model_name = model_name
         self.ctx = mx.gpu(int(gpu)) if gpu is not None else mx.cpu()
+        # Batch size the module is bound for, see initialize().
+        self._batch_size = 1
         signature_file_path = os.path.join(model_dir, manifest['Model']['Signature'])
         if not os.path.isfile(signature_file_path):
             raise RuntimeError('Signature file is not found. Please put signature.json '
@@ -104,6 +107,7 @@ class MXNetBaseService(SingleNodeService):
         self.mx_model = mx.mod.Module(symbol=sym, context=self.ctx,
                                       data_names=data_names, label_names=None)
         self.mx_model.bind(for_training=False, data_shapes=data_shapes)
+        self._data_shapes = data_shapes
         self.mx_model.set_params(arg_params, aux_params, allow_missing=True, allow_extra=True)
 
         # Read synset file
@@ -114,11 +118,73 @@ class MXNetBaseService(SingleNodeService):
             synset = archive_synset
             self.labels = [line.strip() for line in open(synset).readlines()]
 
+    def initialize(self, context):
+        """
+        Rebind the module for the batch size of the model, so that a batch of requests runs in
+        one forward pass.
+
+        :param context: MMS context object
+        """
+        super(MXNetBaseService, self).initialize(context)
+        batch_size = context.system_properties.get("batch_size") or 1
+        if batch_size > self._batch_size:
+            self._batch_size = batch_size
+            self.mx_model.reshape([(name, (batch_size,) + shape[1:])
+                                   for name, shape in self._data_shapes])
+
+    def batch_inference(self, batch):
+        """
+        Preprocess each request, stack the requests along the batch axis, run one forward
+        computation and postprocess the outputs of each request.
+
+        Parameters
+        ----------
+        batch : list of object
+            Raw input of each request.
+
+        Returns
+        -------
+        list of outputs, one per request.
+        """
+        preprocess_start = time.time()
+        inputs = [list(self._preprocess([input_data])) for input_data in batch]
+        # One array per model input, with a row per request.
+        data = [mx.nd.concat(*arrays, dim=0) for arrays in zip(*inputs)]
+        inference_start = time.time()
+        outputs = self._inference(data)
+        postprocess_start = time.time()
+        ret = self._postprocess_batch(outputs, len(batch))
+        end_time = time.time()
+
+        logging.info("preprocess time: %.2f", (inference_start - preprocess_start) * 1000)
+        logging.info("inference time: %.2f", (postprocess_start - inference_start) * 1000)
+        logging.info("postprocess time: %.2f", (end_time - postprocess_start) * 1000)
+
+        return ret
+
     def _preprocess(self, data):
-        return map(mx.nd.array, data)
+        return [mx.nd.array(d) for d in data]
 
     def _postprocess(self, data):
-        return [str(d.asnumpy().tolist()) for d in data]
+        return [d.asnumpy() for d in data]
+
+    def _postprocess_batch(self, data, size):
+        """Postprocess the outputs of a batch. Slices the outputs of each request and
+        postprocesses them separately; override to postprocess the whole batch at once.
+
+        Parameters
+        ----------
+        data : list of NDArray
+            Outputs of the forward computation, with a row per request.
+        size : int
+            Number of requests in the batch.
+
+        Returns
+        -------
+        list of outputs, one per request.
+        """
+        return [self._postprocess([output[idx:idx + 1] for output in data])[0]
+                for idx in range(size)]
 
     def _inference(self, data):
         """Internal inference methods for MXNet. Run forward computation and
@@ -136,9 +202,16 @@ class MXNetBaseService(SingleNodeService):
         """
         # Check input shape
         check_input_shape(data, self.signature)
+        size = data[0].shape[0]
+        if size < self._batch_size:
+            # Pad partial batches with copies of the last row, so the module is not rebound.
+            data = [mx.nd.concat(item, mx.nd.repeat(item[-1:], self._batch_size - size, axis=0), dim=0)
+                    for item in data]
         data = [item.as_in_context(self.ctx) for item in data]
         self.mx_model.forward(DataBatch(data))
         data = self.mx_model.get_outputs()
+        if size < self._batch_size:
+            data = [d[:size] if isinstance(d, mx.nd.NDArray) else d for d in data]
         # by pass lazy evaluation get_outputs either returns a list of nd arrays
         # a list of list of NDArray
         for d in data:
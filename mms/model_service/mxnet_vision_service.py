@@ -34,7 +34,14 @@ class MXNetVisionService(MXNetBaseService):
         return img_list
 
     def _postprocess(self, data):
+        self._check_labels()
+        return [ndarray.top_probability(d, self.labels, top=5) for d in data]
+
+    def _postprocess_batch(self, data, size):
+        self._check_labels()
+        return ndarray.top_probabilities(data[0][:size], self.labels, top=5)
+
+    def _check_labels(self):
         assert hasattr(self, 'labels'), \
             "Can't find labels attribute. Did you put synset.txt file into " \
             "model archive or manually load class label file in __init__?"
-        return [ndarray.top_probability(d, self.labels, top=5) for d in data]
@@ -69,6 +69,7 @@ class MXNetModelServiceWorker(object):
         self.sock = socket.socket(socket_family, socket.SOCK_STREAM)
         self.preload = preload_model
         self.service = None
+        self.model_loaded = False
         self.model_meta_data = model_request
         self.out = self.err = None
         self.tmp_dir = tmp_dir
@@ -90,16 +91,7 @@ class MXNetModelServiceWorker(object):
         :return:
         """
         try:
-            model_dir = load_model_request["modelPath"].decode("utf-8")
-            model_name = load_model_request["modelName"].decode("utf-8")
-            handler = load_model_request["handler"].decode("utf-8")
-            batch_size = 1
-            if "batchSize" in load_model_request:
-                batch_size = int(load_model_request["batchSize"])
-
-            gpu = None
-            if "gpu" in load_model_request:
-                gpu = int(load_model_request["gpu"])
+            model_dir, model_name, handler, gpu, batch_size = self._parse_load_request(load_model_request)
             io_fd = None
             if "ioFileDescriptor" in load_model_request:
                 io_fd = load_model_request.get("ioFileDescriptor").decode("utf-8")
@@ -107,12 +99,62 @@ class MXNetModelServiceWorker(object):
             if self.service is None or self.preload is False:
                 self.model_loader = ModelLoaderFactory.get_model_loader(model_dir)
                 self.service = self.model_loader.load(model_name, model_dir, handler, gpu, batch_size)
+                self.service.warmup()
                 logging.info("Model %s loaded io_fd=%s", model_name, str(io_fd))
             return "loaded model {}. [PID]:{}".format(model_name, os.getpid()), 200
 
         except MemoryError:
             return "System out of memory", 507
 
+    def swap_model(self, load_model_request):
+        """
+        Load another version of the served model next to the current one and switch to it once it is loaded
+        and warmed up. The previous version is then unloaded and its memory released. If the new version fails
+        to load, the worker keeps serving the current one.
+
+        Expects the same command as load_model.
+
+        :param load_model_request:
+        :return:
+        """
+        model_dir, model_name, handler, gpu, batch_size = self._parse_load_request(load_model_request)
+        if model_dir == self.service.context.system_properties.get("model_dir"):
+            return "loaded model {}. [PID]:{}".format(model_name, os.getpid()), 200
+
+        # noinspection PyBroadException
+        try:
+            model_loader = ModelLoaderFactory.get_model_loader(model_dir)
+            service = model_loader.load(model_name, model_dir, handler, gpu, batch_size)
+            service.warmup()
+        except MemoryError:
+            logging.error("Out of memory while swapping model %s, keeping the current version.", model_name)
+            return "System out of memory", 507
+        except Exception as e:  # pylint: disable=broad-except
+            logging.error("Failed to swap model %s, keeping the current version.", model_name, exc_info=True)
+            return "Failed to load {}: {}".format(model_dir, e), 500
+
+        previous_loader = self.model_loader
+        self.model_loader = model_loader
+        self.service = service
+        previous_loader.unload()
+        logging.info("Model %s swapped to %s", model_name, model_dir)
+        return "swapped model {}. [PID]:{}".format(model_name, os.getpid()), 200
+
+    @staticmethod
+    def _parse_load_request(load_model_request):
+        model_dir = load_model_request["modelPath"].decode("utf-8")
+        model_name = load_model_request["modelName"].decode("utf-8")
+        handler = load_model_request["handler"].decode("utf-8")
+        batch_size = 1
+        if "batchSize" in load_model_request:
+            batch_size = int(load_model_request["batchSize"])
+
+        gpu = None
+        if "gpu" in load_model_request:
+            gpu = int(load_model_request["gpu"])
+
+        return model_dir, model_name, handler, gpu, batch_size
+
     def _create_io_files(self, tmp_dir, io_fd):
         self.out = tmp_dir + '/' + io_fd + "-stdout"
         self.err = tmp_dir + '/' + io_fd + "-stderr"
@@ -139,6 +181,9 @@ class MXNetModelServiceWorker(object):
             if cmd == b'I':
                 resp = self.service.predict(msg)
                 cl_socket.send(resp)
+            elif cmd == b'L' and self.model_loaded:
+                result, code = self.swap_model(msg)
+                cl_socket.send(create_load_model_response(code, result))
             elif cmd == b'L':
                 result, code = self.load_model(msg)
                 resp = bytearray()
@@ -147,6 +192,7 @@ class MXNetModelServiceWorker(object):
                 self._remap_io()
                 if code != 200:
                     raise RuntimeError("{} - {}".format(code, result))
+                self.model_loaded = True
             else:
                 raise ValueError("Received unknown command: {}".format(cmd))
 
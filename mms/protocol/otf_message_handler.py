@@ -19,6 +19,8 @@ import os
 from builtins import bytearray
 from builtins import bytes
 
+from mms.protocol.serializer import serialize
+
 int_size = 4
 END_OF_LIST = -1
 LOAD_MSG = b'L'
@@ -55,6 +57,13 @@ def encode_response_headers(resp_hdr_map):
     return msg
 
 
+def _get_request_header(context, idx, name):
+    for key, value in context.get_all_request_header(idx).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
 def create_predict_response(ret, req_id_map, message, code, context=None):
     """
     Create inference response.
@@ -75,19 +84,41 @@ def create_predict_response(ret, req_id_map, message, code, context=None):
 
     for idx in req_id_map:
         req_id = req_id_map.get(idx).encode('utf-8')
+
+        # Serialize the prediction first, it may set the content type and response headers.
+        content_type = None if context is None else context.get_response_content_type(idx)
+        if ret is None:
+            buf = b"error"
+        else:
+            val = ret[idx]
+            # NOTE: Process bytes/bytearray case before processing the string case.
+            if isinstance(val, (bytes, bytearray)):
+                buf = val
+            elif isinstance(val, str):
+                buf = val.encode("utf-8")
+            else:
+                try:
+                    accept = None if context is None else _get_request_header(context, idx, "accept")
+                    buf, serialized_type, headers = serialize(val, accept)
+                except TypeError:
+                    logging.warning("Unable to serialize model output.", exc_info=True)
+                    return create_predict_response(None, req_id_map, "Unsupported model output data type.", 503)
+                if context is not None:
+                    for key, value in headers.items():
+                        context.set_response_header(idx, key, value)
+                    if not content_type:
+                        content_type = serialized_type
+                        context.set_response_content_type(idx, content_type)
+
         msg += struct.pack("!i", len(req_id))
         msg += req_id
 
         # Encoding Content-Type
-        if context is None:
+        if content_type is None or len(content_type) == 0:
             msg += struct.pack('!i', 0)  # content_type
         else:
-            content_type = context.get_response_content_type(idx)
-            if content_type is None or len(content_type) == 0:
-                msg += struct.pack('!i', 0)  # content_type
-            else:
-                msg += struct.pack('!i', len(content_type))
-                msg += content_type.encode('utf-8')
+            msg += struct.pack('!i', len(content_type))
+            msg += content_type.encode('utf-8')
 
         # Encoding the per prediction HTTP response code
         if context is None:
@@ -107,28 +138,8 @@ def create_predict_response(ret, req_id_map, message, code, context=None):
             # Response headers
             msg += encode_response_headers(context.get_response_headers(idx))
 
-        if ret is None:
-            buf = b"error"
-            msg += struct.pack('!i', len(buf))
-            msg += buf
-        else:
-            val = ret[idx]
-            # NOTE: Process bytes/bytearray case before processing the string case.
-            if isinstance(val, (bytes, bytearray)):
-                msg += struct.pack('!i', len(val))
-                msg += val
-            elif isinstance(val, str):
-                buf = val.encode("utf-8")
-                msg += struct.pack('!i', len(buf))
-                msg += buf
-            else:
-                try:
-                    json_value = json.dumps(val, indent=2).encode("utf-8")
-                    msg += struct.pack('!i', len(json_value))
-                    msg += json_value
-                except TypeError:
-                    logging.warning("Unable to serialize model output.", exc_info=True)
-                    return create_predict_response(None, req_id_map, "Unsupported model output data type.", 503)
+        msg += struct.pack('!i', len(buf))
+        msg += buf
 
     msg += struct.pack('!i', -1)  # End of list
     return msg
@@ -286,7 +297,6 @@ def _retrieve_input_data(conn):
     | content_type |
     | input data in bytes |
     """
-    decode_req = os.environ.get("MMS_DECODE_INPUT_REQUEST")
     length = _retrieve_int(conn)
     if length == -1:
         return None
@@ -300,10 +310,21 @@ def _retrieve_input_data(conn):
 
     length = _retrieve_int(conn)
     value = _retrieve_buffer(conn, length)
-    if content_type == "application/json" and (decode_req is None or decode_req == "true"):
-        model_input["value"] = json.loads(value.decode("utf-8"))
-    elif content_type.startswith("text") and (decode_req is None or decode_req == "true"):
-        model_input["value"] = value.decode("utf-8")
-    else:
-        model_input["value"] = value
+    model_input["value"] = decode_input_value(content_type, value)
     return model_input
+
+
+def decode_input_value(content_type, value):
+    """
+    Decode a raw input parameter based on its content type, unless disabled by MMS_DECODE_INPUT_REQUEST.
+
+    :param content_type:
+    :param value: bytes
+    :return:
+    """
+    decode_req = os.environ.get("MMS_DECODE_INPUT_REQUEST")
+    if content_type == "application/json" and (decode_req is None or decode_req == "true"):
+        return json.loads(value.decode("utf-8"))
+    if content_type.startswith("text") and (decode_req is None or decode_req == "true"):
+        return value.decode("utf-8")
+    return value
@@ -0,0 +1,107 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Serialization of model outputs that are neither bytes nor str.
+
+numpy arrays and MXNet NDArrays are sent as binary when the client accepts it:
+    application/x-npy           numpy .npy format, dtype and shape in the file header
+    application/octet-stream    raw little-endian data, dtype and shape in the
+                                X-MMS-Dtype and X-MMS-Shape response headers
+Everything else, and arrays for clients that accept neither, is sent as compact JSON.
+
+numpy is never imported here, so that the worker does not pay for it unless the model
+itself returns numpy data.
+"""
+import json
+from io import BytesIO
+
+JSON = "application/json"
+NPY = "application/x-npy"
+OCTET_STREAM = "application/octet-stream"
+DTYPE_HEADER = "X-MMS-Dtype"
+SHAPE_HEADER = "X-MMS-Shape"
+
+
+def _is_array(val):
+    return hasattr(val, "dtype") and hasattr(val, "shape") and hasattr(val, "tobytes")
+
+
+def _to_array(val):
+    """Return val as a numpy array if it is a numpy array or an MXNet NDArray, else None."""
+    if hasattr(val, "asnumpy"):
+        val = val.asnumpy()
+    if _is_array(val) and val.dtype.kind != "O":
+        return val
+    return None
+
+
+def _json_default(val):
+    if hasattr(val, "asnumpy"):
+        val = val.asnumpy()
+    if hasattr(val, "tolist"):
+        return val.tolist()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(val).__name__))
+
+
+def accepted_types(accept):
+    """
+    Parse an Accept header into media types ordered by preference.
+
+    :param accept: Accept header value, may be None
+    :return: list of lowercase media types, highest q-value first
+    """
+    if not accept:
+        return []
+    types = []
+    for idx, item in enumerate(accept.split(",")):
+        parts = item.split(";")
+        media_type = parts[0].strip().lower()
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            types.append((-quality, idx, media_type))
+    return [media_type for _, _, media_type in sorted(types)]
+
+
+def serialize(val, accept=None):
+    """
+    Serialize a model output.
+
+    :param val: model output
+    :param accept: Accept header of the request
+    :return: tuple of (body, content type, dict of extra response headers)
+    """
+    array = _to_array(val)
+    if array is not None:
+        for media_type in accepted_types(accept):
+            if media_type == NPY:
+                import numpy as np
+                buf = BytesIO()
+                np.save(buf, array, allow_pickle=False)
+                return buf.getvalue(), NPY, {}
+            if media_type == OCTET_STREAM:
+                if array.dtype.byteorder == ">":
+                    array = array.astype(array.dtype.newbyteorder("<"))
+                headers = {DTYPE_HEADER: array.dtype.str,
+                           SHAPE_HEADER: ",".join(str(d) for d in array.shape)}
+                return array.tobytes(), OCTET_STREAM, headers
+            if media_type in (JSON, "*/*", "application/*"):
+                break
+        val = array.tolist()
+
+    body = json.dumps(val, separators=(",", ":"), default=_json_default)
+    return body.encode("utf-8"), JSON, {}
@@ -12,6 +12,8 @@
 CustomService class definitions
 """
 import logging
+import os
+import struct
 import time
 
 from builtins import str
@@ -19,9 +21,10 @@ from builtins import str
 import mms
 from mms.context import Context, RequestProcessor
 from mms.metrics.metrics_store import MetricsStore
-from mms.protocol.otf_message_handler import create_predict_response
+from mms.protocol.otf_message_handler import create_predict_response, decode_input_value
 
 PREDICTION_METRIC = 'PredictionTime'
+WARMUP_METRIC = 'WarmupTime'
 logger = logging.getLogger(__name__)
 
 
@@ -127,6 +130,84 @@ class Service(object):
 
         return create_predict_response(ret, req_id_map, "Prediction success", 200, context=self.context)
 
+    def warmup(self):
+        """
+        Run the warmup requests declared in the model manifest through predict, so that lazy
+        initialization (graph binding, memory allocation, caches) happens before the worker
+        reports the model as loaded instead of on the first client requests.
+
+        "model": {
+            "warmup": {
+                "inputs": [ SAMPLE ],
+                "count": number of runs per batch size, default 1,
+                "batchSizes": [ batch size ], default [ batch size of the model ]
+            }
+        }
+
+        SAMPLE = {
+            "file": "path/relative/to/model/dir",
+            "name": parameter name, default "data",
+            "contentType": "http-content-types", default "application/octet-stream"
+        }
+
+        :return: list of (batch size, duration in ms) for each warmup batch
+        """
+        manifest = self.context.manifest
+        model = manifest.get("model") if isinstance(manifest, dict) else None
+        warmup = model.get("warmup") if isinstance(model, dict) else None
+        if not warmup:
+            return []
+
+        samples = [self._load_warmup_sample(sample) for sample in warmup.get("inputs", [])]
+        if not samples:
+            logger.warning("model: %s, warmup declares no inputs, skipping.", self.context.model_name)
+            return []
+
+        count = int(warmup.get("count", 1))
+        batch_sizes = warmup.get("batchSizes", [self.context.system_properties.get("batch_size")])
+
+        metrics = self.context.metrics
+        request_ids = self.context.request_ids
+        request_processor = self.context.request_processor
+        timings = []
+        start_time = time.time()
+        for batch_size in batch_sizes:
+            batch = [{"requestId": "warmup-{}".format(idx).encode("utf-8"),
+                      "parameters": [dict(samples[idx % len(samples)])]}
+                     for idx in range(int(batch_size))]
+            for _ in range(count):
+                begin = time.time()
+                resp = self.predict(batch)
+                duration = round((time.time() - begin) * 1000, 2)
+                code = struct.unpack('!i', resp[:4])[0]
+                if code != 200:
+                    logger.warning("model: %s, warmup batch of size %d failed with code %d.",
+                                   self.context.model_name, int(batch_size), code)
+                logger.info("model: %s, warmup batch size: %d, time: %.2f ms",
+                            self.context.model_name, int(batch_size), duration)
+                timings.append((int(batch_size), duration))
+
+        # predict() replaced the per-request state, restore the load time state.
+        self.context.request_ids = request_ids
+        self.context.request_processor = request_processor
+        self.context.metrics = metrics
+        if metrics is not None:
+            metrics.add_time(WARMUP_METRIC, round((time.time() - start_time) * 1000, 2))
+
+        return timings
+
+    def _load_warmup_sample(self, sample):
+        content_type = sample.get("contentType", "application/octet-stream")
+        path = os.path.join(self.context.system_properties.get("model_dir"), sample["file"])
+        with open(path, "rb") as f:
+            value = f.read()
+
+        return {
+            "name": sample.get("name", "data"),
+            "contentType": content_type,
+            "value": decode_input_value(content_type, value)
+        }
+
 
 def emit_metrics(metrics):
     """
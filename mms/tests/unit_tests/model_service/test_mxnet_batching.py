@@ -0,0 +1,62 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import json
+import os
+
+import mxnet as mx
+import numpy as np
+
+from mms.context import Context
+from mms.model_service.mxnet_model_service import MXNetBaseService
+
+
+def _export_model(path):
+    data = mx.sym.Variable('data')
+    sym = mx.sym.FullyConnected(data=data, num_hidden=2, name='fc')
+    mod = mx.mod.Module(symbol=sym, data_names=('data',), label_names=None)
+    mod.bind(data_shapes=[('data', (1, 3))], for_training=False)
+    mod.init_params(mx.init.Uniform())
+    arg_params, aux_params = mod.get_params()
+    mx.model.save_checkpoint(os.path.join(path, 'test'), 0, sym, arg_params, aux_params)
+
+    with open(os.path.join(path, 'signature.json'), 'w') as sig:
+        json.dump({
+            "input_type": "application/json",
+            "inputs": [{'data_name': 'data', 'data_shape': [0, 3]}],
+            "output_type": "application/json",
+            "outputs": [{'data_name': 'fc_output', 'data_shape': [0, 2]}]
+        }, sig)
+
+    return {
+        "Model": {
+            "Symbol": "test-symbol.json",
+            "Parameters": "test-0000.params",
+            "Signature": "signature.json",
+            "Model-Name": "test",
+        }
+    }
+
+
+def test_batch_inference(tmpdir):
+    path = str(tmpdir)
+    manifest = _export_model(path)
+    service = MXNetBaseService('test', path, manifest)
+    context = Context('test', path, manifest, 4, None, '1.0')
+    service.initialize(context)
+
+    requests = [{'data': json.dumps([[float(i), 1.0, -1.0]]).encode('utf-8')} for i in range(3)]
+    single = [service.handle([request], context)[0] for request in requests]
+    batch = service.handle(requests, context)
+
+    assert service.mx_model.data_shapes[0].shape == (4, 3)
+    assert len(batch) == len(requests)
+    for expected, actual in zip(single, batch):
+        assert np.allclose(expected, actual)
@@ -15,6 +15,7 @@ sys.path.append(curr_path + '/../../..')
 
 import unittest
 import mxnet as mx
+import numpy as np
 import utils.mxnet.ndarray as ndarray
 
 class TestMXNetNDArrayUtils(unittest.TestCase):
@@ -25,5 +26,16 @@ class TestMXNetNDArrayUtils(unittest.TestCase):
         output = ndarray.top_probability(data, labels, top=top)
         assert len(output) == top, "top_probability method failed."
 
+    def test_top_probabilities(self):
+        labels = ['class%d' % i for i in range(100)]
+        data = mx.nd.random.uniform(0, 1, shape=(8, 100, 1, 1))
+        output = ndarray.top_probabilities(data, labels, top=5)
+        expected = np.argsort(-data.asnumpy().reshape((8, 100)), axis=1)[:, :5]
+        assert len(output) == 8, "top_probabilities method failed."
+        for row, classes in zip(output, expected):
+            assert [p['class'] for p in row] == [labels[i] for i in classes]
+        assert ndarray.top_probability(data, labels, top=5) == output[0]
+
     def runTest(self):
         self.test_top_prob()
+        self.test_top_probabilities()
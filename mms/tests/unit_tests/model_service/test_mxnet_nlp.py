@@ -48,4 +48,15 @@ class TestMXNetNLPUtils(unittest.TestCase):
             assert databatch.data[0].shape[1] in buckets, "pad_sentence failed. Padded sentence has length %d." \
                                                           % (databatch.data[0].shape[1])
 
-
+    def test_pad_batch(self):
+        buckets = [10, 20, 30, 40, 50, 60]
+        sentences = [[1, 2, 3], [4] * 12, []]
+        padded, bucket = nlp.pad_batch(sentences, buckets)
+        assert bucket == 20, "pad_batch failed. Bucket %d instead of 20." % bucket
+        assert padded.shape == (3, 20), "pad_batch failed. Padded shape %s." % (padded.shape,)
+        assert list(padded[0][:4]) == [1, 2, 3, -1]
+        assert list(padded[1][11:13]) == [4, -1]
+        assert (padded[2] == -1).all()
+
+        padded, bucket = nlp.pad_batch([[1] * 70], buckets, layout='TN')
+        assert bucket == 70 and padded.shape == (70, 1), "pad_batch failed for overlong sentence."
@@ -21,6 +21,7 @@ import pytest
 from mms.model_loader import LegacyModelLoader
 from mms.model_loader import MmsModelLoader
 from mms.model_loader import ModelLoaderFactory
+from mms.model_loader import evict_model_dir
 from mms.model_service.model_service import SingleNodeService
 
 
@@ -132,3 +133,35 @@ class TestLoadModels:
         model_loader = ModelLoaderFactory.get_model_loader(os.path.abspath('mms/unit_tests/test_utils/'))
         with pytest.raises(ValueError, match=r"Expected only one class .*"):
             model_loader.load(self.model_name, self.model_dir, handler, 0, 1)
+
+    def test_unload_model(self, patches):
+        patches.mock_open.side_effect = [mock.mock_open(read_data=self.mock_manifest).return_value]
+        patches.os_path.return_value = True
+        model_dir = os.path.abspath('mms/tests/unit_tests/test_utils/')
+        handler = 'dummy_func_model_service:infer'
+        model_loader = ModelLoaderFactory.get_model_loader(model_dir)
+        model_loader.load(self.model_name, model_dir, handler, 0, 1)
+        assert 'dummy_func_model_service' in sys.modules
+
+        model_loader.unload()
+
+        assert 'dummy_func_model_service' not in sys.modules
+
+
+def test_import_handler_module_after_swap(tmpdir):
+    dirs = []
+    for version in ("1", "2"):
+        model_dir = tmpdir.mkdir("v" + version)
+        model_dir.join("swap_handler.py").write("import swap_helper\n\ndef handle(data, context):\n"
+                                                "    return swap_helper.VERSION\n")
+        model_dir.join("swap_helper.py").write("VERSION = '{}'\n".format(version))
+        dirs.append(str(model_dir))
+
+    v1 = MmsModelLoader._import_handler_module("swap_handler", dirs[0])
+    v2 = MmsModelLoader._import_handler_module("swap_handler", dirs[1])
+
+    assert v1.handle(None, None) == "1"
+    assert v2.handle(None, None) == "2"
+    assert dirs[0] not in sys.path
+    assert sys.modules["swap_helper"].__file__.startswith(dirs[1])
+    evict_model_dir(dirs[1])
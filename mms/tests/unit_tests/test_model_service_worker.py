@@ -151,6 +151,52 @@ class TestLoadModel:
             model_service_worker.load_model(data)
 
 
+# noinspection PyClassHasNoInit
+class TestSwapModel:
+    data = {'modelPath': b'mpath-v2', 'modelName': b'name', 'handler': b'handled'}
+
+    @pytest.fixture()
+    def patches(self, mocker):
+        Patches = namedtuple('Patches', ['loader'])
+        patches = Patches(mocker.patch('mms.model_service_worker.ModelLoaderFactory'))
+        return patches
+
+    def test_swap_model(self, patches, model_service_worker):
+        previous_loader = Mock()
+        model_service_worker.model_loader = previous_loader
+        new_service = Mock()
+        patches.loader.get_model_loader.return_value.load.return_value = new_service
+
+        result, code = model_service_worker.swap_model(self.data)
+
+        assert code == 200
+        assert result.startswith("swapped model name. [PID]:")
+        assert model_service_worker.service is new_service
+        new_service.warmup.assert_called_once()
+        previous_loader.unload.assert_called_once()
+
+    def test_swap_same_model(self, patches, model_service_worker):
+        data = dict(self.data, modelPath=b'mpath')
+
+        _, code = model_service_worker.swap_model(data)
+
+        assert code == 200
+        patches.loader.get_model_loader.assert_not_called()
+
+    def test_swap_failure_keeps_current_model(self, patches, model_service_worker):
+        previous_loader = Mock()
+        model_service_worker.model_loader = previous_loader
+        service = model_service_worker.service
+        patches.loader.get_model_loader.return_value.load.side_effect = ValueError("broken")
+
+        result, code = model_service_worker.swap_model(self.data)
+
+        assert code == 500
+        assert "broken" in result
+        assert model_service_worker.service is service
+        previous_loader.unload.assert_not_called()
+
+
 # noinspection PyClassHasNoInit
 class TestHandleConnection:
     data = {'modelPath': b'mpath', 'modelName': b'name', 'handler': b'handled'}
@@ -178,3 +224,16 @@ class TestHandleConnection:
             model_service_worker.handle_connection(cl_socket)
 
         cl_socket.send.assert_called()
+
+    def test_handle_connection_swap(self, patches, model_service_worker):
+        patches.retrieve_msg.side_effect = [(b"L", ""), (b"L", ""), (b"U", "")]
+        model_service_worker.load_model = Mock(return_value=("", 200))
+        model_service_worker.swap_model = Mock(return_value=("", 200))
+        model_service_worker._remap_io = Mock()
+        cl_socket = Mock()
+        with pytest.raises(ValueError, match=r"Received unknown command.*"):
+            model_service_worker.handle_connection(cl_socket)
+
+        model_service_worker.load_model.assert_called_once()
+        model_service_worker.swap_model.assert_called_once()
+        model_service_worker._remap_io.assert_called_once()
@@ -0,0 +1,75 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Model output serialization tests
+"""
+
+import json
+from io import BytesIO
+
+import numpy as np
+
+import mms.protocol.otf_message_handler as codec
+from mms.context import Context, RequestProcessor
+from mms.protocol import serializer
+
+
+def test_accepted_types():
+    assert serializer.accepted_types(None) == []
+    assert serializer.accepted_types("application/json;q=0.5, application/x-npy") == \
+        ["application/x-npy", "application/json"]
+    assert serializer.accepted_types("text/plain;q=0, */*") == ["*/*"]
+
+
+def test_compact_json():
+    body, content_type, headers = serializer.serialize({"a": [1, 2], "b": np.float32(0.5)})
+
+    assert body == b'{"a":[1,2],"b":0.5}'
+    assert content_type == "application/json"
+    assert headers == {}
+
+
+def test_array_as_json():
+    body, content_type, _ = serializer.serialize(np.arange(4).reshape((2, 2)), "application/json")
+
+    assert json.loads(body.decode("utf-8")) == [[0, 1], [2, 3]]
+    assert content_type == "application/json"
+
+
+def test_array_as_npy():
+    array = np.random.rand(3, 4).astype(np.float32)
+    body, content_type, _ = serializer.serialize(array, "application/x-npy, application/json;q=0.9")
+
+    assert content_type == "application/x-npy"
+    np.testing.assert_array_equal(np.load(BytesIO(body)), array)
+
+
+def test_array_as_raw():
+    array = np.arange(6, dtype=">i4").reshape((3, 2))
+    body, content_type, headers = serializer.serialize(array, "application/octet-stream")
+
+    assert content_type == "application/octet-stream"
+    assert headers == {"X-MMS-Dtype": "<i4", "X-MMS-Shape": "3,2"}
+    np.testing.assert_array_equal(np.frombuffer(body, dtype="<i4").reshape((3, 2)), array)
+
+
+def test_predict_response_uses_accept_header():
+    context = Context("model", None, None, 1, None, "1.0")
+    context.request_processor = [RequestProcessor({"Accept": "application/octet-stream"}),
+                                 RequestProcessor({})]
+    array = np.ones((2,), dtype=np.float32)
+
+    msg = codec.create_predict_response([array, array], {0: "a", 1: "b"}, "success", 200, context=context)
+
+    assert context.get_response_content_type(0) == "application/octet-stream"
+    assert context.get_response_headers(0)["X-MMS-Shape"] == "2"
+    assert context.get_response_content_type(1) == "application/json"
+    assert bytes(msg).endswith(b"\x00\x00\x00\x09[1.0,1.0]\xff\xff\xff\xff")
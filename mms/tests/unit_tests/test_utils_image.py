@@ -0,0 +1,90 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Unit tests for the batched image preprocessing in mms.utils.image
+"""
+
+import os
+import time
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mms.utils import image
+
+
+def _encode(width, height, seed, fmt='jpeg'):
+    arr = np.random.RandomState(seed).randint(0, 256, size=(height, width, 3)).astype(np.uint8)
+    output = BytesIO()
+    Image.fromarray(arr, 'RGB').save(output, format=fmt)
+    return output.getvalue()
+
+
+def test_read_batch_matches_decode():
+    bufs = [_encode(64, 48, seed) for seed in range(5)]
+    batch = image.read_batch(bufs, 32, 24)
+
+    assert batch.shape == (5, 3, 24, 32)
+    assert batch.dtype == np.float32
+    for buf, row in zip(bufs, batch):
+        np.testing.assert_array_equal(row, image.decode(buf, 32, 24).transpose((2, 0, 1)))
+
+
+def test_read_batch_normalize():
+    bufs = [_encode(16, 16, seed, fmt='png') for seed in range(3)]
+    mean = [120.0, 110.0, 100.0]
+    std = [50.0, 60.0, 70.0]
+    batch = image.read_batch(bufs, 16, 16, mean=mean, std=std, dim_order='NHWC')
+
+    raw = image.read_batch(bufs, 16, 16, dim_order='NHWC')
+    np.testing.assert_allclose(batch, (raw - mean) / std, rtol=1e-5)
+
+
+def test_read_batch_out_buffer_and_grayscale():
+    out = np.zeros((4, 1, 8, 8), dtype=np.float32)
+    batch = image.read_batch([_encode(20, 20, 0), _encode(20, 20, 1)], 8, 8, flag=0, out=out)
+
+    assert batch.shape == (2, 1, 8, 8)
+    assert np.shares_memory(batch, out)
+    assert out[:2].any() and not out[2:].any()
+
+
+def test_draft_decode_size():
+    buf = _encode(1024, 768, 0)
+
+    assert image.decode(buf, 100, 80).shape == (80, 100, 3)
+    assert image.decode(buf, 100, 80, draft=False).shape == (80, 100, 3)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_read_batch_after_fork():
+    bufs = [_encode(64, 48, seed) for seed in range(3)]
+    image.read_batch(bufs, 32, 24)
+
+    pid = os.fork()
+    if pid == 0:
+        # A forked worker must not use the parent's pool, whose threads do not exist here.
+        ok = False
+        try:
+            ok = image.read_batch(bufs, 32, 24).shape == (3, 3, 24, 32)
+        finally:
+            os._exit(0 if ok else 1)  # pylint: disable=protected-access
+    for _ in range(100):
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            assert status == 0
+            return
+        time.sleep(0.1)
+    os.kill(pid, 9)
+    os.waitpid(pid, 0)
+    pytest.fail("read_batch hung in a forked process")
@@ -0,0 +1,56 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Import time budget for model_service_worker.py. Every backend worker pays this cost on start.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Budget for "import mms.model_service_worker" in a fresh interpreter, best of N runs.
+WORKER_IMPORT_BUDGET_SECONDS = 0.5
+RUNS = 3
+
+PROBE = """
+import json, sys, time
+start = time.time()
+import mms.model_service_worker
+duration = time.time() - start
+print(json.dumps({"duration": duration, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe():
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    out = subprocess.check_output([sys.executable, "-c", PROBE], cwd=root)
+    return json.loads(out.decode("utf-8").strip().splitlines()[-1])
+
+
+def test_worker_does_not_import_frameworks():
+    modules = _probe()["modules"]
+
+    for framework in ("mxnet", "numpy", "psutil", "mms.model_service.mxnet_model_service"):
+        assert framework not in modules, "{} imported by model_service_worker".format(framework)
+
+
+def test_worker_import_time_budget():
+    best = min(_probe()["duration"] for _ in range(RUNS))
+
+    assert best < WORKER_IMPORT_BUDGET_SECONDS, \
+        "model_service_worker import took {:.3f}s, budget is {}s".format(best, WORKER_IMPORT_BUDGET_SECONDS)
+
+
+def test_lazy_submodules_on_attribute_access():
+    import mms.metrics
+
+    assert mms.metrics.system_metrics.__name__ == "mms.metrics.system_metrics"
@@ -5,7 +5,8 @@ import sys
 import pytest
 
 from mms.context import Context
-from mms.service import Service
+from mms.metrics.metrics_store import MetricsStore
+from mms.service import Service, WARMUP_METRIC
 from mms.service import emit_metrics
 
 logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.INFO)
@@ -53,3 +54,53 @@ class TestEmitMetrics:
         metrics = {'test_emit_metrics': True}
         emit_metrics(metrics)
         assert "[METRICS]" in caplog.text
+
+
+# noinspection PyClassHasNoInit
+class TestWarmup:
+
+    model_name = 'testmodel'
+
+    @pytest.fixture()
+    def service(self, mocker, tmpdir):
+        tmpdir.join("sample.txt").write("warm")
+        manifest = {"model": {"warmup": {"inputs": [{"file": "sample.txt", "contentType": "text/plain"}],
+                                         "count": 2, "batchSizes": [1, 4]}}}
+        service = object.__new__(Service)
+        service._entry_point = mocker.MagicMock(side_effect=lambda data, context: ['warm'] * len(data))
+        service._context = Context(self.model_name, str(tmpdir), manifest, 1, 0, '1.0')
+        service._context.metrics = MetricsStore("load", self.model_name)
+        return service
+
+    def test_warmup_runs_declared_batches(self, service):
+        timings = service.warmup()
+
+        assert [size for size, _ in timings] == [1, 1, 4, 4]
+        assert service._entry_point.call_count == 4
+        data = service._entry_point.call_args[0][0]
+        assert data == [{"data": "warm"}] * 4
+
+    def test_warmup_restores_load_context(self, service):
+        metrics = service.context.metrics
+        service.warmup()
+
+        assert service.context.metrics is metrics
+        assert service.context.request_ids is None
+        assert service.context.request_processor is None
+        assert [m.name for m in metrics.store] == [WARMUP_METRIC]
+
+    def test_warmup_missing_file(self, service):
+        service.context.manifest["model"]["warmup"]["inputs"][0]["file"] = "missing.txt"
+        with pytest.raises(IOError):
+            service.warmup()
+
+    def test_no_warmup_section(self, service):
+        service._context = Context(self.model_name, "", {"model": {"handler": "h"}}, 1, 0, '1.0')
+
+        assert service.warmup() == []
+        service._entry_point.assert_not_called()
+
+    def test_legacy_manifest(self, service):
+        service._context = Context(self.model_name, "", "testmanifest", 1, 0, '1.0')
+
+        assert service.warmup() == []
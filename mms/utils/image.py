@@ -0,0 +1,142 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Batched image preprocessing. Images of a batch are decoded, resized and normalized on a
+thread pool (PIL releases the GIL while decoding and resizing) straight into a preallocated
+float32 buffer.
+"""
+
+import multiprocessing
+import os
+import threading
+from io import BytesIO
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+from PIL import Image
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _pool_pid, _pool_lock  # pylint: disable=global-statement
+    if _pool_pid != os.getpid():
+        # In a worker forked from a preloaded process, the threads of the parent's pool, and whoever
+        # held the lock, do not exist. Each process creates its own pool.
+        _pool_lock = threading.Lock()
+        _pool = None
+        _pool_pid = os.getpid()
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPool(multiprocessing.cpu_count())
+        return _pool
+
+
+def decode(buf, width, height, flag=1, draft=True, resample=Image.BILINEAR):
+    """Decode an image and resize it to width x height.
+
+    Parameters
+    ----------
+    buf : bytes
+        Encoded image.
+    width : int
+        Output width in pixels.
+    height : int
+        Output height in pixels.
+    flag : {0, 1}, default 1
+        1 for three channel RGB output. 0 for grayscale output.
+    draft : bool, default True
+        Let the JPEG decoder downscale by a power of two while decoding, as long as the
+        result stays at least width x height. Other formats are always fully decoded.
+    resample : int
+        PIL resampling filter.
+
+    Returns
+    -------
+    numpy.ndarray
+        uint8 image with shape (height, width, channels).
+    """
+    mode = 'RGB' if flag == 1 else 'L'
+    img = Image.open(BytesIO(buf))
+    if draft:
+        img.draft(mode, (width, height))
+    if img.mode != mode:
+        img = img.convert(mode)
+    if img.size != (width, height):
+        img = img.resize((width, height), resample)
+    arr = np.asarray(img, dtype=np.uint8)
+    return arr.reshape((height, width, -1))
+
+
+def read_batch(bufs, width, height, flag=1, mean=None, std=None, dim_order='NCHW', out=None,
+               draft=True, resample=Image.BILINEAR):
+    """Decode, resize and normalize a batch of images in parallel.
+
+    Parameters
+    ----------
+    bufs : list of bytes
+        Encoded images.
+    width : int
+        Output width in pixels.
+    height : int
+        Output height in pixels.
+    flag : {0, 1}, default 1
+        1 for three channel RGB output. 0 for grayscale output.
+    mean : sequence of float, optional
+        Per channel mean to be subtracted.
+    std : sequence of float, optional
+        Per channel standard deviation to be divided.
+    dim_order : str
+        Output dimension order. Valid values are 'NCHW' and 'NHWC'.
+    out : numpy.ndarray, optional
+        float32 output buffer with at least len(bufs) rows. Use `None` for automatic
+        allocation.
+    draft : bool, default True
+        Downscale JPEG images while decoding, see `decode`.
+    resample : int
+        PIL resampling filter.
+
+    Returns
+    -------
+    numpy.ndarray
+        float32 array with a row per image in dim_order.
+    """
+    assert dim_order in ('NCHW', 'NHWC'), "dim_order must be 'NCHW' or 'NHWC'."
+    channels = 3 if flag == 1 else 1
+    if dim_order == 'NCHW':
+        shape = (len(bufs), channels, height, width)
+    else:
+        shape = (len(bufs), height, width, channels)
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    else:
+        assert out.dtype == np.float32 and out.shape[1:] == shape[1:] and len(out) >= len(bufs), \
+            "out must be a float32 array of shape %s." % str(shape)
+    mean = None if mean is None else np.asarray(mean, dtype=np.float32).reshape(channels)
+    std = None if std is None else np.asarray(std, dtype=np.float32).reshape(channels)
+
+    def process(idx):
+        arr = decode(bufs[idx], width, height, flag, draft, resample)
+        # Channels last while normalizing, so mean and std broadcast over HWC.
+        row = out[idx].transpose((1, 2, 0)) if dim_order == 'NCHW' else out[idx]
+        row[...] = arr
+        if mean is not None:
+            row -= mean
+        if std is not None:
+            row /= std
+
+    if len(bufs) == 1:
+        process(0)
+    else:
+        _get_pool().map(process, range(len(bufs)))
+    return out[:len(bufs)]
@@ -0,0 +1,39 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+"""
+Packages whose submodules are imported on first attribute access
+"""
+import importlib
+import sys
+import types
+
+
+class LazyPackage(types.ModuleType):
+    """
+    Replacement of a package in sys.modules, which imports the given submodules when they are
+    first accessed as attributes. Module level __getattr__ (PEP 562) needs Python 3.7.
+    """
+
+    def __init__(self, module, submodules):
+        super(LazyPackage, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        self.__dict__["_lazy_submodules"] = frozenset(submodules)
+        # Python 2 clears the globals of a module when it is freed, keep the original alive.
+        self.__dict__["_module"] = module
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get("_lazy_submodules", ()):
+            return importlib.import_module("." + name, self.__name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(self.__name__, name))
+
+
+def lazy_submodules(name, submodules):
+    """Import the submodules of the package `name` on first access. Call at the end of its __init__."""
+    sys.modules[name] = LazyPackage(sys.modules[name], submodules)
@@ -30,12 +30,30 @@ def top_probability(data, labels, top=5):
     List
         List of probability: class pairs in sorted order
     """
-    dim = len(data.shape)
-    if dim > 2:
-        data = mx.nd.array(
-            np.squeeze(data.asnumpy(), axis=tuple(range(dim)[2:])))
-    sorted_prob = mx.nd.argsort(data[0], is_ascend=False)
-    # pylint: disable=deprecated-lambda
-    top_prob = map(lambda x: int(x.asscalar()), sorted_prob[0:top])
-    return [{'probability': float(data[0, i].asscalar()), 'class': labels[i]}
-            for i in top_prob]
+    return top_probabilities(data[0:1], labels, top)[0]
+
+
+def top_probabilities(data, labels, top=5):
+    """Get top probability predictions for every sample of a batch. The top classes of all
+    samples are selected with one topk operation and copied from the device at once.
+
+    Parameters
+    ----------
+    data : NDArray
+        Data to be predicted, one row per sample
+    labels : List
+        List of class labels
+    top : int
+        Number of classes per sample
+
+    Returns
+    -------
+    List
+        List of probability: class pairs in sorted order, one list per sample
+    """
+    data = data.reshape((data.shape[0], -1))
+    top = min(top, data.shape[1])
+    prob, classes = mx.nd.topk(data, axis=1, k=top, ret_typ='both', dtype='float32')
+    result = mx.nd.stack(prob.astype('float32', copy=False), classes).asnumpy()
+    return [[{'probability': float(p), 'class': labels[int(c)]} for p, c in zip(row_prob, row_classes)]
+            for row_prob, row_classes in zip(result[0], result[1])]
@@ -101,3 +101,43 @@ def pad_sentence(sentence, buckets, invalid_label=-1, data_name='data', layout='
                                name=data_name,
                                shape=shape,
                                layout=layout)])
+
+
+def pad_batch(sentences, buckets, invalid_label=-1, dtype='float32', layout='NT'):
+    """Pad a batch of sentences to the closest bucket length of the longest one.
+
+        All sentences are copied into the padded array with a single masked assignment,
+        instead of padding them one at a time.
+
+        Parameters
+        ----------
+        sentences : list of list of int
+            Encoded sentences of the batch.
+        buckets : list of int
+            Sorted size of the data buckets. Batches longer than the largest bucket
+            are padded to their longest sentence.
+        invalid_label : int, optional
+            Index for invalid token, like <end-of-sentence>.
+        dtype : str, optional
+            Data type of the padded array.
+        layout : str, optional
+            Format of data. 'NT' means (batch_size, length)
+            and 'TN' means (length, batch_size).
+
+        Returns
+        -------
+        result : tuple of (np.ndarray, int)
+            Padded batch and its bucket length.
+        """
+    lengths = np.fromiter((len(s) for s in sentences), dtype=np.int64, count=len(sentences))
+    longest = int(lengths.max()) if len(sentences) else 0
+    buck = bisect.bisect_left(buckets, longest)
+    bucket = buckets[buck] if buck < len(buckets) else longest
+
+    buff = np.full((len(sentences), bucket), invalid_label, dtype=dtype)
+    if longest:
+        mask = np.arange(bucket) < lengths[:, None]
+        buff[mask] = np.concatenate([np.asarray(s, dtype=dtype) for s in sentences if len(s)])
+    if layout == 'TN':
+        buff = buff.T
+    return buff, bucket
@@ -104,5 +104,12 @@ class ArgParser(object):
                                         'model-archiver tool on a model with ".onnx" extension, the tool will try and\n'
                                         'convert ".onnx" model into an Multi model.')
 
+        parser_export.add_argument('--warmup-config',
+                                   required=False,
+                                   type=str,
+                                   default=None,
+                                   help='Path to a JSON file describing the warmup requests MMS runs when the model\n'
+                                        'is loaded, before the worker accepts traffic. Input files are relative to\n'
+                                        '--model-path and must be part of the model archive.')
 
         return parser_export
@@ -18,11 +18,12 @@ class Model(object):
     as the entry point into the service code through the handler property
     """
 
-    def __init__(self, model_name, handler, description=None, model_version=None, extensions=None):
+    def __init__(self, model_name, handler, description=None, model_version=None, extensions=None, warmup=None):
         self.model_name = model_name
         self.description = description
         self.model_version = model_version
         self.extensions = extensions
+        self.warmup = warmup
         self.handler = handler
         self.model_dict = self.__to_dict__()
 
@@ -42,6 +43,9 @@ class Model(object):
         if self.extensions is not None:
             model_dict['extensions'] = self.extensions
 
+        if self.warmup is not None:
+            model_dict['warmup'] = self.warmup
+
         return model_dict
 
     def __str__(self):
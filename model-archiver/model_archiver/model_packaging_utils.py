@@ -200,9 +200,31 @@ class ModelExportUtils(object):
 
     @staticmethod
     def generate_model(modelargs):
-        model = Model(model_name=modelargs.model_name, handler=modelargs.handler)
+        warmup = ModelExportUtils.load_warmup_config(getattr(modelargs, 'warmup_config', None))
+        model = Model(model_name=modelargs.model_name, handler=modelargs.handler, warmup=warmup)
         return model
 
+    @staticmethod
+    def load_warmup_config(warmup_config):
+        """
+        Function to read the warmup section of the manifest from a JSON file
+        :param warmup_config:
+        :return:
+        """
+        if warmup_config is None:
+            return None
+
+        try:
+            with open(warmup_config) as f:
+                warmup = json.load(f)
+        except (IOError, ValueError) as e:
+            raise ModelArchiverError("Invalid warmup config {}: {}".format(warmup_config, e))
+
+        if not isinstance(warmup, dict) or not warmup.get('inputs'):
+            raise ModelArchiverError("Warmup config {} must declare a list of \"inputs\"".format(warmup_config))
+
+        return warmup
+
     @staticmethod
     def generate_manifest_json(args):
         """
@@ -242,3 +242,33 @@ class TestExportModelUtils:
 
         def test_with_return_true(self):
             assert ModelExportUtils.directory_filter('my-model', self.unwanted_dirs) is True
+
+    # noinspection PyClassHasNoInit
+    class TestWarmupConfig:
+
+        warmup = {"inputs": [{"file": "kitten.jpg", "contentType": "image/jpeg"}], "batchSizes": [1, 8]}
+
+        def test_without_warmup_config(self):
+            assert ModelExportUtils.load_warmup_config(None) is None
+
+        def test_warmup_in_manifest(self, tmpdir):
+            config = tmpdir.join("warmup.json")
+            config.write(json.dumps(self.warmup))
+            Namespace = namedtuple('Namespace', ['model_name', 'handler', 'warmup_config'])
+            model = ModelExportUtils.generate_model(Namespace('some-model', 'service:handle', str(config)))
+
+            assert model.model_dict['warmup'] == self.warmup
+
+        def test_warmup_without_inputs(self, tmpdir):
+            config = tmpdir.join("warmup.json")
+            config.write(json.dumps({"count": 2}))
+
+            with pytest.raises(ModelArchiverError, match=r"inputs"):
+                ModelExportUtils.load_warmup_config(str(config))
+
+        def test_invalid_warmup_config(self, tmpdir):
+            config = tmpdir.join("warmup.json")
+            config.write("{")
+
+            with pytest.raises(ModelArchiverError):
+                ModelExportUtils.load_warmup_config(str(config))
@@ -11,11 +11,12 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import time
 from enum import Enum
 from statistics import mean
 
 import psutil
-from psutil import NoSuchProcess, ZombieProcess
+from psutil import AccessDenied, NoSuchProcess, ZombieProcess
 
 
 class ProcessType(Enum):
@@ -52,6 +53,23 @@ process_metrics = {
     'threads': lambda p: p.get('num_threads', 0)
 }
 
+# psutil.Process methods needed by each process metric
+process_attrs = {
+    'cpu_percent': 'cpu_percent',
+    'cpu_user_time': 'cpu_times',
+    'cpu_system_time': 'cpu_times',
+    'cpu_iowait_time': 'cpu_times',
+    'memory_percent': 'memory_percent',
+    'memory_rss': 'memory_info',
+    'memory_vms': 'memory_info',
+    'io_read_count': 'io_counters',
+    'io_write_count': 'io_counters',
+    'io_read_bytes': 'io_counters',
+    'io_write_bytes': 'io_counters',
+    'file_descriptors': 'num_fds',
+    'threads': 'num_threads'
+}
+
 system_metrics = {
     'system_disk_used': None,
     'system_memory_percent': None,
@@ -84,79 +102,126 @@ for metric in list(process_metrics):
             for op in list(operators):
                 AVAILABLE_METRICS.append('{}_{}_{}'.format(op, PNAME, metric))
 
-children = set()
 
+def is_worker(cmdline):
+    return len(cmdline) >= 2 and WORKER_NAME in cmdline[1]
 
-def get_metrics(server_process, child_processes, logger):
-    """ Get Server processes specific metrics
-    """
-    result = {}
-    children.update(child_processes)
-    logger.debug("children : {0}".format(",".join([str(c.pid) for c in children])))
-
-    def update_metric(metric_name, proc_type, stats):
-        stats = list(filter(lambda x: isinstance(x, (float, int)), stats))
-        stats = stats if len(stats) else [0]
-
-        if proc_type == ProcessType.WORKER:
-            proc_name = 'workers'
-        elif proc_type == ProcessType.FRONTEND:
-            proc_name = 'frontend'
-            result[proc_name + '_' + metric_name] = stats[0]
-            return
-        else:
-            proc_name = 'all'
 
-        for op_name in operators:
-            result['{}_{}_{}'.format(op_name, proc_name, metric_name)] = operators[op_name](stats)
-
-    processes_stats = []
-    reclaimed_pids = []
+class ProcessSampler():
+    """
+    Samples the metrics of the server process and its workers. The psutil Process handles are
+    kept across samples, the children are only enumerated every children_interval seconds or
+    when a worker exits, and only the psutil methods needed for the requested metrics are
+    called, in one oneshot() per process.
+    The psutil attributes of each worker of the last sample are kept in worker_stats by pid.
+    """
 
-    try:
-        # as_dict() gets all stats in one shot
-        processes_stats.append({'type': ProcessType.FRONTEND, 'stats': server_process.as_dict()})
-    except:
-        pass
-    for child in children:
+    def __init__(self, server_process, metrics=None, children_interval=5.0):
+        self.server_process = server_process
+        self.metrics = list(metrics or AVAILABLE_METRICS)
+        self.children_interval = children_interval
+        self.workers = {}
+        self.worker_stats = {}
+        self.other_pids = set()
+        self.last_scan = None
+
+        names = set()
+        for metric in self.metrics:
+            for name in process_metrics:
+                if metric.endswith('_' + name):
+                    names.add(name)
+        self.attrs = sorted(set(process_attrs[name] for name in names))
+        if 'orphans' in self.metrics:
+            self.attrs.append('ppid')
+        self.process_metrics = sorted(names)
+
+    def scan_children(self):
+        """
+        Cache the handles of new workers and drop the exited ones. Workers which are no longer
+        descendants of the server, such as orphans, are kept while they run.
+        """
+        pids = set()
+        for child in self.server_process.children(recursive=True):
+            pids.add(child.pid)
+            if child.pid in self.workers or child.pid in self.other_pids:
+                continue
+            try:
+                if is_worker(child.cmdline()):
+                    self.workers[child.pid] = child
+                else:
+                    self.other_pids.add(child.pid)
+            except (NoSuchProcess, ZombieProcess, AccessDenied):
+                pass
+        for pid in set(self.workers) - pids:
+            worker = self.workers[pid]
+            try:
+                # is_running also detects a reused pid
+                if worker.is_running() and is_worker(worker.cmdline()):
+                    continue
+            except (NoSuchProcess, ZombieProcess, AccessDenied):
+                pass
+            del self.workers[pid]
+        self.other_pids &= pids
+        self.last_scan = time.monotonic()
+
+    def process_stats(self, process):
+        """The psutil attributes of a process read in one shot"""
+        stats = {}
+        with process.oneshot():
+            if process.status() == psutil.STATUS_ZOMBIE:
+                raise ZombieProcess(process.pid)
+            for attr in self.attrs:
+                try:
+                    stats[attr] = getattr(process, attr)()
+                except AccessDenied:
+                    pass
+        return stats
+
+    def sample(self):
+        """
+        Sample the requested metrics.
+        :return: dict of metric name to value
+        """
+        if self.last_scan is None or time.monotonic() - self.last_scan >= self.children_interval:
+            self.scan_children()
+
+        self.worker_stats = {}
+        for pid, worker in list(self.workers.items()):
+            try:
+                self.worker_stats[pid] = self.process_stats(worker)
+            except (NoSuchProcess, ZombieProcess):
+                del self.workers[pid]
+                self.last_scan = None
+        worker_stats = list(self.worker_stats.values())
         try:
-            child_cmdline = child.cmdline()
-            if psutil.pid_exists(child.pid) and len(child_cmdline) >= 2 and WORKER_NAME in child_cmdline[1]:
-                processes_stats.append({'type': ProcessType.WORKER, 'stats': child.as_dict()})
-            else:
-                reclaimed_pids.append(child)
-                logger.debug('child {0} no longer available'.format(child.pid))
+            server_stats = [self.process_stats(self.server_process)]
         except (NoSuchProcess, ZombieProcess):
-            reclaimed_pids.append(child)
-            logger.debug('child {0} no longer available'.format(child.pid))
-
-    for p in reclaimed_pids:
-        children.remove(p)
-
-    ### PROCESS METRICS ###
-    worker_stats = list(map(lambda x: x['stats'], \
-                            filter(lambda x: x['type'] == ProcessType.WORKER, processes_stats)))
-    server_stats = list(map(lambda x: x['stats'], \
-                            filter(lambda x: x['type'] == ProcessType.FRONTEND, processes_stats)))
-    all_stats = list(map(lambda x: x['stats'], processes_stats))
-
-    for k in process_metrics:
-        update_metric(k, ProcessType.WORKER, list(map(process_metrics[k], worker_stats)))
-        update_metric(k, ProcessType.ALL, list(map(process_metrics[k], all_stats)))
-        update_metric(k, ProcessType.FRONTEND, list(map(process_metrics[k], server_stats)))
-
-    # Total processes
-    result['total_processes'] = len(worker_stats) + 1
-    result['total_workers'] = max(len(worker_stats) - 1, 0)
-    result['orphans'] = len(list(filter(lambda p: p['ppid'] == 1, worker_stats)))
-
-    ### SYSTEM METRICS ###
-    result['system_disk_used'] = psutil.disk_usage('/').used
-    result['system_memory_percent'] = psutil.virtual_memory().percent
-    system_disk_io_counters = psutil.disk_io_counters()
-    result['system_read_count'] = system_disk_io_counters.read_count
-    result['system_write_count'] = system_disk_io_counters.write_count
-    result['system_read_bytes'] = system_disk_io_counters.read_bytes
-    result['system_write_bytes'] = system_disk_io_counters.write_bytes
-
-    return result
+            server_stats = []
+
+        result = {}
+        for name in self.process_metrics:
+            func = process_metrics[name]
+            worker_values = [func(s) for s in worker_stats] or [0]
+            all_values = [func(s) for s in server_stats + worker_stats] or [0]
+            for op_name, op in operators.items():
+                result['{}_workers_{}'.format(op_name, name)] = op(worker_values)
+                result['{}_all_{}'.format(op_name, name)] = op(all_values)
+            result['frontend_{}'.format(name)] = func(server_stats[0]) if server_stats else 0
+
+        result['total_processes'] = len(worker_stats) + 1
+        result['total_workers'] = max(len(worker_stats) - 1, 0)
+        if 'orphans' in self.metrics:
+            result['orphans'] = len([s for s in worker_stats if s.get('ppid') == 1])
+
+        if 'system_disk_used' in self.metrics:
+            result['system_disk_used'] = psutil.disk_usage('/').used
+        if 'system_memory_percent' in self.metrics:
+            result['system_memory_percent'] = psutil.virtual_memory().percent
+        if any(m.startswith('system_') and m.endswith(('_count', '_bytes')) for m in self.metrics):
+            system_disk_io_counters = psutil.disk_io_counters()
+            result['system_read_count'] = system_disk_io_counters.read_count
+            result['system_write_count'] = system_disk_io_counters.write_count
+            result['system_read_bytes'] = system_disk_io_counters.read_bytes
+            result['system_write_bytes'] = system_disk_io_counters.write_bytes
+
+        return {metric: result.get(metric) for metric in self.metrics}
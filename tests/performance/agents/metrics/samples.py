@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+""" Binary file format of the metric samples written by the metrics collector"""
+
+# Copyright 2020 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# The file starts with MAGIC, the length of the JSON header as a little-endian uint32 and the
+# JSON header {"columns": [...]}. It is followed by one record per sample of a little-endian
+# float64 per column; the first column is the unix timestamp and missing values are NaN.
+# The records can be loaded as a 2-D array with
+#     numpy.frombuffer(data, dtype='<f8', offset=header_size).reshape(-1, len(columns))
+
+import csv
+import json
+import math
+import struct
+
+MAGIC = b'MMSSMPL1'
+
+
+class SampleWriter():
+    """Append metric samples to a file"""
+
+    def __init__(self, path, metrics):
+        self.columns = ['ts'] + list(metrics)
+        self.record = struct.Struct('<{}d'.format(len(self.columns)))
+        self.file = open(path, 'wb')
+        header = json.dumps({'columns': self.columns}).encode('utf-8')
+        self.file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        self.file.flush()
+
+    def write(self, ts, sample):
+        """Write a sample, a dict of metric name to value"""
+        values = [ts]
+        for metric in self.columns[1:]:
+            value = sample.get(metric)
+            values.append(float('nan') if value is None else value)
+        # Flushed every record, as the collector is stopped by killing it
+        self.file.write(self.record.pack(*values))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+def read_samples(path):
+    """
+    Read a samples file.
+    :return: list of column names and list of records, each a tuple of floats
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("{} is not a metric samples file.".format(path))
+    offset = len(MAGIC) + 4
+    header_size = struct.unpack_from('<I', data, len(MAGIC))[0]
+    columns = json.loads(data[offset:offset + header_size].decode('utf-8'))['columns']
+    record = struct.Struct('<{}d'.format(len(columns)))
+    body = data[offset + header_size:]
+    # A record may be incomplete if the collector was killed while writing it
+    body = body[:len(body) - len(body) % record.size]
+    return columns, list(record.iter_unpack(body))
+
+
+def to_csv(path, csv_path):
+    """Convert a samples file to CSV, with empty values for missing ones"""
+    columns, records = read_samples(path)
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for values in records:
+            writer.writerow(['' if math.isnan(v) else ('%d' % v if v.is_integer() else repr(v)) for v in values])
@@ -24,16 +24,16 @@ import time
 import gevent
 import psutil
 
-from utils.process import get_process_pid_from_file, get_child_processes, \
-    get_server_processes, get_server_pidfile
-from metrics import AVAILABLE_METRICS, get_metrics
+from utils.process import get_process_pid_from_file, get_server_processes, get_server_pidfile
+from metrics import AVAILABLE_METRICS, ProcessSampler
+from metrics.samples import SampleWriter, to_csv
 import configuration
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.INFO)
 
 TMP_DIR = tempfile.gettempdir()
-METRICS_LOG_FILE = os.path.join(TMP_DIR, "server_metrics_{}.log".format(int(time.time())))
+METRICS_LOG_FILE = os.path.join(TMP_DIR, "server_metrics_{}.bin".format(int(time.time())))
 METRICS_COLLECTOR_PID_FILE = os.path.join(TMP_DIR, "metrics_collector.pid")
 PID_FILE = configuration.get('server', 'pid_file', 'model_server.pid')
 
@@ -95,50 +95,63 @@ def stop_metrics_collector_process():
     stop_process(METRICS_COLLECTOR_PID_FILE)
 
 
-def monitor_processes(server_process, metrics, interval, socket):
-    """ Monitor the metrics of server_process and its child processes
+def monitor_processes(server_process, metrics, interval, socket, output=None):
+    """ Monitor the metrics of server_process and its child processes.
+    Samples are sent to socket as tab separated text and/or written to the output samples file.
     """
-    while True:
-        message = []
-        collected_metrics = get_metrics(server_process, get_child_processes(server_process), logger)
-        metrics_msg = []
-        for metric in metrics:
-            message.append(str(collected_metrics.get(metric, 0)))
-            if collected_metrics.get(metric) is not None:
-                metrics_msg.append("{0} : {1}".format(metric, collected_metrics.get(metric, 0)))
-
-        message = "\t".join(message) + "\t\n"
-        logger.info("%s", " -- ".join(metrics_msg))
-
-        if socket:
-            try:
-                socket.send(message.encode("latin-1"))
-            except BrokenPipeError:
-                logger.info("Stopping monitoring as socket connection is closed.")
-                break
-
-        # TODO - log metrics to a file METRICS_LOG_FILE if METRICS_LOG_FILE is provided
-        gevent.sleep(interval)
-
-
-def start_metric_collection(server_process, metrics, interval, socket):
+    sampler = ProcessSampler(server_process, metrics)
+    writer = SampleWriter(output, metrics) if output else None
+    next_tick = time.time()
+    try:
+        while True:
+            ts = time.time()
+            collected_metrics = sampler.sample()
+            if writer:
+                writer.write(ts, collected_metrics)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s", " -- ".join("{0} : {1}".format(metric, collected_metrics[metric])
+                                               for metric in metrics if collected_metrics.get(metric) is not None))
+
+            if socket:
+                message = "\t".join(str(collected_metrics.get(metric) or 0) for metric in metrics) + "\t\n"
+                try:
+                    socket.send(message.encode("latin-1"))
+                except BrokenPipeError:
+                    logger.info("Stopping monitoring as socket connection is closed.")
+                    break
+
+            # Sleep until the next tick, so that the interval does not drift by the sampling time
+            next_tick += interval
+            delay = next_tick - time.time()
+            if delay < 0:
+                next_tick = time.time()
+                delay = 0
+            gevent.sleep(delay)
+    finally:
+        if writer:
+            writer.close()
+
+
+def start_metric_collection(server_process, metrics, interval, socket, output=None):
     bad_metrics = set(metrics) - set(AVAILABLE_METRICS)
     if bad_metrics:
         raise Exception("Metrics not available for monitoring {}.".format(bad_metrics))
 
     logger.info("Started metric collection for target server processes.....")
-    thread = gevent.spawn(monitor_processes, server_process, metrics, interval, socket)
+    thread = gevent.spawn(monitor_processes, server_process, metrics, interval, socket, output)
     gevent.joinall([thread])
 
 
-def start_metric_collector_process():
+def start_metric_collector_process(interval=MONITOR_INTERVAL, output=METRICS_LOG_FILE):
     """Spawn a metric collection process and keep on monitoring """
 
     check_is_running(METRICS_COLLECTOR_PID_FILE)
     store_metrics_collector_pid()
     server_pid = get_process_pid_from_file(get_server_pidfile(PID_FILE))
     server_process = get_server_processes(server_pid)
-    start_metric_collection(server_process, AVAILABLE_METRICS, MONITOR_INTERVAL, None)
+    logger.info("Writing metric samples to %s.", output)
+    start_metric_collection(server_process, AVAILABLE_METRICS, interval, None, output)
 
 
 if __name__ == "__main__":
@@ -147,10 +160,17 @@ if __name__ == "__main__":
     sub_parse = parser.add_mutually_exclusive_group(required=True)
     sub_parse.add_argument('--start', action='store_true', help='Start the metric-collector')
     sub_parse.add_argument('--stop', action='store_true', help='Stop the metric-collector')
+    sub_parse.add_argument('--to-csv', metavar='SAMPLES_FILE', help='Convert a samples file to CSV and exit')
+    parser.add_argument('--interval', type=float, default=MONITOR_INTERVAL,
+                        help='Sampling interval in seconds, may be less than 1')
+    parser.add_argument('--output', default=None,
+                        help='Samples file to write with --start, or CSV file to write with --to-csv')
 
     args = parser.parse_args()
 
     if args.start:
-        start_metric_collector_process()
+        start_metric_collector_process(args.interval, args.output or METRICS_LOG_FILE)
     elif args.stop:
         stop_metrics_collector_process()
+    elif args.to_csv:
+        to_csv(args.to_csv, args.output or os.path.splitext(args.to_csv)[0] + ".csv")
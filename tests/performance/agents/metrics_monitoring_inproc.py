@@ -25,9 +25,8 @@ from bzt.modules import monitoring
 from bzt.utils import dehumanize_time
 
 import configuration
-from metrics import get_metrics, AVAILABLE_METRICS as AVAILABLE_SERVER_METRICS
-from utils.process import get_process_pid_from_file, get_server_processes, \
-    get_child_processes, get_server_pidfile
+from metrics import ProcessSampler, AVAILABLE_METRICS as AVAILABLE_SERVER_METRICS
+from utils.process import get_process_pid_from_file, get_server_processes, get_server_pidfile
 
 
 PY2 = sys.version_info[0] == 2
@@ -89,11 +88,16 @@ class ServerLocalClient(monitoring.LocalClient):
 class ServerLocalMonitor(monitoring.LocalMonitor):
     """Custom server local monitor"""
 
+    sampler = None
+
     def _calc_resource_stats(self, interval):
         result = super()._calc_resource_stats(interval)
         server_pid = get_process_pid_from_file(get_server_pidfile(PID_FILE))
-        server_process = get_server_processes(server_pid)
-        result.update(get_metrics(server_process, get_child_processes(server_process), self.log))
+        if self.sampler is None or self.sampler.server_process.pid != server_pid:
+            server_process = get_server_processes(server_pid)
+            metrics = [metric for metric in self.metrics if metric in AVAILABLE_SERVER_METRICS]
+            self.sampler = ProcessSampler(server_process, metrics)
+        result.update(self.sampler.sample())
 
         metrics_msg = []
 
@@ -60,7 +60,7 @@ def process_data(sock):
         elif data.startswith('interval'):
             try:
                 global interval
-                interval = int(data.split(":")[1][:-1])
+                interval = float(data.split(":")[1][:-1])
             except Exception:
                 send_message(sock, "In-correct interval data")
         elif data.startswith('metrics'):
@@ -47,14 +47,6 @@ def get_process_pid_from_file(file_path):
     return pid
 
 
-def get_child_processes(process):
-    """Get all running child processes recursively"""
-    child_processes = set()
-    for p in process.children(recursive=True):
-        child_processes.add(p)
-    return child_processes
-
-
 def get_server_processes(server_process_pid):
     """ It caches the main server and child processes at module level.
     Ensure that you call this process so that MMS process
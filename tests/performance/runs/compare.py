@@ -12,18 +12,31 @@
 
 """
 Compare artifacts between runs
+
+The aggregates (median, mean, max and min) of the monitoring metrics of the current run are
+compared with the same aggregates in each of the latest runs on the same environment. Samples
+within a run are autocorrelated, so the unit of comparison is the run: a metric fails when its
+aggregate is outside the run to run variation of the earlier runs and differs from their mean by
+at least the diff_percent of the test yaml.
+Run as a module to bisect the stored runs for the first run with a regression.
 """
-# pylint: disable=redefined-builtin, self-assigning-variable, broad-except
+# pylint: disable=redefined-builtin, self-assigning-variable, broad-except, no-value-for-parameter
 
 
 import csv
 import glob
 import logging
+import pathlib
+import statistics
 import sys
 import os
 
+import click
 import pandas as pd
+from agents import configuration
 from junitparser import TestCase, TestSuite, JUnitXml, Skipped, Error, Failure
+from runs import stats
+from runs.history import open_history
 from runs.taurus import reader as taurus_reader
 from runs.storage import LocalStorage, S3Storage
 
@@ -32,6 +45,12 @@ from utils import Timer, get_sub_dirs
 logger = logging.getLogger(__name__)
 logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.INFO)
 
+BASELINE_RUNS = int(configuration.get('compare', 'baseline_runs', 5))
+ALPHA = float(configuration.get('compare', 'alpha', 0.05))
+AGGREGATES = ["median", "mean", "max", "min"]
+# With fewer baseline runs than this only the diff_percent is checked
+MIN_BASELINE_RUNS = 3
+
 
 class CompareReportGenerator():
 
@@ -49,10 +68,12 @@ class CompareReportGenerator():
         """Driver method to get comparison directory, do the comparison of it with current run directory
         and then store results
         """
-        compare_dir, compare_run_name = self.storage.get_dir_to_compare()
-        if compare_run_name:
-            self.junit_reporter, self.pandas_result = compare_artifacts(self.storage.artifacts_dir, compare_dir,
-                                       self.storage.current_run_name, compare_run_name)
+        compare_runs = self.storage.get_dirs_to_compare(BASELINE_RUNS)
+        if compare_runs:
+            compare_dirs, compare_run_names = zip(*compare_runs)
+            self.junit_reporter, self.pandas_result = compare_artifacts(self.storage.artifacts_dir, compare_dirs,
+                                       self.storage.current_run_name, compare_run_names,
+                                       getattr(self.storage, "history", None))
             self.pandas_result.to_csv(os.path.join(self.artifacts_dir, "comparison_result.csv"))
         else:
             logger.warning("The latest run not found for env.")
@@ -102,6 +123,30 @@ def get_aggregate_val(df, agg_func, col):
     return val
 
 
+def read_run_aggregates(dir, sub_dir):
+    """
+    Get the aggregates of the monitoring metrics of a test suite in a run from its metrics.csv.
+    :return: dict of (metric, aggregate) to value, None if the run has no metrics monitoring log
+    """
+    metrics_file = get_log_file(dir, sub_dir)
+    if metrics_file is None:
+        return None
+    df = pd.read_csv(metrics_file)
+    return {(str(col), agg_func): get_aggregate_val(df, agg_func, col) for col in df for agg_func in AGGREGATES}
+
+
+def get_baseline_aggregates(dirs, run_names, sub_dir, history=None):
+    """
+    Get the aggregates of the monitoring metrics of a test suite in each baseline run which has them,
+    from the run history if given, else from the metrics.csv files.
+    :return: list of dicts of (metric, aggregate) to value
+    """
+    if history is not None:
+        aggregates = history.get_aggregates(run_names, sub_dir)
+        return [aggregates[run_name] for run_name in run_names if run_name in aggregates]
+    return [aggregates for aggregates in (read_run_aggregates(dir, sub_dir) for dir in dirs) if aggregates]
+
+
 def compare_values(val1, val2, diff_percent, run_name1, run_name2):
     """ Compare percentage diff values of val1 and val2 """
     if pd.isna(val1) or pd.isna(val2):
@@ -132,16 +177,67 @@ def compare_values(val1, val2, diff_percent, run_name1, run_name2):
     return diff, pass_fail, msg
 
 
-def compare_artifacts(dir1, dir2, run_name1, run_name2):
-    """Compare artifacts from dir1 with di2 and store results in out_dir"""
+def compare_runs(val1, baseline, diff_percent, run_name1, run_name2, alpha=ALPHA):
+    """
+    Compare an aggregate of a metric in a run with the same aggregate in the baseline runs. The comparison
+    fails when the value is outside the Student t prediction interval of the baseline runs, i.e. the
+    difference is significant at level alpha, and it differs from their mean by at least diff_percent.
+    With fewer than MIN_BASELINE_RUNS baseline runs only the diff_percent is checked.
+    :return: dict with val1, the baseline mean val2, diff, pass_fail, msg, p_value, z_score, ci_low
+             and ci_high
+    """
+    baseline = [val for val in baseline if val is not None and not pd.isna(val)]
+    val2 = statistics.mean(baseline) if baseline else None
+    if val1 is None or pd.isna(val1) or len(baseline) < MIN_BASELINE_RUNS:
+        diff, pass_fail, msg = compare_values(val1, val2, diff_percent, run_name1, run_name2)
+        if pass_fail != "error":
+            msg = "Fewer than {} baseline runs, compared the diff_percent only. {}".format(MIN_BASELINE_RUNS, msg)
+        return {"val1": val1, "val2": val2, "diff": diff, "pass_fail": pass_fail, "msg": msg,
+                "p_value": "NA", "z_score": "NA", "ci_low": "NA", "ci_high": "NA"}
+
+    diff = stats.percent_diff(val1, val2)
+    p_value, (low, high) = stats.prediction_test(val1, baseline, alpha)
+    # Diffs from the bounds of the prediction interval, the range contains 0 when the run is within the
+    # run to run variation of the baseline
+    ci_low, ci_high = sorted([stats.percent_diff(val1, high), stats.percent_diff(val1, low)])
+    # Standardized diff, a rank based effect size of one run against a few runs is degenerate
+    z_score = stats.z_score(val1, baseline)
+
+    if p_value < alpha and abs(diff) >= float(diff_percent):
+        msg = "The diff_percent criteria has failed. The expected diff_percent is '{}' and the diff from the " \
+              "mean of {} baseline runs is '{:.2f}' ({:.2f} to {:.2f} from the bounds of their {:.0%} prediction " \
+              "interval) with p-value {:.3g}, {:.2f} standard deviations from their mean. The '{}' run value is " \
+              "'{}' and '{}' run mean is '{}'.". \
+            format(diff_percent, len(baseline), diff, ci_low, ci_high, 1 - alpha, p_value,
+                   z_score, run_name1, val1, run_name2, val2)
+        pass_fail = "fail"
+    else:
+        pass_fail, msg = "pass", "passed"
+
+    return {"val1": val1, "val2": val2, "diff": diff, "pass_fail": pass_fail, "msg": msg,
+            "p_value": p_value, "z_score": z_score, "ci_low": ci_low, "ci_high": ci_high}
 
-    logger.info("Comparing artifacts from %s with %s", dir1, dir2)
+
+def compare_artifacts(dir1, dir2, run_name1, run_name2, history=None):
+    """
+    Compare artifacts from dir1 with di2 and store results in out_dir.
+    dir2 and run_name2 may be lists of runs, each aggregate is compared with its values in these runs.
+    The baseline aggregates are read from the run history if given, else from the metrics.csv files.
+    """
+    dirs2 = [dir2] if isinstance(dir2, str) else list(dir2)
+    run_names2 = [run_name2] if isinstance(run_name2, str) else list(run_name2)
+    if len(run_names2) > 1:
+        run_name2 = "{} and {} earlier runs".format(run_names2[0], len(run_names2) - 1)
+    else:
+        run_name2 = run_names2[0]
+
+    logger.info("Comparing artifacts from %s with %s", dir1, ", ".join(dirs2))
     sub_dirs_1 = get_sub_dirs(dir1)
 
     over_all_pass = True
-    aggregates = ["mean", "max", "min"]
     header = ["run_name1", "run_name2", "test_suite", "metric", "run1", "run2",
-              "percentage_diff", "expected_diff", "result", "message"]
+              "percentage_diff", "expected_diff", "result", "message",
+              "p_value", "z_score", "ci_low", "ci_high"]
     rows = [header]
 
     reporter = JUnitXml()
@@ -149,37 +245,35 @@ def compare_artifacts(dir1, dir2, run_name1, run_name2):
         with Timer("Comparison test suite {} execution time".format(sub_dir1)) as t:
             comp_ts = CompareTestSuite(sub_dir1, run_name1 + " and " + run_name1, t)
 
-            metrics_file1, metrics_file2 = get_log_file(dir1, sub_dir1), get_log_file(dir2, sub_dir1)
-            if not (metrics_file1 and metrics_file2):
+            aggregates1 = read_run_aggregates(dir1, sub_dir1)
+            baseline = get_baseline_aggregates(dirs2, run_names2, sub_dir1, history)
+            if aggregates1 is None or not baseline:
                 msg = "Metrics monitoring logs are not captured for {} in either " \
                       "of the runs.".format(sub_dir1)
                 logger.info(msg)
                 rows.append([run_name1, run_name2, sub_dir1, "metrics_log_file_availability",
-                             "NA", "NA", "NA", "NA", "pass", msg])
+                             "NA", "NA", "NA", "NA", "pass", msg, "NA", "NA", "NA", "NA"])
                 comp_ts.add_test_case("metrics_log_file_availability", msg, "skip")
                 continue
 
-            metrics_from_file1 = pd.read_csv(metrics_file1)
-            metrics_from_file2 = pd.read_csv(metrics_file2)
             metrics, diff_percents = taurus_reader.get_compare_metric_list(dir1, sub_dir1)
 
             for col, diff_percent in zip(metrics, diff_percents):
-                for agg_func in aggregates:
+                for agg_func in AGGREGATES:
                     name = "{}_{}".format(agg_func, str(col))
-
-                    val1 = get_aggregate_val(metrics_from_file1, agg_func, col)
-                    val2 = get_aggregate_val(metrics_from_file2, agg_func, col)
-
-                    diff, pass_fail, msg = compare_values(val1, val2, diff_percent, run_name1, run_name2)
+                    key = (str(col), agg_func)
+                    result = compare_runs(aggregates1.get(key), [run.get(key) for run in baseline],
+                                          diff_percent, run_name1, run_name2)
 
                     if over_all_pass:
-                        over_all_pass = pass_fail == "pass"
+                        over_all_pass = result["pass_fail"] == "pass"
 
-                    result_row = [run_name1, run_name2, sub_dir1, name, val1, val2,
-                                  diff, diff_percent, pass_fail, msg]
+                    result_row = [run_name1, run_name2, sub_dir1, name, result["val1"], result["val2"],
+                                  result["diff"], diff_percent, result["pass_fail"], result["msg"],
+                                  result["p_value"], result["z_score"], result["ci_low"], result["ci_high"]]
                     rows.append(result_row)
                     test_name = "{}: diff_percent < {}".format(name, diff_percent)
-                    comp_ts.add_test_case(test_name, msg, pass_fail)
+                    comp_ts.add_test_case(test_name, result["msg"], result["pass_fail"])
 
             comp_ts.ts.time = t.diff()
             comp_ts.ts.update_statistics()
@@ -188,3 +282,93 @@ def compare_artifacts(dir1, dir2, run_name1, run_name2):
     dataframe = pd.DataFrame(rows[1:], columns=rows[0])
     return reporter, dataframe
 
+
+def get_regressions(history, dir1, run_name1, run_names2, sub_dir, metric=None):
+    """
+    Get the failing metrics of a test suite in run dir1 compared with the runs run_names2.
+    :return: list of tuples of aggregate metric name and message, None if the metrics are missing
+    """
+    aggregates1 = history.get_aggregates([run_name1], sub_dir).get(run_name1)
+    baseline = get_baseline_aggregates(None, run_names2, sub_dir, history)
+    if aggregates1 is None or not baseline:
+        return None
+
+    regressions = []
+    metrics, diff_percents = taurus_reader.get_compare_metric_list(dir1, sub_dir)
+    for col, diff_percent in zip(metrics, diff_percents):
+        if metric and col != metric:
+            continue
+        for agg_func in AGGREGATES:
+            key = (str(col), agg_func)
+            result = compare_runs(aggregates1.get(key), [run.get(key) for run in baseline],
+                                  diff_percent, run_name1, run_names2[-1])
+            if result["pass_fail"] == "fail":
+                regressions.append(("{}_{}".format(agg_func, col), result["msg"]))
+    return regressions
+
+
+def bisect_runs(artifacts_dir, env_name, sub_dir, good=None, bad=None, metric=None):
+    """
+    Binary search the runs of env_name stored in artifacts_dir for the first run of a test suite
+    which regressed compared with the good run, pooled with the runs just before it.
+    :param good: name of a run without the regression, defaults to the oldest run
+    :param bad: name of a run with the regression, defaults to the latest run
+    :param metric: only bisect this metric, defaults to all compared metrics of the test suite
+    :return: tuple of the first bad run name and its regressions, None if bad has no regression
+    """
+    with open_history(artifacts_dir) as history:
+        runs = history.get_runs(env_name, test_suite=sub_dir)[::-1]
+        if len(runs) < 2:
+            raise click.ClickException("At least two runs of {} for env {} are needed in {}."
+                                       .format(sub_dir, env_name, artifacts_dir))
+        paths = dict(runs)
+        runs = [run_name for run_name, _ in runs]
+        return _bisect(history, paths, runs, sub_dir, good, bad, metric)
+
+
+def _bisect(history, paths, runs, sub_dir, good, bad, metric):
+    good_idx = runs.index(good) if good else 0
+    bad_idx = runs.index(bad) if bad else len(runs) - 1
+
+    def regressions(idx):
+        baseline = runs[max(0, good_idx - BASELINE_RUNS + 1):good_idx + 1]
+        found = get_regressions(history, paths[runs[idx]], runs[idx], baseline, sub_dir, metric)
+        logger.info("Run %s (commit %s): %s", runs[idx], runs[idx].split('__')[1],
+                    "regressed" if found else "good")
+        return found
+
+    found = regressions(bad_idx)
+    if not found:
+        return None
+    while bad_idx - good_idx > 1:
+        mid = (good_idx + bad_idx) // 2
+        mid_found = regressions(mid)
+        if mid_found:
+            bad_idx, found = mid, mid_found
+        else:
+            good_idx = mid
+    return runs[bad_idx], found
+
+
+@click.command()
+@click.option('-a', '--artifacts-dir', help='Directory containing the run artifacts.', type=click.Path(exists=True),
+              default=os.path.join(pathlib.Path(__file__).parent.parent.absolute(), "run_artifacts"))
+@click.option('-e', '--env-name', help='Environment name of the runs.', required=True)
+@click.option('-t', '--test', help='Test suite name.', required=True)
+@click.option('-m', '--metric', help='Only bisect this metric.', default=None)
+@click.option('--good', help='Run directory name without the regression. Defaults to the oldest run.', default=None)
+@click.option('--bad', help='Run directory name with the regression. Defaults to the latest run.', default=None)
+def bisect(artifacts_dir, env_name, test, metric, good, bad):
+    """Find the first run with a regression of a test suite by bisecting the locally stored runs"""
+    result = bisect_runs(artifacts_dir, env_name, test, good, bad, metric)
+    if result is None:
+        logger.info("No regression found in %s.", bad or "the latest run")
+        return
+    run_name, regressions = result
+    logger.info("First regressed run is %s, commit %s.", run_name, run_name.split('__')[1])
+    for col, msg in regressions:
+        logger.info("%s: %s", col, msg)
+
+
+if __name__ == "__main__":
+    bisect()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+
+# Copyright 2020 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Run history indexed in a SQLite database
+
+Every run directory in the artifacts directory is indexed once with the aggregates and the time
+series of the monitoring metrics (metrics.csv) and the API statistics (final_stats.csv) of each
+test suite, so that comparisons and trends across runs do not reread the CSV files.
+Run as a module to index an artifacts directory or to print the trend of a metric.
+"""
+# pylint: disable=redefined-builtin, no-value-for-parameter
+
+import csv
+import logging
+import math
+import os
+import pathlib
+import sqlite3
+import statistics
+import sys
+
+import click
+from tabulate import tabulate
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.INFO)
+
+HISTORY_DB = "run_history.db"
+MONITORING = "monitoring"
+API = "api"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    name TEXT PRIMARY KEY,
+    env_name TEXT NOT NULL,
+    commit_id TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_env_timestamp ON runs (env_name, timestamp);
+CREATE TABLE IF NOT EXISTS aggregates (
+    run_name TEXT NOT NULL,
+    test_suite TEXT NOT NULL,
+    source TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    aggregate TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_name, test_suite, source, metric, aggregate)
+);
+CREATE INDEX IF NOT EXISTS aggregates_metric ON aggregates (test_suite, source, metric, aggregate);
+CREATE TABLE IF NOT EXISTS samples (
+    run_name TEXT NOT NULL,
+    test_suite TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    ts REAL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_name, test_suite, metric, seq)
+);
+"""
+
+
+def parse_run_name(name):
+    """
+    Split a run directory name in the format env_name__commitid__timestamp.
+    :return: tuple of env_name, commit id and timestamp, None if the name is not a run name
+    """
+    parts = name.split('__')
+    if len(parts) != 3 or not parts[2].isdigit():
+        return None
+    return parts[0], parts[1], int(parts[2])
+
+
+def to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def percentile(values, percent):
+    """Percentile of sorted values with linear interpolation"""
+    pos = (len(values) - 1) * percent / 100.0
+    low = int(math.floor(pos))
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def aggregate_values(values):
+    """Aggregates of the values of a monitoring metric"""
+    values = sorted(values)
+    return {"mean": statistics.mean(values), "median": statistics.median(values),
+            "min": values[0], "max": values[-1],
+            "p90": percentile(values, 90), "p99": percentile(values, 99),
+            "count": len(values)}
+
+
+def read_monitoring_log(path):
+    """
+    Read a metrics.csv monitoring log. The first column is the timestamp.
+    :return: list of timestamps and dict of metric name to list of (seq, value)
+    """
+    with open(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return [], {}
+        series = {metric: [] for metric in header[1:]}
+        timestamps = []
+        for seq, row in enumerate(reader):
+            timestamps.append(to_float(row[0]) if row else None)
+            for metric, value in zip(header[1:], row[1:]):
+                value = to_float(value)
+                if value is not None:
+                    series[metric].append((seq, value))
+    return timestamps, series
+
+
+def read_final_stats(path):
+    """
+    Read the final_stats.csv of Taurus, one row per request label.
+    :return: dict of label to dict of column name to value
+    """
+    stats = {}
+    with open(path) as f:
+        for row in csv.DictReader(f):
+            label = row.pop("label", "") or "total"
+            stats[label] = {col: value for col, value in ((k, to_float(v)) for k, v in row.items())
+                            if value is not None}
+    return stats
+
+
+class RunHistory():
+    """SQLite index of the runs in an artifacts directory"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def is_indexed(self, run_name):
+        return self.conn.execute("SELECT 1 FROM runs WHERE name = ?", (run_name,)).fetchone() is not None
+
+    def index_run(self, run_dir):
+        """(Re)index a run directory. Returns False if the directory name is not a run name."""
+        run_dir = os.path.abspath(run_dir)
+        run_name = os.path.basename(run_dir)
+        parsed = parse_run_name(run_name)
+        if parsed is None:
+            return False
+
+        with self.conn:
+            for table, col in (("runs", "name"), ("aggregates", "run_name"), ("samples", "run_name")):
+                self.conn.execute("DELETE FROM {} WHERE {} = ?".format(table, col), (run_name,))
+            self.conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)", (run_name,) + parsed + (run_dir,))
+
+            for test_suite in sorted(os.listdir(run_dir)):
+                suite_dir = os.path.join(run_dir, test_suite)
+                if not os.path.isdir(suite_dir):
+                    continue
+                metrics_file = os.path.join(suite_dir, "metrics.csv")
+                if os.path.exists(metrics_file):
+                    self._index_monitoring_log(run_name, test_suite, metrics_file)
+                stats_file = os.path.join(suite_dir, "final_stats.csv")
+                if os.path.exists(stats_file):
+                    rows = [(run_name, test_suite, API, label, col, value)
+                            for label, cols in read_final_stats(stats_file).items()
+                            for col, value in cols.items()]
+                    self.conn.executemany("INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return True
+
+    def _index_monitoring_log(self, run_name, test_suite, metrics_file):
+        timestamps, series = read_monitoring_log(metrics_file)
+        for metric, values in series.items():
+            if not values:
+                continue
+            self.conn.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?, ?)",
+                                  [(run_name, test_suite, metric, seq, timestamps[seq], value)
+                                   for seq, value in values])
+            self.conn.executemany("INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?, ?, ?)",
+                                  [(run_name, test_suite, MONITORING, metric, agg, value)
+                                   for agg, value in aggregate_values([value for _, value in values]).items()])
+
+    def sync(self, artifacts_dir, reindex=False):
+        """Index the run directories of artifacts_dir which are not indexed yet"""
+        count = 0
+        for name in sorted(os.listdir(artifacts_dir)):
+            run_dir = os.path.join(artifacts_dir, name)
+            if os.path.isdir(run_dir) and (reindex or not self.is_indexed(name)) and self.index_run(run_dir):
+                count += 1
+        return count
+
+    def get_runs(self, env_name, limit=None, exclude_name=None, test_suite=None):
+        """
+        Get the latest runs of an environment, latest first.
+        :param test_suite: only runs which have monitoring samples of this test suite
+        :return: list of tuples of run name and path
+        """
+        query = "SELECT name, path FROM runs WHERE env_name = ? AND name != ?"
+        params = [env_name, exclude_name or ""]
+        if test_suite:
+            query += " AND EXISTS (SELECT 1 FROM samples WHERE run_name = name AND test_suite = ?)"
+            params.append(test_suite)
+        query += " ORDER BY timestamp DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(query, params).fetchall()
+
+    def get_trend(self, env_name, test_suite, metric, aggregate="median", source=MONITORING, limit=20):
+        """
+        Get an aggregate of a metric in the latest runs of an environment, oldest first.
+        For API statistics the metric is the request label and the aggregate the final_stats.csv column.
+        :return: list of tuples of run name, commit id, timestamp and value
+        """
+        rows = self.conn.execute(
+            "SELECT r.name, r.commit_id, r.timestamp, a.value FROM runs r JOIN aggregates a ON a.run_name = r.name "
+            "WHERE r.env_name = ? AND a.test_suite = ? AND a.source = ? AND a.metric = ? AND a.aggregate = ? "
+            "ORDER BY r.timestamp DESC LIMIT ?",
+            (env_name, test_suite, source, metric, aggregate, limit)).fetchall()
+        return rows[::-1]
+
+    def get_aggregates(self, run_names, test_suite):
+        """
+        Get the aggregates of the monitoring metrics of a test suite in each run.
+        :return: dict of run name to dict of (metric, aggregate) to value, without the runs that have none
+        """
+        run_names = list(run_names)
+        rows = self.conn.execute(
+            "SELECT run_name, metric, aggregate, value FROM aggregates WHERE test_suite = ? AND source = ? "
+            "AND run_name IN ({})".format(", ".join("?" * len(run_names))),
+            [test_suite, MONITORING] + run_names)
+        aggregates = {}
+        for run_name, metric, aggregate, value in rows:
+            aggregates.setdefault(run_name, {})[(metric, aggregate)] = value
+        return aggregates
+
+
+def open_history(artifacts_dir):
+    """Open the run history database of an artifacts directory, indexing the runs not indexed yet"""
+    history = RunHistory(os.path.join(artifacts_dir, HISTORY_DB))
+    history.sync(artifacts_dir)
+    return history
+
+
+@click.group()
+@click.option('-a', '--artifacts-dir', help='Directory containing the run artifacts.', type=click.Path(exists=True),
+              default=os.path.join(pathlib.Path(__file__).parent.parent.absolute(), "run_artifacts"))
+@click.pass_context
+def cli(ctx, artifacts_dir):
+    """Query the run history of an artifacts directory"""
+    ctx.obj = artifacts_dir
+
+
+@cli.command()
+@click.option('--reindex/--no-reindex', help='Reindex runs which are already indexed.', default=False)
+@click.pass_obj
+def index(artifacts_dir, reindex):
+    """Index the runs of the artifacts directory"""
+    with RunHistory(os.path.join(artifacts_dir, HISTORY_DB)) as history:
+        logger.info("Indexed %s runs.", history.sync(artifacts_dir, reindex))
+
+
+@cli.command()
+@click.option('-e', '--env-name', help='Environment name of the runs.', required=True)
+@click.option('-t', '--test', help='Test suite name.', required=True)
+@click.option('-m', '--metric', help='Monitoring metric, or request label with --api.', required=True)
+@click.option('-g', '--aggregate', help='Aggregate of a monitoring metric (mean, median, min, max, p90, p99, count), '
+                                        'or final_stats.csv column with --api.', default="median")
+@click.option('--api', is_flag=True, help='Query the API statistics of Taurus instead of monitoring metrics.')
+@click.option('-n', '--limit', help='Number of runs.', default=20)
+@click.option('-o', '--output', help='Also write the trend as CSV to this file.', default=None)
+@click.pass_obj
+def trend(artifacts_dir, env_name, test, metric, aggregate, api, limit, output):
+    """Print an aggregate of a metric over the latest runs"""
+    with open_history(artifacts_dir) as history:
+        rows = history.get_trend(env_name, test, metric, aggregate, API if api else MONITORING, limit)
+    if not rows:
+        logger.info("No runs of %s with %s %s for env %s.", test, aggregate, metric, env_name)
+        return
+
+    top = max(abs(row[3]) for row in rows) or 1
+    table = [list(row) + ["#" * int(round(abs(row[3]) / top * 40))] for row in rows]
+    print(tabulate(table, headers=["run", "commit", "timestamp", "{} {}".format(aggregate, metric), ""]))
+    if output:
+        with open(output, "w") as f:
+            writer = csv.writer(f)
+            writer.writerow(["run_name", "commit_id", "timestamp", "value"])
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    cli()
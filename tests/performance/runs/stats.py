@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+# Copyright 2020 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Statistical tests used to compare the metric aggregates of a run with those of earlier runs
+"""
+# pylint: disable=redefined-builtin
+
+import math
+import statistics
+
+def z_score(x, values):
+    """Difference of x from the mean of values in standard deviations of values"""
+    mean = statistics.mean(values)
+    sd = statistics.stdev(values)
+    if sd == 0:
+        return 0.0 if x == mean else math.copysign(math.inf, x - mean)
+    return (x - mean) / sd
+
+
+def percent_diff(val1, val2):
+    """Signed difference of val1 from val2 in percent of their mean, the diff_percent of the test yaml"""
+    if val1 == val2:
+        return 0.0
+    mean = (val1 + val2) / 2.0
+    if mean == 0:
+        return math.copysign(200.0, val1 - val2)
+    return (val1 - val2) / abs(mean) * 100
+
+
+def _beta_cf(a, b, x):
+    """Continued fraction of the incomplete beta function (Numerical Recipes, 6.4)"""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for num in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                    -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def regularized_beta(a, b, x):
+    """Regularized incomplete beta function I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_cf(a, b, x) / a
+    return 1.0 - front * _beta_cf(b, a, 1 - x) / b
+
+
+def t_p_value(t, df):
+    """Two sided p-value of the Student t statistic t with df degrees of freedom"""
+    return regularized_beta(df / 2.0, 0.5, df / (df + t * t))
+
+
+def t_critical(alpha, df):
+    """Critical value of a two sided Student t test at significance level alpha"""
+    low, high = 0.0, 1.0
+    while t_p_value(high, df) > alpha:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if t_p_value(mid, df) > alpha:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def prediction_test(x, values, alpha=0.05):
+    """
+    Test whether x, the value of one run, is within the run to run variation of the values of earlier
+    runs. Uses the Student t prediction interval of a new observation from the normal distribution
+    estimated from at least two values.
+    :return: p-value and the lower and upper bound of the 1 - alpha prediction interval
+    """
+    n = len(values)
+    mean = statistics.mean(values)
+    scale = statistics.stdev(values) * math.sqrt(1 + 1.0 / n)
+    if scale == 0:
+        return (1.0 if x == mean else 0.0), (mean, mean)
+    half_width = t_critical(alpha, n - 1) * scale
+    return t_p_value((x - mean) / scale, n - 1), (mean - half_width, mean + half_width)
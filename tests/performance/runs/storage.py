@@ -21,9 +21,9 @@ import os
 import sys
 import shutil
 
-import boto3
 import pathlib
 from agents import configuration
+from runs.history import open_history
 
 from utils import run_process
 
@@ -43,6 +43,14 @@ class Storage():
     def get_dir_to_compare(self):
         """get the artifacts dir to compare to"""
 
+    def get_dirs_to_compare(self, count):
+        """
+        Get the artifacts dirs of up to count previous runs to compare to, latest first.
+        Storages which only keep the latest run return one.
+        """
+        compare_dir, compare_run_name = self.get_dir_to_compare()
+        return [(compare_dir, compare_run_name)] if compare_run_name else []
+
     def store_results(self):
         """Store the results"""
 
@@ -69,15 +77,38 @@ class Storage():
 
 class LocalStorage(Storage):
     """
-    Compare the monitoring metrics for current and previous run for the same env_name
+    Compare the monitoring metrics for current and previous run for the same env_name.
+    The runs are looked up in the run history database of the artifacts directory.
     """
 
+    def __init__(self, path, env_name):
+        super().__init__(path, env_name)
+        self._history = None
+
+    @property
+    def history(self):
+        """The run history, opened on first use: the artifacts directory may not exist before the run"""
+        if self._history is None:
+            artifacts_dir = str(pathlib.Path(self.artifacts_dir).parent)
+            os.makedirs(artifacts_dir, exist_ok=True)
+            self._history = open_history(artifacts_dir)
+        return self._history
+
     def get_dir_to_compare(self):
         """Get latest run directory name to be compared with"""
-        parent_dir = pathlib.Path(self.artifacts_dir).parent
-        names = [di for di in os.listdir(parent_dir) if os.path.isdir(os.path.join(parent_dir, di))]
-        latest_run = self.get_latest(names, self.env_name, self.current_run_name)
-        return os.path.join(parent_dir, latest_run), latest_run
+        runs = self.get_dirs_to_compare(1)
+        return runs[0] if runs else ('', '')
+
+    def get_dirs_to_compare(self, count):
+        """Get up to count latest run directories to be compared with, latest first"""
+        runs = self.history.get_runs(self.env_name, count, self.current_run_name)
+        return [(path, run_name) for run_name, path in runs]
+
+    def store_results(self):
+        """Index the current run in the run history"""
+        self.history.index_run(self.artifacts_dir)
+        self._history.close()
+        self._history = None
 
 
 class S3Storage(Storage):
@@ -87,6 +118,7 @@ class S3Storage(Storage):
         """Get latest run result artifacts directory  for same env_name from S3 bucket
         and store it locally for further comparison
         """
+        import boto3
         comp_data_path = os.path.join(self.artifacts_dir, "comp_data")
         s3 = boto3.resource('s3')
         bucket = s3.Bucket(S3_BUCKET)